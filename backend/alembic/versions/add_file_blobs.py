@@ -0,0 +1,49 @@
+"""add content-addressed file blobs
+
+Revision ID: add_file_blobs
+Revises: add_upload_sessions
+Create Date: 2026-10-16 23:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_file_blobs'
+down_revision: Union[str, None] = 'add_upload_sessions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The unique constraint on saved_path was created unnamed: PostgreSQL named
+# it <table>_<column>_key, SQLite batch mode needs a naming convention
+naming_convention = {"uq": "%(table_name)s_%(column_0_name)s_key"}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'file_blobs',
+        sa.Column('sha256', sa.String(length=64), nullable=False, comment='Hex SHA-256 of the content'),
+        sa.Column('size', sa.BigInteger(), nullable=False, comment='Content size in bytes'),
+        sa.Column('ref_count', sa.Integer(), nullable=False, comment='ProjectFile rows using this blob'),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('sha256')
+    )
+
+    # Files with the same content now share one saved_path.
+    # Existing files are moved into the blob store by dedup_uploads.py
+    with op.batch_alter_table('project_files', schema=None, naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('project_files_saved_path_key', type_='unique')
+        batch_op.create_index('ix_project_files_saved_path', ['saved_path'], unique=False)
+
+
+def downgrade() -> None:
+    # Fails while files still share a blob
+    with op.batch_alter_table('project_files', schema=None, naming_convention=naming_convention) as batch_op:
+        batch_op.drop_index('ix_project_files_saved_path')
+        batch_op.create_unique_constraint('project_files_saved_path_key', ['saved_path'])
+
+    op.drop_table('file_blobs')
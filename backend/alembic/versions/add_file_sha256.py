@@ -0,0 +1,31 @@
+"""add content hash to project files
+
+Revision ID: add_file_sha256
+Revises: add_search_query_logs
+Create Date: 2026-10-16 21:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_file_sha256'
+down_revision: Union[str, None] = 'add_search_query_logs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Files uploaded before this revision keep a NULL hash
+    with op.batch_alter_table('project_files', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sha256', sa.String(length=64), nullable=True, comment='Hex SHA-256 of the file content, computed while uploading.'))
+        batch_op.create_index('ix_project_files_sha256', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('project_files', schema=None) as batch_op:
+        batch_op.drop_index('ix_project_files_sha256')
+        batch_op.drop_column('sha256')
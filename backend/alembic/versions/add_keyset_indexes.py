@@ -0,0 +1,31 @@
+"""add keyset pagination indexes
+
+Revision ID: add_keyset_indexes
+Revises: add_search_vector
+Create Date: 2026-10-16 10:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_keyset_indexes'
+down_revision: Union[str, None] = 'add_search_vector'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Match ORDER BY created_at DESC, id DESC used by cursor pagination
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.create_index('ix_projects_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_projects_uploaded_by_created_at_id', ['uploaded_by', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_index('ix_projects_uploaded_by_created_at_id')
+        batch_op.drop_index('ix_projects_created_at_id')
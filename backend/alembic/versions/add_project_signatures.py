@@ -0,0 +1,46 @@
+"""add MinHash signatures and LSH buckets for duplicate detection
+
+Revision ID: add_project_signatures
+Revises: add_tags_authors
+Create Date: 2026-10-16 18:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_project_signatures'
+down_revision: Union[str, None] = 'add_tags_authors'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Signatures are backfilled by rebuild_duplicate_signatures.py
+    op.create_table(
+        'project_signatures',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('signature', sa.LargeBinary(), nullable=False, comment='Packed uint32 MinHash values'),
+        sa.Column('shingle_count', sa.Integer(), nullable=False, comment='Distinct word shingles signed'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id')
+    )
+    op.create_table(
+        'project_lsh_buckets',
+        sa.Column('band', sa.SmallInteger(), nullable=False),
+        sa.Column('bucket', sa.BigInteger(), nullable=False, comment="Signed 64-bit hash of the band's rows"),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('band', 'bucket', 'project_id')
+    )
+    op.create_index('ix_project_lsh_buckets_project', 'project_lsh_buckets', ['project_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_project_lsh_buckets_project', table_name='project_lsh_buckets')
+    op.drop_table('project_lsh_buckets')
+    op.drop_table('project_signatures')
@@ -0,0 +1,43 @@
+"""add indexes for structured search clauses
+
+Revision ID: add_query_indexes
+Revises: add_tag_stats
+Create Date: 2026-10-16 14:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_query_indexes'
+down_revision: Union[str, None] = 'add_tag_stats'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _tags_is_array(bind) -> bool:
+    # The model declares ARRAY; the initial migration created the column as JSON
+    column_type = next(c['type'] for c in sa.inspect(bind).get_columns('projects') if c['name'] == 'tags')
+    return isinstance(column_type, sa.ARRAY)
+
+
+def upgrade() -> None:
+    # Tag filters (tag= and tag:) go through project_tags, so nothing reads
+    # the initial B-tree on projects.tags; it only costs writes
+    op.execute("DROP INDEX IF EXISTS ix_projects_tags")
+
+    # course:X compiles to upper(course_code) = 'X'
+    op.create_index('ix_projects_course_code_upper', 'projects', [sa.text('upper(course_code)')], unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+
+    op.drop_index('ix_projects_course_code_upper', table_name='projects')
+
+    # The initial B-tree (PostgreSQL has none for a json column)
+    if bind.dialect.name != 'postgresql' or _tags_is_array(bind):
+        op.create_index('ix_projects_tags', 'projects', ['tags'], unique=False)
@@ -0,0 +1,89 @@
+"""add background text extraction of main report PDFs
+
+Revision ID: add_report_text
+Revises: add_project_signatures
+Create Date: 2026-10-16 19:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_report_text'
+down_revision: Union[str, None] = 'add_project_signatures'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+extraction_status = sa.Enum('PENDING', 'PROCESSING', 'DONE', 'RETRY', 'FAILED', name='extractionstatus')
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    is_postgresql = bind.dialect.name == 'postgresql'
+
+    # Existing reports are queued by extract_report_text.py
+    with op.batch_alter_table('project_files', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('extraction_status', extraction_status, nullable=True, comment='Background text extraction state.'))
+        batch_op.add_column(sa.Column('extraction_pages_done', sa.Integer(), server_default='0', nullable=False, comment='Pages extracted so far; a retry resumes here.'))
+        batch_op.add_column(sa.Column('extraction_pages_total', sa.Integer(), nullable=True, comment='Page count, known once extraction has started.'))
+        batch_op.add_column(sa.Column('extraction_attempts', sa.Integer(), server_default='0', nullable=False, comment='Failed extraction attempts.'))
+        batch_op.add_column(sa.Column('extraction_error', sa.Text(), nullable=True, comment='Error of the last failed attempt.'))
+        batch_op.add_column(sa.Column('extraction_next_attempt_at', sa.DateTime(), nullable=True, comment='Earliest time a RETRY is picked up again.'))
+        batch_op.add_column(sa.Column('extraction_updated_at', sa.DateTime(), nullable=True, comment='Last progress; stale PROCESSING rows are reclaimed.'))
+        batch_op.create_index('ix_project_files_extraction_status', ['extraction_status'], unique=False)
+
+    op.create_table(
+        'project_file_pages',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('file_id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('page_number', sa.Integer(), nullable=False, comment='0-based page index within the file.'),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR() if is_postgresql else sa.Text(),
+            nullable=True,
+            comment='Full-text search document of the page'
+        ),
+        sa.ForeignKeyConstraint(['file_id'], ['project_files.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_project_file_pages_file_page', 'project_file_pages', ['file_id', 'page_number'], unique=True)
+    op.create_index('ix_project_file_pages_project_id', 'project_file_pages', ['project_id'], unique=False)
+
+    if is_postgresql:
+        op.create_index('ix_project_file_pages_search_vector', 'project_file_pages', ['search_vector'], postgresql_using='gin')
+    else:
+        # SQLite dev DB: FTS5 shadow table keyed by page id (rowid)
+        op.execute("CREATE VIRTUAL TABLE IF NOT EXISTS project_pages_fts USING fts5(text)")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        op.drop_index('ix_project_file_pages_search_vector', table_name='project_file_pages')
+    else:
+        op.execute("DROP TABLE IF EXISTS project_pages_fts")
+    op.drop_index('ix_project_file_pages_project_id', table_name='project_file_pages')
+    op.drop_index('ix_project_file_pages_file_page', table_name='project_file_pages')
+    op.drop_table('project_file_pages')
+
+    with op.batch_alter_table('project_files', schema=None) as batch_op:
+        batch_op.drop_index('ix_project_files_extraction_status')
+        batch_op.drop_column('extraction_updated_at')
+        batch_op.drop_column('extraction_next_attempt_at')
+        batch_op.drop_column('extraction_error')
+        batch_op.drop_column('extraction_attempts')
+        batch_op.drop_column('extraction_pages_total')
+        batch_op.drop_column('extraction_pages_done')
+        batch_op.drop_column('extraction_status')
+
+    if bind.dialect.name == 'postgresql':
+        extraction_status.drop(bind, checkfirst=True)
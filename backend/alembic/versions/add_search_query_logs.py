@@ -0,0 +1,42 @@
+"""add search query analytics log
+
+Revision ID: add_search_query_logs
+Revises: add_report_text
+Create Date: 2026-10-16 20:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_search_query_logs'
+down_revision: Union[str, None] = 'add_report_text'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'search_query_logs',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('endpoint', sa.String(length=20), nullable=False, comment='search | suggestions'),
+        sa.Column('query', sa.String(length=500), nullable=True, comment='Normalized text query (whitespace collapsed, case-folded)'),
+        sa.Column('shape', sa.String(length=255), nullable=False, comment='Endpoint plus the parameters used, without their values'),
+        sa.Column('filters', sa.JSON(), nullable=True, comment='Filter values other than the text query'),
+        sa.Column('hit_count', sa.Integer(), nullable=False, comment='Results returned'),
+        sa.Column('first_page', sa.Boolean(), nullable=False, comment='False for skip/cursor follow-up pages'),
+        sa.Column('latency_ms', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_search_query_logs_created_query', 'search_query_logs', ['created_at', 'query'], unique=False)
+    op.create_index('ix_search_query_logs_created_shape', 'search_query_logs', ['created_at', 'shape'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_search_query_logs_created_shape', table_name='search_query_logs')
+    op.drop_index('ix_search_query_logs_created_query', table_name='search_query_logs')
+    op.drop_table('search_query_logs')
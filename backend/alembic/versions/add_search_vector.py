@@ -0,0 +1,72 @@
+"""add full-text search index
+
+Revision ID: add_search_vector
+Revises: create_courses_table
+Create Date: 2026-10-16 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_search_vector'
+down_revision: Union[str, None] = 'create_courses_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _joined_list(bind, column: str) -> str:
+    """
+    SQL joining a list column's elements with spaces. The model declares
+    ARRAY, but the initial migration created tags/authors as JSON.
+    """
+    column_type = next(c['type'] for c in sa.inspect(bind).get_columns('projects') if c['name'] == column)
+    if isinstance(column_type, sa.ARRAY):
+        return f"array_to_string({column}, ' ')"
+    # JSON null or a non-array value contributes nothing
+    return (
+        f"(SELECT string_agg(value, ' ') FROM json_array_elements_text("
+        f"CASE WHEN json_typeof({column}::json) = 'array' THEN {column}::json ELSE '[]'::json END"
+        f") AS value)"
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        op.add_column('projects', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True, comment='Weighted full-text search document'))
+        # Backfill: title > tags > authors > abstract
+        op.execute(f"""
+            UPDATE projects SET search_vector =
+                setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce({_joined_list(bind, 'tags')}, '')), 'B') ||
+                setweight(to_tsvector('simple', coalesce({_joined_list(bind, 'authors')}, '')), 'C') ||
+                setweight(to_tsvector('simple', coalesce(abstract, '')), 'D')
+        """)
+        op.create_index('ix_projects_search_vector', 'projects', ['search_vector'], postgresql_using='gin')
+    else:
+        op.add_column('projects', sa.Column('search_vector', sa.Text(), nullable=True, comment='Weighted full-text search document'))
+        # SQLite dev DB: FTS5 shadow table keyed by project id (rowid)
+        op.execute("CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(title, tags, authors, abstract)")
+        op.execute("""
+            INSERT INTO projects_fts (rowid, title, tags, authors, abstract)
+            SELECT id, coalesce(title, ''), coalesce(tags, ''), coalesce(authors, ''), coalesce(abstract, '')
+            FROM projects
+        """)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        op.drop_index('ix_projects_search_vector', table_name='projects')
+    else:
+        op.execute("DROP TABLE IF EXISTS projects_fts")
+
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_column('search_vector')
@@ -0,0 +1,70 @@
+"""add tag_stats read model
+
+Revision ID: add_tag_stats
+Revises: add_keyset_indexes
+Create Date: 2026-10-16 12:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_tag_stats'
+down_revision: Union[str, None] = 'add_keyset_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _tag_elements(bind) -> str:
+    """
+    FROM item yielding each tag of project `p` as `t.value`. The model
+    declares ARRAY, but the initial migration created tags as JSON.
+    """
+    if bind.dialect.name == 'sqlite':
+        return "json_each(p.tags) AS t"
+    column_type = next(c['type'] for c in sa.inspect(bind).get_columns('projects') if c['name'] == 'tags')
+    if isinstance(column_type, sa.ARRAY):
+        return "unnest(p.tags) AS t(value)"
+    # JSON null or a non-array value has no tags
+    return (
+        "json_array_elements_text("
+        "CASE WHEN json_typeof(p.tags::json) = 'array' THEN p.tags::json ELSE '[]'::json END"
+        ") AS t(value)"
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    op.create_table(
+        'tag_stats',
+        sa.Column('tag', sa.String(length=255), nullable=False),
+        sa.Column(
+            'visibility',
+            postgresql.ENUM('PRIVATE', 'ADVISOR', 'CLASS', 'PUBLIC', name='privacylevel', create_type=False),
+            nullable=False,
+            comment='Privacy level of the counted projects'
+        ),
+        sa.Column('project_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('tag', 'visibility')
+    )
+    op.create_index('ix_tag_stats_visibility_count', 'tag_stats', ['visibility', 'project_count'], unique=False)
+
+    # Backfill: one count per distinct (tag, privacy_level) across existing
+    # projects (normalize_tag_stats later re-keys them on tags.key)
+    op.execute(
+        "INSERT INTO tag_stats (tag, visibility, project_count) "
+        "SELECT t.value, p.privacy_level, COUNT(DISTINCT p.id) "
+        f"FROM projects p, {_tag_elements(bind)} "
+        "WHERE t.value IS NOT NULL AND t.value <> '' "
+        "GROUP BY t.value, p.privacy_level"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tag_stats_visibility_count', table_name='tag_stats')
+    op.drop_table('tag_stats')
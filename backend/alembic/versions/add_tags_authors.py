@@ -0,0 +1,90 @@
+"""add normalized tags and authors tables
+
+Revision ID: add_tags_authors
+Revises: add_query_indexes
+Create Date: 2026-10-16 15:00:00.000000+00:00
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_tags_authors'
+down_revision: Union[str, None] = 'add_query_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _normalize_key(value: str) -> str:
+    return " ".join(value.split()).casefold()
+
+
+def _as_list(value):
+    # ARRAY on PostgreSQL, JSON text on SQLite
+    if isinstance(value, str):
+        value = json.loads(value)
+    return [v for v in (value or []) if isinstance(v, str) and v.strip()]
+
+
+def upgrade() -> None:
+    for entity in ('tags', 'authors'):
+        op.create_table(
+            entity,
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('key', sa.String(length=255), nullable=False, comment='Case-folded lookup key'),
+            sa.Column('name', sa.String(length=255), nullable=False, comment='Display spelling'),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(f'ix_{entity}_id', entity, ['id'], unique=False)
+        op.create_index(f'ix_{entity}_key', entity, ['key'], unique=True)
+
+    for link, entity, fk in (('project_tags', 'tags', 'tag_id'), ('project_authors', 'authors', 'author_id')):
+        op.create_table(
+            link,
+            sa.Column('project_id', sa.Integer(), nullable=False),
+            sa.Column(fk, sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint([fk], [f'{entity}.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('project_id', fk)
+        )
+        op.create_index(f'ix_{link}_{fk[:-3]}_project', link, [fk, 'project_id'], unique=False)
+
+    # Backfill from the existing tags/authors arrays
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, tags, authors FROM projects")).fetchall()
+
+    for column, entity, link, fk in (
+        (1, 'tags', 'project_tags', 'tag_id'),
+        (2, 'authors', 'project_authors', 'author_id'),
+    ):
+        names = {}
+        links = set()
+        for row in rows:
+            for value in _as_list(row[column]):
+                key = _normalize_key(value)
+                names.setdefault(key, " ".join(value.split()))
+                links.add((row[0], key))
+        if not names:
+            continue
+
+        table = sa.table(entity, sa.column('id', sa.Integer), sa.column('key', sa.String), sa.column('name', sa.String))
+        op.bulk_insert(table, [{'key': key, 'name': name} for key, name in names.items()])
+        ids = dict(bind.execute(sa.select(table.c.key, table.c.id)).fetchall())
+
+        link_table = sa.table(link, sa.column('project_id', sa.Integer), sa.column(fk, sa.Integer))
+        op.bulk_insert(link_table, [{'project_id': project_id, fk: ids[key]} for project_id, key in links])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_project_authors_author_project', table_name='project_authors')
+    op.drop_table('project_authors')
+    op.drop_index('ix_project_tags_tag_project', table_name='project_tags')
+    op.drop_table('project_tags')
+    for entity in ('authors', 'tags'):
+        op.drop_index(f'ix_{entity}_key', table_name=entity)
+        op.drop_index(f'ix_{entity}_id', table_name=entity)
+        op.drop_table(entity)
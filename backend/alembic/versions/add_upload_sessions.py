@@ -0,0 +1,67 @@
+"""add resumable upload sessions
+
+Revision ID: add_upload_sessions
+Revises: add_file_sha256
+Create Date: 2026-10-16 22:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_upload_sessions'
+down_revision: Union[str, None] = 'add_file_sha256'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+upload_status = sa.Enum('UPLOADING', 'COMPLETE', name='uploadstatus')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'upload_sessions',
+        sa.Column('id', sa.String(length=32), nullable=False, comment='Random hex id, also the part file name'),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(length=500), nullable=False, comment='Original filename, validated like a direct upload'),
+        sa.Column('mime_type', sa.String(length=100), nullable=True),
+        sa.Column('size', sa.BigInteger(), nullable=False, comment='Declared total size in bytes'),
+        sa.Column('received', sa.BigInteger(), nullable=False, comment='Bytes stored so far; the next chunk starts here'),
+        sa.Column('expected_sha256', sa.String(length=64), nullable=True, comment='Client-declared digest, checked on completion'),
+        sa.Column('sha256', sa.String(length=64), nullable=True, comment='Digest of the whole file, set on completion'),
+        sa.Column('status', upload_status, nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False, comment='Pushed back by every chunk'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_upload_sessions_user_id', 'upload_sessions', ['user_id'], unique=False)
+    op.create_index('ix_upload_sessions_expires_at', 'upload_sessions', ['expires_at'], unique=False)
+
+    op.create_table(
+        'upload_chunks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('session_id', sa.String(length=32), nullable=False),
+        sa.Column('offset', sa.BigInteger(), nullable=False, comment="Position of the chunk's first byte"),
+        sa.Column('length', sa.Integer(), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(['session_id'], ['upload_sessions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_upload_chunks_session_offset', 'upload_chunks', ['session_id', 'offset'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_upload_chunks_session_offset', table_name='upload_chunks')
+    op.drop_table('upload_chunks')
+    op.drop_index('ix_upload_sessions_expires_at', table_name='upload_sessions')
+    op.drop_index('ix_upload_sessions_user_id', table_name='upload_sessions')
+    op.drop_table('upload_sessions')
+
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        upload_status.drop(bind, checkfirst=True)
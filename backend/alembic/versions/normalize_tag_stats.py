@@ -0,0 +1,62 @@
+"""key tag_stats on the normalized tag
+
+Revision ID: normalize_tag_stats
+Revises: add_file_blobs
+Create Date: 2026-10-17 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'normalize_tag_stats'
+down_revision: Union[str, None] = 'add_file_blobs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _tag_elements(bind) -> str:
+    """
+    FROM item yielding each tag of project `p` as `t.value`. The model
+    declares ARRAY, but the initial migration created tags as JSON.
+    """
+    if bind.dialect.name == 'sqlite':
+        return "json_each(p.tags) AS t"
+    column_type = next(c['type'] for c in sa.inspect(bind).get_columns('projects') if c['name'] == 'tags')
+    if isinstance(column_type, sa.ARRAY):
+        return "unnest(p.tags) AS t(value)"
+    # JSON null or a non-array value has no tags
+    return (
+        "json_array_elements_text("
+        "CASE WHEN json_typeof(p.tags::json) = 'array' THEN p.tags::json ELSE '[]'::json END"
+        ") AS t(value)"
+    )
+
+
+def upgrade() -> None:
+    # Count per tags.key (what project_tags and the tag filter use), so
+    # spellings differing only in case or spacing are one tag
+    op.execute("DELETE FROM tag_stats")
+    op.execute(
+        "INSERT INTO tag_stats (tag, visibility, project_count) "
+        "SELECT t.key, p.privacy_level, COUNT(*) "
+        "FROM project_tags pt "
+        "JOIN tags t ON t.id = pt.tag_id "
+        "JOIN projects p ON p.id = pt.project_id "
+        "GROUP BY t.key, p.privacy_level"
+    )
+
+
+def downgrade() -> None:
+    # Back to one row per raw tag spelling
+    op.execute("DELETE FROM tag_stats")
+    op.execute(
+        "INSERT INTO tag_stats (tag, visibility, project_count) "
+        "SELECT t.value, p.privacy_level, COUNT(DISTINCT p.id) "
+        f"FROM projects p, {_tag_elements(op.get_bind())} "
+        "WHERE t.value IS NOT NULL AND t.value <> '' "
+        "GROUP BY t.value, p.privacy_level"
+    )
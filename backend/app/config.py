@@ -38,6 +38,48 @@ class Settings(BaseSettings):
     # =====================================================
     UPLOAD_DIR: str = "uploads"
     MAX_UPLOAD_SIZE_MB: int = 300
+    UPLOAD_CHUNK_SIZE_KB: int = Field(default=1024, description="Uploads are streamed to disk in chunks of this size; bounds memory per upload")
+    UPLOAD_SESSION_TTL_HOURS: int = Field(default=24, description="Resumable upload sessions expire after this long without a new chunk")
+    UPLOAD_SESSION_MAX_CHUNK_MB: int = Field(default=64, description="Largest chunk accepted by PATCH /uploads/{id}")
+    DOWNLOAD_ACCEL_REDIRECT: bool = Field(default=False, description="Let nginx send download bodies (X-Accel-Redirect); enable only behind the bundled nginx config")
+    DOWNLOAD_ACCEL_LOCATION: str = Field(default="/_protected_uploads/", description="Internal nginx location aliased to UPLOAD_DIR")
+    DOWNLOAD_URL_TTL_SECONDS: int = Field(default=600, description="Lifetime of signed download URLs; covers a viewer's follow-up Range requests")
+
+    # =====================================================
+    # REPORT TEXT EXTRACTION
+    # =====================================================
+    PDF_EXTRACTION_ENABLED: bool = Field(default=True, description="Run the background PDF text extraction dispatcher in the API process")
+    PDF_EXTRACTION_WORKERS: int = Field(default=2, description="Extraction worker processes")
+    PDF_EXTRACTION_PAGE_BATCH: int = Field(default=25, description="Pages extracted per commit; the PDF reader is reopened per batch to bound memory")
+    PDF_EXTRACTION_MAX_ATTEMPTS: int = Field(default=5, description="Failed attempts before a file is marked FAILED")
+    PDF_EXTRACTION_RETRY_SECONDS: int = Field(default=60, description="Base retry delay, doubled per failed attempt")
+    PDF_EXTRACTION_POLL_SECONDS: int = Field(default=30, description="Dispatcher poll interval when no upload wakes it")
+    PDF_EXTRACTION_STALE_SECONDS: int = Field(default=900, description="PROCESSING rows without progress for this long are reclaimed")
+
+    # =====================================================
+    # SEARCH
+    # =====================================================
+    SUGGESTION_INDEX_REFRESH_SECONDS: int = Field(default=300, description="Background rebuild interval of the in-memory autocomplete index")
+    SEARCH_RANKING: str = Field(default="bm25", description="bm25 (in-memory BM25F index) | database (ts_rank / FTS5 bm25)")
+    RANKING_INDEX_REFRESH_SECONDS: int = Field(default=900, description="Background rebuild interval of the in-memory ranking index")
+    RANKING_RERANK_CANDIDATES: int = Field(default=1000, description="Best database-ranked matches reordered with BM25F per search; later results keep the database order")
+    SEARCH_CACHE_BACKEND: str = Field(default="memory", description="memory | redis | none")
+    SEARCH_CACHE_TTL_SECONDS: int = 60
+    SEARCH_CACHE_MAX_ENTRIES: int = 1024
+    REDIS_URL: str = "redis://localhost:6379/0"
+    SIMILARITY_INDEX_REFRESH_SECONDS: int = Field(default=900, description="Background rebuild interval of the in-memory TF-IDF similarity index")
+    SEARCH_TOTAL_EXACT_LIMIT: int = Field(default=1000, description="Totals above this are reported as capped or planner-estimated")
+    SEARCH_COUNT_WORKERS: int = Field(default=4, description="Threads running total counts next to the page query")
+    SEARCH_EXPORT_BATCH: int = Field(default=1000, description="Rows fetched per server-side cursor batch by /search/export")
+    SEARCH_ANALYTICS_ENABLED: bool = Field(default=True, description="Record search queries, hit counts and latency")
+    SEARCH_ANALYTICS_BUFFER_SIZE: int = Field(default=10000, description="In-process ring buffer; the oldest entries are dropped when full")
+    SEARCH_ANALYTICS_FLUSH_SECONDS: int = Field(default=10, description="Background flush interval of the analytics buffer")
+    SEARCH_ANALYTICS_FLUSH_BATCH: int = Field(default=500, description="Rows per analytics insert; a full batch triggers an early flush")
+    WEB_CONCURRENCY: int = Field(default=1, description="API worker processes (the variable uvicorn/gunicorn read for their worker count); above 1, visible-project sets are cached only with SEARCH_CACHE_BACKEND=redis")
+    VISIBILITY_CACHE_MAX_USERS: int = Field(default=10000, description="Students whose visible-project sets are kept in memory")
+    VISIBILITY_CACHE_TTL_SECONDS: int = Field(default=300, description="Upper bound on the age of a cached visible-project set")
+    VISIBILITY_INLINE_LIMIT: int = Field(default=1000, description="Largest visible-project set inlined as an id list into access-filtered queries")
+    DUPLICATE_SIMILARITY_THRESHOLD: float = Field(default=0.8, description="Estimated text Jaccard similarity at which uploads are flagged as likely duplicates")
 
     # =====================================================
     # ENCRYPTION
@@ -3,7 +3,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
 from app.config import get_settings
-from app.routers import auth, projects, search, access, files, courses
+from app.routers import auth, projects, search, access, files, courses, uploads
+from app.services.extraction_service import ExtractionService
+from app.services.ranking_service import RankingService
+from app.services.search_analytics_service import SearchAnalyticsService
+from app.services.similarity_service import SimilarityService
+from app.services.suggestion_service import SuggestionService
 
 settings = get_settings()
 
@@ -33,8 +38,31 @@ app.include_router(projects.router, prefix="/api", tags=["projects"])
 app.include_router(search.router, prefix="/api", tags=["search"])
 app.include_router(access.router, prefix="/api", tags=["access"])
 app.include_router(files.router, prefix="/api", tags=["files"])
+app.include_router(uploads.router, prefix="/api", tags=["uploads"])
 app.include_router(courses.router, prefix="/api", tags=["courses"])
 
+# =====================================================
+# BACKGROUND WORKERS
+# =====================================================
+@app.on_event("startup")
+def start_background_workers():
+    if settings.PDF_EXTRACTION_ENABLED:
+        ExtractionService.start()
+    if settings.SEARCH_ANALYTICS_ENABLED:
+        SearchAnalyticsService.start()
+    RankingService.start()
+    SuggestionService.start()
+    SimilarityService.start()
+
+
+@app.on_event("shutdown")
+def stop_background_workers():
+    ExtractionService.stop()
+    SearchAnalyticsService.stop()
+    RankingService.stop()
+    SuggestionService.stop()
+    SimilarityService.stop()
+
 # =====================================================
 # ROOT & HEALTH CHECK
 # =====================================================
@@ -8,8 +8,13 @@ before Alembic runs migrations.
 from app.models.user import User
 from app.models.project import Project, PrivacyLevel, ProjectStatus
 from app.models.access_request import AccessRequest, AccessRequestStatus
-from app.models.file import ProjectFile, FileType
+from app.models.file import ProjectFile, FileType, ExtractionStatus, ProjectFilePage, FileBlob
 from app.models.course import Course
+from app.models.tag_stat import TagStat
+from app.models.taxonomy import Tag, Author, ProjectTag, ProjectAuthor
+from app.models.duplicate import ProjectSignature, ProjectLshBucket
+from app.models.search_log import SearchQueryLog
+from app.models.upload import UploadSession, UploadChunk, UploadStatus
 
 # Export all models for easy import
 __all__ = [
@@ -21,5 +26,19 @@ __all__ = [
     "AccessRequestStatus",
     "ProjectFile",
     "FileType",
+    "ExtractionStatus",
+    "ProjectFilePage",
+    "FileBlob",
     "Course",
+    "TagStat",
+    "Tag",
+    "Author",
+    "ProjectTag",
+    "ProjectAuthor",
+    "ProjectSignature",
+    "ProjectLshBucket",
+    "SearchQueryLog",
+    "UploadSession",
+    "UploadChunk",
+    "UploadStatus",
 ]
\ No newline at end of file
@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, SmallInteger, BigInteger, LargeBinary, DateTime, ForeignKey, Index
+from datetime import datetime
+
+from app.database import Base
+
+
+class ProjectSignature(Base):
+    """
+    MinHash signature of a project's text, used for near-duplicate detection
+
+    `signature` packs one uint32 minimum per hash permutation (little endian),
+    e.g. 512 bytes for 128 permutations.
+    """
+    __tablename__ = "project_signatures"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False, comment="Packed uint32 MinHash values")
+    shingle_count = Column(Integer, nullable=False, default=0, comment="Distinct word shingles signed")
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ProjectSignature(project_id={self.project_id}, shingles={self.shingle_count})>"
+
+
+class ProjectLshBucket(Base):
+    """
+    LSH band buckets of project signatures
+
+    Projects sharing any (band, bucket) pair are duplicate candidates; the
+    primary key serves that lookup, ix_project_lsh_buckets_project serves
+    replacing one project's rows.
+    """
+    __tablename__ = "project_lsh_buckets"
+
+    __table_args__ = (
+        Index("ix_project_lsh_buckets_project", "project_id"),
+    )
+
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True, comment="Signed 64-bit hash of the band's rows")
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
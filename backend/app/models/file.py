@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, BigInteger, Integer, String, Text, DateTime, ForeignKey, Index, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 import enum
 
@@ -13,6 +14,15 @@ class FileType(str, enum.Enum):
     THUMBNAIL = "thumbnail" # e.g., a preview image for the project
 
 
+class ExtractionStatus(str, enum.Enum):
+    """State of the background text extraction of a main report PDF."""
+    PENDING = "pending"  # queued, not started yet
+    PROCESSING = "processing"  # claimed by an extraction worker
+    DONE = "done"  # every page extracted
+    RETRY = "retry"  # last attempt failed, retried at extraction_next_attempt_at
+    FAILED = "failed"  # gave up after PDF_EXTRACTION_MAX_ATTEMPTS
+
+
 class ProjectFile(Base):
     """
     Model to store metadata for each file associated with a project.
@@ -26,10 +36,20 @@ class ProjectFile(Base):
     
     # File metadata
     original_filename = Column(String(500), nullable=False, comment="The original name of the file as uploaded by the user.")
-    saved_path = Column(String(500), nullable=False, unique=True, comment="The path to the file on the server's storage, usually with a randomized name.")
+    saved_path = Column(String(500), nullable=False, index=True, comment="The path to the file on the server's storage: its content-addressed blob, or a randomized name for files stored before deduplication.")
     file_type = Column(SQLEnum(FileType), nullable=False, default=FileType.SUPPLEMENTARY, comment="The role of the file in the project.")
     mime_type = Column(String(100), nullable=True, comment="The MIME type of the file, e.g., 'application/pdf'.")
     file_size = Column(Integer, nullable=True, comment="File size in bytes.")
+    sha256 = Column(String(64), nullable=True, index=True, comment="Hex SHA-256 of the file content, computed while uploading.")
+
+    # Text extraction (main report PDFs only; NULL status means not applicable)
+    extraction_status = Column(SQLEnum(ExtractionStatus), nullable=True, index=True, comment="Background text extraction state.")
+    extraction_pages_done = Column(Integer, nullable=False, default=0, comment="Pages extracted so far; a retry resumes here.")
+    extraction_pages_total = Column(Integer, nullable=True, comment="Page count, known once extraction has started.")
+    extraction_attempts = Column(Integer, nullable=False, default=0, comment="Failed extraction attempts.")
+    extraction_error = Column(Text, nullable=True, comment="Error of the last failed attempt.")
+    extraction_next_attempt_at = Column(DateTime, nullable=True, comment="Earliest time a RETRY is picked up again.")
+    extraction_updated_at = Column(DateTime, nullable=True, comment="Last progress; stale PROCESSING rows are reclaimed.")
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -39,3 +59,53 @@ class ProjectFile(Base):
 
     def __repr__(self):
         return f"<ProjectFile(id={self.id}, original_filename='{self.original_filename}', project_id={self.project_id})>"
+
+
+class ProjectFilePage(Base):
+    """
+    Extracted text of one page of a main report PDF.
+
+    Kept out of `projects` so report text never bloats project rows. On
+    PostgreSQL each page carries its own tsvector; on SQLite the FTS5 table
+    `project_pages_fts` (rowid = page id) is used instead.
+    """
+    __tablename__ = "project_file_pages"
+
+    __table_args__ = (
+        Index("ix_project_file_pages_file_page", "file_id", "page_number", unique=True),
+        Index("ix_project_file_pages_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    file_id = Column(Integer, ForeignKey("project_files.id", ondelete="CASCADE"), nullable=False)
+    # Denormalized so text matches resolve to projects without a join
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    page_number = Column(Integer, nullable=False, comment="0-based page index within the file.")
+    text = deferred(Column(Text, nullable=False, default=""))
+    search_vector = deferred(Column(
+        TSVECTOR().with_variant(Text(), "sqlite"),
+        nullable=True,
+        comment="Full-text search document of the page"
+    ))
+
+    def __repr__(self):
+        return f"<ProjectFilePage(file_id={self.file_id}, page={self.page_number})>"
+
+
+class FileBlob(Base):
+    """
+    One stored file content, shared by every ProjectFile with the same SHA-256.
+
+    The blob lives at UPLOAD_DIR/blobs/<2>/<2>/<sha256>. `ref_count` counts
+    the ProjectFile rows pointing at it and is changed in the same
+    transaction as those rows; a blob at zero is removed after the commit.
+    """
+    __tablename__ = "file_blobs"
+
+    sha256 = Column(String(64), primary_key=True, comment="Hex SHA-256 of the content")
+    size = Column(BigInteger, nullable=False, comment="Content size in bytes")
+    ref_count = Column(Integer, nullable=False, default=0, comment="ProjectFile rows using this blob")
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<FileBlob(sha256='{self.sha256[:12]}', refs={self.ref_count})>"
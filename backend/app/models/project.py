@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum
-from sqlalchemy.dialects.postgresql import ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, JSON, Enum as SQLEnum
+from sqlalchemy import and_, or_, exists, select, text, true
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import relationship, deferred, aliased, object_session
 from datetime import datetime
+from typing import Optional
 import enum
 
 from app.database import Base
@@ -30,6 +32,17 @@ class Project(Base):
     """
     __tablename__ = "projects"
 
+    __table_args__ = (
+        # GIN index backing the full-text search mode (see SearchIndexService)
+        Index("ix_projects_search_vector", "search_vector", postgresql_using="gin"),
+        # Keyset pagination: ORDER BY created_at DESC, id DESC
+        Index("ix_projects_created_at_id", "created_at", "id"),
+        Index("ix_projects_uploaded_by_created_at_id", "uploaded_by", "created_at", "id"),
+        # course:X (case-insensitive); tag filters use project_tags instead
+        # of an index on the tags column
+        Index("ix_projects_course_code_upper", text("upper(course_code)")),
+    )
+
     # Primary Key
     id = Column(Integer, primary_key=True, index=True)
     
@@ -46,16 +59,15 @@ class Project(Base):
     
     # Authors (stored as array)
     authors = Column(
-        ARRAY(String), 
+        ARRAY(String).with_variant(JSON(), "sqlite"),
         nullable=True,
         comment="List of author names"
     )
     
     # Tags/Keywords (stored as array for easy filtering)
     tags = Column(
-        ARRAY(String),
+        ARRAY(String).with_variant(JSON(), "sqlite"),
         nullable=True,
-        index=True,
         comment="Topics: ML, NLP, Computer Vision, etc."
     )
     
@@ -117,6 +129,18 @@ class Project(Base):
         comment="YouTube link to demo video"
     )
 
+    # =====================================================
+    # SEARCH INDEX
+    # =====================================================
+    # Weighted tsvector (title > tags > authors > abstract) maintained by
+    # SearchIndexService. Deferred so regular loads never pull it.
+    # On SQLite the FTS5 shadow table `projects_fts` is used instead.
+    search_vector = deferred(Column(
+        TSVECTOR().with_variant(Text(), "sqlite"),
+        nullable=True,
+        comment="Weighted full-text search document"
+    ))
+
     # =====================================================
     # RELATIONSHIPS (Foreign Keys)
     # =====================================================
@@ -219,15 +243,75 @@ class Project(Base):
         if user_role == 'dosen':
             return True
 
-        # For CLASS level, need to check if user is in same class
-        # (This would require additional logic based on your class system)
-        if self.privacy_level == PrivacyLevel.CLASS:
-            # TODO: Implement class membership check
-            pass
+        # Class membership and approved access requests live in other rows,
+        # so evaluate the same SQL predicate the listing endpoints use
+        session = object_session(self)
+        if session is None or self.id is None:
+            return False
 
-        # Otherwise, check if access request is approved
-        # (This would be checked in the access_requests relationship)
-        return False
+        return session.query(
+            exists().where(
+                Project.id == self.id,
+                Project.access_filter(user_id, user_role)
+            )
+        ).scalar()
+
+    @classmethod
+    def access_filter(cls, user_id: Optional[int], user_role: Optional[str]):
+        """
+        SQL counterpart of can_access, usable in any WHERE clause
+
+        Args:
+            user_id: ID of user requesting access (None for anonymous)
+            user_role: Role of user ('student' or 'dosen')
+
+        Returns:
+            A boolean SQL expression selecting the projects the user may see
+        """
+        from app.models.access_request import AccessRequest, AccessRequestStatus
+
+        # Anonymous users only see public projects
+        if user_id is None:
+            return cls.privacy_level == PrivacyLevel.PUBLIC
+
+        # Dosen can access private projects for metadata viewing
+        if user_role == 'dosen':
+            return true()
+
+        # Approved and unexpired access request for this project
+        active_grant = exists().where(
+            AccessRequest.project_id == cls.id,
+            AccessRequest.requester_id == user_id,
+            AccessRequest.status == AccessRequestStatus.APPROVED,
+            or_(
+                AccessRequest.expires_at.is_(None),
+                AccessRequest.expires_at > datetime.utcnow()
+            )
+        )
+
+        # Class membership: the user has a submission in the same class
+        classmate_project = aliased(Project)
+        same_class = exists(
+            select(classmate_project.id).where(
+                classmate_project.uploaded_by == user_id,
+                classmate_project.class_name == cls.class_name,
+                or_(
+                    classmate_project.course_code == cls.course_code,
+                    and_(classmate_project.course_code.is_(None), cls.course_code.is_(None))
+                )
+            )
+        )
+
+        return or_(
+            cls.uploaded_by == user_id,
+            cls.privacy_level == PrivacyLevel.PUBLIC,
+            and_(
+                cls.advisor_id == user_id,
+                cls.privacy_level.in_([PrivacyLevel.ADVISOR, PrivacyLevel.CLASS, PrivacyLevel.PUBLIC])
+            ),
+            and_(cls.privacy_level == PrivacyLevel.CLASS, cls.class_name.isnot(None), same_class),
+            active_grant
+        )
 
     def can_access_full_content(self, user_id: int, user_role: str) -> bool:
         """
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, BigInteger, Integer, Float, String, Boolean, DateTime, JSON, Index
+from datetime import datetime
+
+from app.database import Base
+
+
+class SearchQueryLog(Base):
+    """
+    Search analytics - one row per /search or /search/suggestions request
+
+    Written in batches by SearchAnalyticsService's background flusher,
+    never on the request path. Read only by the aggregate analytics
+    endpoints, which always filter on created_at.
+    """
+    __tablename__ = "search_query_logs"
+
+    __table_args__ = (
+        Index("ix_search_query_logs_created_query", "created_at", "query"),
+        Index("ix_search_query_logs_created_shape", "created_at", "shape"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer(), "sqlite"), primary_key=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    endpoint = Column(String(20), nullable=False, comment="search | suggestions")
+    query = Column(String(500), nullable=True, comment="Normalized text query (whitespace collapsed, case-folded)")
+    shape = Column(String(255), nullable=False, comment="Endpoint plus the parameters used, without their values")
+    filters = Column(JSON, nullable=True, comment="Filter values other than the text query")
+    hit_count = Column(Integer, nullable=False, comment="Results returned")
+    first_page = Column(Boolean, nullable=False, default=True, comment="False for skip/cursor follow-up pages")
+    latency_ms = Column(Float, nullable=False)
+
+    def __repr__(self):
+        return f"<SearchQueryLog(id={self.id}, shape='{self.shape}', hits={self.hit_count})>"
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Index, Enum as SQLEnum
+
+from app.database import Base
+from app.models.project import PrivacyLevel
+
+
+class TagStat(Base):
+    """
+    Tag statistics read model - number of projects per (tag, visibility class)
+
+    Maintained incrementally by TagStatsService in the same transaction as
+    project writes, so tag endpoints read counts instead of unnesting
+    projects.tags on every request.
+    """
+    __tablename__ = "tag_stats"
+
+    __table_args__ = (
+        # Top-k reads per visibility class: ORDER BY project_count DESC
+        Index("ix_tag_stats_visibility_count", "visibility", "project_count"),
+    )
+
+    tag = Column(String(255), primary_key=True)
+    visibility = Column(
+        SQLEnum(PrivacyLevel),
+        primary_key=True,
+        comment="Privacy level of the counted projects"
+    )
+    project_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TagStat(tag='{self.tag}', visibility='{self.visibility}', count={self.project_count})>"
@@ -0,0 +1,65 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+
+from app.database import Base
+
+
+class Tag(Base):
+    """
+    Tag model - one row per distinct tag, matched case-insensitively
+
+    `key` is the case-folded, whitespace-collapsed form used for lookups;
+    `name` keeps the spelling it was first created with.
+    """
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String(255), nullable=False, unique=True, index=True, comment="Case-folded lookup key")
+    name = Column(String(255), nullable=False, comment="Display spelling")
+
+    def __repr__(self):
+        return f"<Tag(id={self.id}, name='{self.name}')>"
+
+
+class Author(Base):
+    """
+    Author model - one row per distinct author name, matched case-insensitively
+    """
+    __tablename__ = "authors"
+
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String(255), nullable=False, unique=True, index=True, comment="Case-folded lookup key")
+    name = Column(String(255), nullable=False, comment="Display spelling")
+
+    def __repr__(self):
+        return f"<Author(id={self.id}, name='{self.name}')>"
+
+
+class ProjectTag(Base):
+    """
+    Link table between projects and tags
+
+    The primary key serves project -> tags; ix_project_tags_tag_project
+    serves tag -> projects (filters and facet counts).
+    """
+    __tablename__ = "project_tags"
+
+    __table_args__ = (
+        Index("ix_project_tags_tag_project", "tag_id", "project_id"),
+    )
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+
+
+class ProjectAuthor(Base):
+    """
+    Link table between projects and authors
+    """
+    __tablename__ = "project_authors"
+
+    __table_args__ = (
+        Index("ix_project_authors_author_project", "author_id", "project_id"),
+    )
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    author_id = Column(Integer, ForeignKey("authors.id", ondelete="CASCADE"), primary_key=True)
@@ -0,0 +1,65 @@
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, ForeignKey, Index, Enum as SQLEnum
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import enum
+
+from app.database import Base
+
+
+class UploadStatus(str, enum.Enum):
+    """State of a resumable upload session."""
+    UPLOADING = "uploading"  # accepting chunks
+    COMPLETE = "complete"  # every byte received and verified; ready to attach to a project
+
+
+class UploadSession(Base):
+    """
+    A resumable upload in progress.
+
+    Chunks are appended to a part file under UPLOAD_DIR/_sessions at the
+    session's current offset. Once complete, the session's id is passed to
+    the project create/update endpoints instead of a file, and the part file
+    becomes a ProjectFile. Sessions not touched for UPLOAD_SESSION_TTL_HOURS
+    expire together with their part file.
+    """
+    __tablename__ = "upload_sessions"
+
+    id = Column(String(32), primary_key=True, comment="Random hex id, also the part file name")
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    filename = Column(String(500), nullable=False, comment="Original filename, validated like a direct upload")
+    mime_type = Column(String(100), nullable=True)
+    size = Column(BigInteger, nullable=False, comment="Declared total size in bytes")
+    received = Column(BigInteger, nullable=False, default=0, comment="Bytes stored so far; the next chunk starts here")
+    expected_sha256 = Column(String(64), nullable=True, comment="Client-declared digest, checked on completion")
+    sha256 = Column(String(64), nullable=True, comment="Digest of the whole file, set on completion")
+    status = Column(SQLEnum(UploadStatus), nullable=False, default=UploadStatus.UPLOADING)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True, comment="Pushed back by every chunk")
+
+    chunks = relationship(
+        "UploadChunk", back_populates="session", cascade="all, delete-orphan", order_by="UploadChunk.offset"
+    )
+
+    def __repr__(self):
+        return f"<UploadSession(id='{self.id}', received={self.received}/{self.size}, status='{self.status}')>"
+
+
+class UploadChunk(Base):
+    """Checksum of one stored chunk of an upload session, re-verified on completion."""
+    __tablename__ = "upload_chunks"
+
+    __table_args__ = (
+        Index("ix_upload_chunks_session_offset", "session_id", "offset", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    session_id = Column(String(32), ForeignKey("upload_sessions.id", ondelete="CASCADE"), nullable=False)
+    offset = Column(BigInteger, nullable=False, comment="Position of the chunk's first byte")
+    length = Column(Integer, nullable=False)
+    sha256 = Column(String(64), nullable=False)
+
+    session = relationship("UploadSession", back_populates="chunks")
+
+    def __repr__(self):
+        return f"<UploadChunk(session_id='{self.session_id}', offset={self.offset}, length={self.length})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, UUID
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Uuid
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -13,7 +13,7 @@ class User(Base):
 
     # Primary Key
     id = Column(Integer, primary_key=True, index=True)
-    uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False)
+    uuid = Column(Uuid(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False)
     
     # Authentication
     email = Column(String(255), unique=True, index=True, nullable=False)
@@ -12,6 +12,7 @@ from app.schemas.access_request import (
     AccessRequestRespond, AccessRequestSummary
 )
 from app.dependencies.dependencies import get_current_active_user
+from app.services.search_cache_service import SearchCacheService
 
 router = APIRouter(prefix="/access", tags=["Access Requests"])
 
@@ -217,8 +218,8 @@ async def respond_to_access_request(
             detail="Only project owners can respond to access requests"
         )
 
-    # Check if request is still pending
-    if request.status != AccessRequestStatus.PENDING:
+    # Approve/deny answer a pending request; revoke withdraws an approved one
+    if response_data.action != "revoke" and request.status != AccessRequestStatus.PENDING:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="This request has already been responded to"
@@ -243,6 +244,10 @@ async def respond_to_access_request(
     db.commit()
     db.refresh(request)
 
+    # Approving or revoking changes what the requester's searches return; the
+    # generation bump also retires their cached visible-project set
+    SearchCacheService.invalidate_user(request.requester_id)
+
     return request
 
 
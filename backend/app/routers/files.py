@@ -1,6 +1,6 @@
 import os
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session, joinedload
 from typing import List
 
@@ -9,20 +9,18 @@ from app.dependencies.dependencies import get_current_active_user
 from app.models import User, Project, ProjectFile
 from app.services import ProjectService, FileService
 from app.config import get_settings
-from app.schemas import ProjectFile as ProjectFileSchema
+from app.schemas import ProjectFile as ProjectFileSchema, DownloadUrl
+from app.utils.file_download import (
+    accel_redirect_response, download_response, evaluate_request, file_etag, inline_media_type
+)
+from app.utils.signed_url import sign_download, verify_download
 
 router = APIRouter(prefix="/files", tags=["Files"])
 settings = get_settings()
 
-@router.get("/{file_id}/download")
-def download_project_file(
-    file_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
-):
-    """
-    Downloads a specific project file, checking for access permissions first.
-    """
+
+def _get_downloadable_file(db: Session, file_id: int, current_user: User) -> ProjectFile:
+    """The file with its project, after checking the user may download it"""
     # Query for the file and eagerly load the associated project and its uploader
     db_file = db.query(ProjectFile).options(
         joinedload(ProjectFile.project).joinedload(Project.uploader)
@@ -39,23 +37,121 @@ def download_project_file(
     # Check if the user has permission to access the full content
     if not project.can_access_full_content(user_id=current_user.id, user_role=current_user.role):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to download this file")
+    return db_file
+
+
+def _send_file(request: Request, db: Session, db_file: ProjectFile, user_id: int, inline: bool = False):
+    """Serve an authorized download: conditional and range handling, counting, then the body"""
+    project = db_file.project
 
     # Construct the full path to the file on disk
     file_path = os.path.join(settings.UPLOAD_DIR, db_file.saved_path)
     if not os.path.exists(file_path):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found on disk. It may have been moved or deleted.")
 
-    # Increment download count if the user is not the owner
-    if project.uploaded_by != current_user.id:
+    stat_result = os.stat(file_path)
+    etag = file_etag(db_file.sha256, stat_result.st_size, stat_result.st_mtime)
+    status_code, ranges = evaluate_request(request.headers, stat_result.st_size, etag, db_file.created_at)
+
+    # Increment download count if the user is not the owner. A download is
+    # counted once: a full response or a range request starting at byte 0,
+    # not revalidations (304) or the follow-up ranges of a viewer or resume
+    starts_download = status_code == 200 or (status_code == 206 and ranges[0][0] == 0)
+    if starts_download and project.uploaded_by != user_id:
         ProjectService.increment_download_count(db, project=project)
 
+    # Only allowlisted types are displayed inline (the stored type is client
+    # supplied); everything else is a generic attachment
+    media_type = inline_media_type(db_file.mime_type) if inline else None
+    inline = media_type is not None
+    media_type = media_type or 'application/octet-stream'
+
+    # Behind nginx, hand the file body over once access and counting are done
+    if settings.DOWNLOAD_ACCEL_REDIRECT and status_code in (200, 206):
+        return accel_redirect_response(
+            settings.DOWNLOAD_ACCEL_LOCATION,
+            saved_path=db_file.saved_path,
+            filename=db_file.original_filename,
+            media_type=media_type,
+            etag=etag,
+            last_modified=db_file.created_at,
+            inline=inline
+        )
+
     # Return the file as a response, using its original filename
-    return FileResponse(
+    return download_response(
+        status_code, ranges,
         path=str(file_path),
         filename=db_file.original_filename,
-        media_type='application/octet-stream'  # Generic media type for downloads
+        media_type=media_type,
+        size=stat_result.st_size,
+        etag=etag,
+        last_modified=db_file.created_at,
+        inline=inline
     )
 
+
+@router.get("/{file_id}/download")
+def download_project_file(
+    file_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Downloads a specific project file, checking for access permissions first.
+    Supports conditional requests (ETag / Last-Modified, 304) and byte
+    ranges (206, including multipart/byteranges). With
+    DOWNLOAD_ACCEL_REDIRECT the file bytes are sent by nginx.
+    """
+    db_file = _get_downloadable_file(db, file_id, current_user)
+    return _send_file(request, db, db_file, current_user.id)
+
+
+@router.post("/{file_id}/download-url", response_model=DownloadUrl)
+def create_download_url(
+    file_id: int,
+    request: Request,
+    inline: bool = Query(False, description="Let the browser display a PDF instead of saving it; other types are always downloaded"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Mint a short-lived signed URL for a file the user may download. The URL
+    needs no Authorization header, so browsers and PDF viewers can stream
+    it and make their own Range requests.
+    """
+    db_file = _get_downloadable_file(db, file_id, current_user)
+    params = sign_download(db_file.id, current_user.id, inline=inline)
+    url = request.url_for("download_signed_file", file_id=db_file.id).include_query_params(**params)
+    return DownloadUrl(url=str(url), expires_at=datetime.utcfromtimestamp(params["expires"]))
+
+
+@router.get("/{file_id}/signed")
+def download_signed_file(
+    file_id: int,
+    request: Request,
+    user: int = Query(...),
+    expires: int = Query(...),
+    inline: bool = Query(False),
+    signature: str = Query(...),
+    db: Session = Depends(get_db)
+):
+    """
+    Download through a URL from POST /files/{file_id}/download-url. The
+    signature stands in for the access check made when it was minted; only
+    the file itself is looked up.
+    """
+    if not verify_download(file_id, user, expires, inline, signature):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Download link is invalid or has expired")
+
+    db_file = db.query(ProjectFile).options(
+        joinedload(ProjectFile.project)
+    ).filter(ProjectFile.id == file_id).first()
+    if not db_file or not db_file.project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+    return _send_file(request, db, db_file, user, inline=inline)
+
 @router.delete("/{file_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_project_file(
     file_id: int,
@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Body
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Body, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.database import get_db
 from app.models import User, Project, FileType
-from app.schemas import ProjectCreate, ProjectRead, ProjectUpdate, ProjectFile as ProjectFileSchema, ProjectStatus, PrivacyLevel
+from app.schemas import ProjectCreate, ProjectRead, ProjectUpdate, ProjectFile as ProjectFileSchema, ProjectStatus, PrivacyLevel, SimilarProject
 from app.dependencies.dependencies import get_current_active_user
-from app.services import ProjectService, FileService
+from app.services import ProjectService, FileService, SimilarityService, DuplicateService, ExtractionService, UploadService
+from app.utils.pagination import NEXT_CURSOR_HEADER, next_cursor
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
@@ -92,29 +93,52 @@ def get_project_update_form(
 @router.post("/", response_model=ProjectRead, status_code=status.HTTP_201_CREATED)
 async def create_project(
     project_data: ProjectCreate = Depends(get_project_create_form),
-    main_file: UploadFile = File(...),
+    main_file: Optional[UploadFile] = File(None),
     supplementary_files: List[UploadFile] = File([]),
+    main_upload_id: Optional[str] = Form(None),
+    supplementary_upload_ids: List[str] = Form([]),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
     Create a new project with a main file and optional supplementary files.
+    Files can be sent directly or as ids of completed resumable uploads
+    (`main_upload_id`, `supplementary_upload_ids`).
     """
     if current_user.role != "student":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only students can upload projects")
 
+    has_main_file = main_file is not None and bool(main_file.filename)
+    if has_main_file == bool(main_upload_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide exactly one of main_file or main_upload_id"
+        )
+    # Check the uploads before anything is created
+    main_upload = UploadService.get_completed(db, main_upload_id, current_user) if main_upload_id else None
+    supplementary_uploads = [
+        UploadService.get_completed(db, upload_id, current_user) for upload_id in supplementary_upload_ids
+    ]
+
     # Create the project entry first
     project = ProjectService.create_project(db, project_data=project_data, uploader_id=current_user.id)
     
     try:
         # Handle the main file (renamed from pdf_file for clarity)
-        await FileService.create_project_file_record(
-            db=db,
-            project_id=project.id,
-            user_uuid=current_user.uuid,
-            upload_file=main_file,
-            file_type=FileType.MAIN_REPORT
-        )
+        if main_upload is not None:
+            FileService.create_project_file_record_from_upload(
+                db=db,
+                project_id=project.id,
+                upload=main_upload,
+                file_type=FileType.MAIN_REPORT
+            )
+        else:
+            await FileService.create_project_file_record(
+                db=db,
+                project_id=project.id,
+                upload_file=main_file,
+                file_type=FileType.MAIN_REPORT
+            )
 
         # Handle supplementary files
         for sup_file in supplementary_files:
@@ -122,14 +146,25 @@ async def create_project(
                 await FileService.create_project_file_record(
                     db=db,
                     project_id=project.id,
-                    user_uuid=current_user.uuid,
                     upload_file=sup_file,
                     file_type=FileType.SUPPLEMENTARY
                 )
+        for sup_upload in supplementary_uploads:
+            FileService.create_project_file_record_from_upload(
+                db=db,
+                project_id=project.id,
+                upload=sup_upload,
+                file_type=FileType.SUPPLEMENTARY
+            )
         
         db.commit()
         db.refresh(project)
+        ExtractionService.notify()
 
+    except HTTPException:
+        # Validation errors (413 too large, 400 file type) keep their status
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         # Note: File cleanup on disk might be needed if something goes wrong
@@ -138,8 +173,10 @@ async def create_project(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred during file upload: {str(e)}"
         )
-        
-    return project
+
+    response = ProjectRead.model_validate(project)
+    response.possible_duplicates = DuplicateService.likely_duplicates(db, project.id, current_user)
+    return response
 
 @router.post("/{project_id}/files", response_model=List[ProjectFileSchema])
 async def upload_project_files(
@@ -166,7 +203,6 @@ async def upload_project_files(
                 new_file_record = await FileService.create_project_file_record(
                     db=db,
                     project_id=project.id,
-                    user_uuid=current_user.uuid,
                     upload_file=file,
                     file_type=FileType.SUPPLEMENTARY
                 )
@@ -176,6 +212,9 @@ async def upload_project_files(
         for f in created_files:
             db.refresh(f)
 
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         # Basic cleanup of files that might have been saved before the error
@@ -189,11 +228,21 @@ async def upload_project_files(
 
 @router.get("/me/projects", response_model=List[ProjectRead])
 def get_my_projects(
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the X-Next-Cursor header of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Page size; omit to return all projects"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get all projects uploaded by the current user."""
-    return ProjectService.get_user_projects(db, user_id=current_user.id)
+    """Get projects uploaded by the current user, newest first."""
+    projects = ProjectService.get_user_projects(db, user_id=current_user.id, cursor=cursor, limit=limit)
+
+    if limit:
+        cursor_out = next_cursor(projects, limit)
+        if cursor_out:
+            response.headers[NEXT_CURSOR_HEADER] = cursor_out
+
+    return projects
 
 @router.get("/{project_id}", response_model=ProjectRead)
 def get_project(
@@ -216,37 +265,69 @@ def get_project(
 
     return project
 
+@router.get("/{project_id}/similar", response_model=List[SimilarProject])
+def get_similar_projects(
+    project_id: int,
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of similar projects"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Projects related to this one by title, abstract and tags, most similar first."""
+    project = ProjectService.get_project_by_id(db, project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+
+    if not project.can_access(user_id=current_user.id, user_role=current_user.role):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to view this project")
+
+    return SimilarityService.similar_projects(db, project_id, limit=limit, current_user=current_user)
+
 @router.post("/{project_id}", response_model=ProjectRead)
 async def update_project(
     project_id: int,
     project_update: ProjectUpdate = Depends(get_project_update_form),
     pdf_file: Optional[UploadFile] = File(None),
+    pdf_upload_id: Optional[str] = Form(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
-    Update a project's metadata and optionally replace its main file.
+    Update a project's metadata and optionally replace its main file, sent
+    directly or as the id of a completed resumable upload (`pdf_upload_id`).
     """
     project = ProjectService.get_project_by_id(db, project_id)
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
 
+    new_report = pdf_file if pdf_file and pdf_file.filename else None
+    if pdf_upload_id:
+        if new_report is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Provide either pdf_file or pdf_upload_id, not both"
+            )
+        new_report = UploadService.get_completed(db, pdf_upload_id, current_user)
+
     # Update metadata
     updated_project = ProjectService.update_project(db, project=project, update_data=project_update, user_id=current_user.id)
 
     try:
         # Handle new PDF file if provided
-        if pdf_file and pdf_file.filename:
+        if new_report is not None:
             await FileService.replace_main_report(
                 db=db,
                 project=project,
-                user_uuid=current_user.uuid,
-                new_file=pdf_file
+                new_file=new_report
             )
         
         db.commit()
         db.refresh(updated_project)
+        if new_report is not None:
+            ExtractionService.notify()
 
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -254,4 +335,7 @@ async def update_project(
             detail=f"An error occurred during file update: {str(e)}"
         )
 
-    return updated_project
\ No newline at end of file
+    response = ProjectRead.model_validate(updated_project)
+    if new_report is not None or {"title", "abstract"} & project_update.model_fields_set:
+        response.possible_duplicates = DuplicateService.likely_duplicates(db, project_id, current_user)
+    return response
\ No newline at end of file
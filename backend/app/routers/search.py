@@ -1,131 +1,142 @@
-from fastapi import APIRouter, Depends, Query
+import time
+
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from sqlalchemy import or_, and_, func
 
 from app.database import get_db
 from app.models.user import User
-from app.models.project import Project, PrivacyLevel
-from app.schemas.project import ProjectSummary, ProjectSearch
-from app.dependencies.dependencies import get_current_user_optional
+from app.models.project import PrivacyLevel, ProjectStatus
+from app.schemas.project import ProjectSummary, ProjectSearch, FacetedSearchResult
+from app.dependencies.dependencies import get_current_user_optional, require_dosen
+from app.services.search_service import SearchService
+from app.services.tag_stats_service import TagStatsService
+from app.services.suggestion_service import SuggestionService
+from app.services.search_cache_service import SearchCacheService
+from app.services.search_analytics_service import SearchAnalyticsService
+from app.services.visibility_service import VisibilityService
+from app.utils.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, TOTAL_ACCURACY_HEADER
 
 router = APIRouter(prefix="/search", tags=["Search"])
 
 
 # =====================================================
-# SEARCH PROJECTS
+# SEARCH PARAMETERS
 # =====================================================
-@router.get("/", response_model=List[ProjectSummary])
-async def search_projects(
-    q: Optional[str] = Query(None, description="Search query for title, abstract, authors, or tags"),
+def get_search_params(
+    q: Optional[str] = Query(None, description="Full-text query over title, tags, authors, and abstract"),
     year: Optional[int] = Query(None, description="Filter by year"),
-    tag: Optional[str] = Query(None, description="Filter by specific tag"),
+    tag: Optional[str] = Query(None, description="Filter by specific tag (case-insensitive exact match)"),
+    author: Optional[str] = Query(None, description="Filter by author name (case-insensitive exact match)"),
     privacy_level: Optional[PrivacyLevel] = Query(None, description="Filter by privacy level"),
-    status: Optional[str] = Query(None, description="Filter by project status"),
+    status: Optional[ProjectStatus] = Query(None, description="Filter by project status"),
     uploader_id: Optional[int] = Query(None, description="Filter by uploader ID"),
     advisor_id: Optional[int] = Query(None, description="Filter by advisor ID"),
     semester: Optional[str] = Query(None, description="Filter by semester"),
     class_name: Optional[str] = Query(None, description="Filter by class name"),
     course_code: Optional[str] = Query(None, description="Filter by course code"),
+    sort: str = Query("relevance", pattern="^(relevance|newest)$", description="'relevance' (when q is given) or 'newest'"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the X-Next-Cursor header of the previous page"),
     skip: int = Query(0, ge=0, description="Number of results to skip"),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of results to return"),
+) -> ProjectSearch:
+    """Shared query parameters of the GET search endpoints"""
+    return ProjectSearch(
+        query=q,
+        year=year,
+        tag=tag,
+        author=author,
+        privacy_level=privacy_level,
+        status=status,
+        uploader_id=uploader_id,
+        advisor_id=advisor_id,
+        semester=semester,
+        class_name=class_name,
+        course_code=course_code,
+        sort=sort,
+        cursor=cursor,
+        skip=skip,
+        limit=limit
+    )
+
+
+# =====================================================
+# SEARCH PROJECTS
+# =====================================================
+@router.get("/", response_model=List[ProjectSummary])
+async def search_projects(
+    response: Response,
+    search_params: ProjectSearch = Depends(get_search_params),
+    include_total: bool = Query(False, description="Report the number of matches in X-Total-Count"),
     current_user: Optional[User] = Depends(get_current_user_optional),
     db: Session = Depends(get_db)
 ):
     """
-    Search and filter projects with access control
+    Search and filter projects with access control.
+    Newest-first pages carry an X-Next-Cursor header for keyset pagination.
+    With include_total, X-Total-Count / X-Total-Count-Accuracy carry the
+    match count, counted concurrently with the page.
     """
-    query = db.query(Project)
-
-    # Apply text search
-    if q:
-        search_term = f"%{q}%"
-        query = query.filter(
-            or_(
-                Project.title.ilike(search_term),
-                Project.abstract.ilike(search_term),
-                func.array_to_string(Project.authors, ' ').ilike(search_term),
-                func.array_to_string(Project.tags, ' ').ilike(search_term)
-            )
-        )
-
-    # Apply filters
-    if year:
-        query = query.filter(Project.year == year)
-
-    if tag:
-        # Case-insensitive partial match in tags
-        query = query.filter(
-            func.array_to_string(Project.tags, ' ').ilike(f'%{tag}%')
-        )
-
-    if privacy_level:
-        query = query.filter(Project.privacy_level == privacy_level)
-
-    if status:
-        query = query.filter(Project.status == status)
-
-    if uploader_id:
-        query = query.filter(Project.uploaded_by == uploader_id)
-
-    if advisor_id:
-        query = query.filter(Project.advisor_id == advisor_id)
-
-    if semester:
-        query = query.filter(Project.semester == semester)
-
-    if class_name:
-        query = query.filter(Project.class_name.ilike(f"%{class_name}%"))
-
-    if course_code:
-        query = query.filter(Project.course_code.ilike(f"%{course_code}%"))
-
-    # Get results ordered by relevance (newest first for now)
-    projects = query.order_by(Project.created_at.desc()).offset(skip).limit(limit).all()
-
-    # Apply access control
-    accessible_projects = []
-    for project in projects:
-        if current_user and project.can_access(current_user.id, current_user.role):
-            accessible_projects.append(project)
-        elif project.privacy_level == PrivacyLevel.PUBLIC:
-            # Public projects are accessible to everyone
-            accessible_projects.append(project)
-
-    # Convert to summary format
-    results = []
-    for project in accessible_projects:
-        # Get uploader info
-        uploader = db.query(User).filter(User.id == project.uploaded_by).first()
-        uploader_name = uploader.full_name if uploader else None
-
-        # Get advisor info
-        advisor_name = None
-        if project.advisor_id:
-            advisor = db.query(User).filter(User.id == project.advisor_id).first()
-            advisor_name = advisor.full_name if advisor else None
-
-        results.append(ProjectSummary(
-            id=project.id,
-            title=project.title,
-            abstract_preview=project.abstract_preview,
-            authors=project.authors,
-            tags=project.tags,
-            year=project.year,
-            semester=project.semester,
-            status=project.status,
-            privacy_level=project.privacy_level,
-            uploaded_by=project.uploaded_by,
-            advisor_id=project.advisor_id,
-            view_count=project.view_count,
-            created_at=project.created_at,
-            uploader_name=uploader_name,
-            advisor_name=advisor_name
-        ))
+    started = time.perf_counter()
+    pending_total = SearchService.start_count(search_params, current_user) if include_total else None
+
+    results, cursor_out = SearchCacheService.search(db, search_params, current_user)
+    if cursor_out:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_out
 
+    if pending_total is not None:
+        total, accuracy = pending_total.result()
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+        response.headers[TOTAL_ACCURACY_HEADER] = accuracy
+
+    SearchAnalyticsService.record_search(search_params, len(results), (time.perf_counter() - started) * 1000)
     return results
 
 
+# =====================================================
+# EXPORT SEARCH RESULTS
+# =====================================================
+EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+@router.get("/export")
+def export_search_results(
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="'csv' or 'ndjson'"),
+    search_params: ProjectSearch = Depends(get_search_params),
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """
+    Stream every project matching the search filters, newest first, as CSV
+    or NDJSON. Paging parameters are ignored; access control is the same
+    as GET /search.
+    """
+    return StreamingResponse(
+        SearchService.stream_export(search_params, current_user, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="projects.{format}"'}
+    )
+
+
+# =====================================================
+# FACETED SEARCH
+# =====================================================
+@router.get("/faceted", response_model=FacetedSearchResult)
+async def faceted_search(
+    search_params: ProjectSearch = Depends(get_search_params),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+    db: Session = Depends(get_db)
+):
+    """
+    Search results plus hit counts per year, tag, semester, course code,
+    class name and status for the same filtered, visible result set
+    """
+    results, cursor_out = SearchCacheService.search(db, search_params, current_user)
+    facets = SearchService.facets(db, search_params, current_user)
+
+    return FacetedSearchResult(results=results, facets=facets, next_cursor=cursor_out)
+
+
 # =====================================================
 # GET SEARCH SUGGESTIONS
 # =====================================================
@@ -137,42 +148,15 @@ async def get_search_suggestions(
     db: Session = Depends(get_db)
 ):
     """
-    Get search suggestions based on partial query
-    """
-    suggestions = {
-        "titles": [],
-        "authors": [],
-        "tags": [],
-        "courses": []
-    }
-
-    # Get title suggestions
-    titles = db.query(Project.title).filter(
-        Project.title.ilike(f"{q}%")
-    ).distinct().limit(limit).all()
-    suggestions["titles"] = [title[0] for title in titles]
-
-    # Get author suggestions
-    # This is more complex due to array field
-    authors_query = db.query(func.unnest(Project.authors).label('author')).filter(
-        func.unnest(Project.authors).ilike(f"{q}%")
-    ).distinct().limit(limit)
-    authors = authors_query.all()
-    suggestions["authors"] = [author[0] for author in authors]
-
-    # Get tag suggestions
-    tags_query = db.query(func.unnest(Project.tags).label('tag')).filter(
-        func.unnest(Project.tags).ilike(f"{q}%")
-    ).distinct().limit(limit)
-    tags = tags_query.all()
-    suggestions["tags"] = [tag[0] for tag in tags]
-
-    # Get course code suggestions
-    courses = db.query(Project.course_code).filter(
-        Project.course_code.ilike(f"{q}%")
-    ).distinct().limit(limit).all()
-    suggestions["courses"] = [course[0] for course in courses if course[0]]
+    Get search suggestions based on partial query.
 
+    Served from the in-memory prefix index; only projects the user can see
+    contribute completions.
+    """
+    started = time.perf_counter()
+    suggestions = SuggestionService.suggest(db, q, limit, current_user)
+    hits = sum(len(completions) for completions in suggestions.values())
+    SearchAnalyticsService.record_suggestions(q, hits, (time.perf_counter() - started) * 1000)
     return suggestions
 
 
@@ -185,41 +169,17 @@ async def get_search_filters(
     db: Session = Depends(get_db)
 ):
     """
-    Get available filter options for search
+    Get available filter options for search (counted over projects the user can see)
     """
-    filters = {}
-
-    # Get available years
-    years = db.query(Project.year).distinct().order_by(Project.year.desc()).all()
-    filters["years"] = [year[0] for year in years]
-
-    # Get available tags (most common)
-    tags_query = db.query(
-        func.unnest(Project.tags).label('tag'),
-        func.count().label('count')
-    ).group_by(func.unnest(Project.tags)).order_by(func.count().desc()).limit(50)
-    tags = tags_query.all()
-    filters["tags"] = [{"tag": tag[0], "count": tag[1]} for tag in tags]
-
-    # Get available semesters
-    semesters = db.query(Project.semester).distinct().filter(
-        Project.semester.isnot(None)
-    ).order_by(Project.semester).all()
-    filters["semesters"] = [sem[0] for sem in semesters if sem[0]]
-
-    # Get available course codes
-    courses = db.query(Project.course_code).distinct().filter(
-        Project.course_code.isnot(None)
-    ).order_by(Project.course_code).all()
-    filters["course_codes"] = [course[0] for course in courses if course[0]]
-
-    # Get available class names
-    classes = db.query(Project.class_name).distinct().filter(
-        Project.class_name.isnot(None)
-    ).order_by(Project.class_name).all()
-    filters["class_names"] = [cls[0] for cls in classes if cls[0]]
-
-    return filters
+    facets = SearchService.facets(db, ProjectSearch(), current_user, include_tags=False)
+
+    return {
+        "years": sorted((int(f.value) for f in facets.year), reverse=True),
+        "tags": TagStatsService.popular_tags(db, current_user, limit=50),
+        "semesters": sorted(f.value for f in facets.semester),
+        "course_codes": sorted(f.value for f in facets.course_code),
+        "class_names": sorted(f.value for f in facets.class_name),
+    }
 
 
 # =====================================================
@@ -228,26 +188,18 @@ async def get_search_filters(
 @router.post("/advanced", response_model=List[ProjectSummary])
 async def advanced_search(
     search_params: ProjectSearch,
+    response: Response,
     current_user: Optional[User] = Depends(get_current_user_optional),
     db: Session = Depends(get_db)
 ):
     """
     Advanced search with complex filtering
     """
-    # Use the same logic as basic search but with structured parameters
-    return await search_projects(
-        q=search_params.query,
-        year=search_params.year,
-        tag=search_params.tag,
-        privacy_level=search_params.privacy_level,
-        status=search_params.status,
-        uploader_id=search_params.uploader_id,
-        advisor_id=search_params.advisor_id,
-        skip=search_params.skip,
-        limit=search_params.limit,
-        current_user=current_user,
-        db=db
-    )
+    results, cursor_out = SearchCacheService.search(db, search_params, current_user)
+    if cursor_out:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_out
+
+    return results
 
 
 # =====================================================
@@ -262,31 +214,65 @@ async def get_popular_tags(
     """
     Get most popular tags across all accessible projects
     """
-    # Get projects user can access
-    query = db.query(Project)
-
-    if current_user:
-        # Complex access control query - for simplicity, get public projects and user's projects
-        query = query.filter(
-            or_(
-                Project.privacy_level == PrivacyLevel.PUBLIC,
-                Project.uploaded_by == current_user.id,
-                Project.advisor_id == current_user.id
-            )
-        )
-    else:
-        # Anonymous users only see public projects
-        query = query.filter(Project.privacy_level == PrivacyLevel.PUBLIC)
-
-    # Get tag counts
-    tags_query = db.query(
-        func.unnest(Project.tags).label('tag'),
-        func.count().label('count')
-    ).filter(
-        Project.id.in_(
-            query.with_entities(Project.id).subquery()
-        )
-    ).group_by(func.unnest(Project.tags)).order_by(func.count().desc()).limit(limit)
-
-    tags = tags_query.all()
-    return [{"tag": tag[0], "count": tag[1]} for tag in tags]
\ No newline at end of file
+    return TagStatsService.popular_tags(db, current_user, limit)
+
+
+# =====================================================
+# SEARCH CACHE METRICS
+# =====================================================
+@router.get("/cache-stats")
+async def get_search_cache_stats(
+    current_user: User = Depends(require_dosen)
+):
+    """
+    Hit/miss counters of the search result cache and the visible-project
+    set cache (this worker process)
+    """
+    return {**SearchCacheService.stats(), "visibility": VisibilityService.stats()}
+
+
+# =====================================================
+# SEARCH ANALYTICS
+# =====================================================
+@router.get("/analytics/top-queries")
+async def get_top_queries(
+    days: int = Query(7, ge=1, le=365, description="Look-back window in days"),
+    limit: int = Query(20, ge=1, le=100),
+    endpoint: str = Query("search", pattern="^(search|suggestions)$"),
+    current_user: User = Depends(require_dosen),
+    db: Session = Depends(get_db)
+):
+    """
+    Most frequent normalized queries with their average hit count and latency
+    """
+    return SearchAnalyticsService.top_queries(db, days, limit, endpoint)
+
+
+@router.get("/analytics/zero-results")
+async def get_zero_result_queries(
+    days: int = Query(7, ge=1, le=365, description="Look-back window in days"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(require_dosen),
+    db: Session = Depends(get_db)
+):
+    """
+    Queries that returned no results, most frequent first
+    """
+    return SearchAnalyticsService.zero_result_queries(db, days, limit)
+
+
+@router.get("/analytics/latency")
+async def get_latency_by_shape(
+    days: int = Query(7, ge=1, le=365, description="Look-back window in days"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(require_dosen),
+    db: Session = Depends(get_db)
+):
+    """
+    p50/p95 latency per query shape, shapes with the most total time first,
+    plus this worker's analytics buffer counters
+    """
+    return {
+        "shapes": SearchAnalyticsService.latency_by_shape(db, days, limit),
+        "buffer": SearchAnalyticsService.stats(),
+    }
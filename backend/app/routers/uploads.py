@@ -0,0 +1,99 @@
+from fastapi import APIRouter, Depends, Header, Request, Response, status
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.database import get_db
+from app.dependencies.dependencies import get_current_active_user
+from app.models import User
+from app.schemas import UploadSessionCreate, UploadSessionRead
+from app.services import UploadService
+
+router = APIRouter(prefix="/uploads", tags=["Uploads"])
+
+# Offset of the next expected byte, also sent on every session response
+UPLOAD_OFFSET_HEADER = "Upload-Offset"
+
+
+def _with_offset(response: Response, upload) -> UploadSessionRead:
+    response.headers[UPLOAD_OFFSET_HEADER] = str(upload.received)
+    return UploadSessionRead.model_validate(upload)
+
+
+@router.post("/", response_model=UploadSessionRead, status_code=status.HTTP_201_CREATED)
+def create_upload_session(
+    data: UploadSessionCreate,
+    response: Response,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Start a resumable upload. Send the file with PATCH requests, complete it,
+    then pass its id to project create/update instead of a file.
+    """
+    upload = UploadService.create_session(db, current_user, data)
+    return _with_offset(response, upload)
+
+
+@router.get("/{upload_id}", response_model=UploadSessionRead)
+def get_upload_session(
+    upload_id: str,
+    response: Response,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Current state of an upload; after a dropped connection, resume from `received`.
+    """
+    upload = UploadService.get_session(db, upload_id, current_user)
+    return _with_offset(response, upload)
+
+
+@router.patch("/{upload_id}", response_model=UploadSessionRead)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    response: Response,
+    upload_offset: int = Header(..., alias=UPLOAD_OFFSET_HEADER, ge=0),
+    chunk_sha256: Optional[str] = Header(None, alias="X-Chunk-SHA256"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Append the raw request body at `Upload-Offset`, which must equal the
+    bytes received so far. An optional `X-Chunk-SHA256` header is checked
+    against the body.
+    """
+    upload = UploadService.get_session(db, upload_id, current_user)
+    upload = await UploadService.append_chunk(db, upload, upload_offset, request.stream(), chunk_sha256)
+    return _with_offset(response, upload)
+
+
+@router.post("/{upload_id}/complete", response_model=UploadSessionRead)
+async def complete_upload(
+    upload_id: str,
+    response: Response,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Verify the stored chunks and compute the file's SHA-256. The upload can
+    then be attached to a project.
+    """
+    upload = UploadService.get_session(db, upload_id, current_user)
+    upload = await UploadService.complete(db, upload)
+    return _with_offset(response, upload)
+
+
+@router.delete("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_upload_session(
+    upload_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Abandon an upload and delete its data.
+    """
+    upload = UploadService.get_session(db, upload_id, current_user)
+    UploadService.discard(db, upload)
+    db.commit()
+    return None
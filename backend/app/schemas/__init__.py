@@ -9,14 +9,17 @@ from app.schemas.user import (
 )
 from app.schemas.project import (
     PrivacyLevel, ProjectStatus, ProjectBase, ProjectCreate,
-    ProjectRead, ProjectUpdate, ProjectSearch, ProjectSummary
+    ProjectRead, ProjectUpdate, ProjectSearch, ProjectSummary, SimilarProject,
+    DuplicateMatch,
+    FacetCount, SearchFacets, FacetedSearchResult
 )
 from app.schemas.access_request import (
     AccessRequestStatus, AccessRequestBase, AccessRequestCreate,
     AccessRequestRead, AccessRequestUpdate, AccessRequestRespond,
     AccessRequestSummary
 )
-from app.schemas.file import ProjectFile, ProjectFileBase, ProjectFileCreate
+from app.schemas.file import ProjectFile, ProjectFileBase, ProjectFileCreate, DownloadUrl
+from app.schemas.upload import UploadSessionCreate, UploadSessionRead
 from app.schemas.course import (
     CourseBase, CourseCreate, CourseRead, CourseUpdate, CourseSummary
 )
@@ -28,7 +31,9 @@ __all__ = [
 
     # Project schemas
     "PrivacyLevel", "ProjectStatus", "ProjectBase", "ProjectCreate",
-    "ProjectRead", "ProjectUpdate", "ProjectSearch", "ProjectSummary",
+    "ProjectRead", "ProjectUpdate", "ProjectSearch", "ProjectSummary", "SimilarProject",
+    "DuplicateMatch",
+    "FacetCount", "SearchFacets", "FacetedSearchResult",
 
     # Access request schemas
     "AccessRequestStatus", "AccessRequestBase", "AccessRequestCreate",
@@ -36,7 +41,10 @@ __all__ = [
     "AccessRequestSummary",
 
     # File schemas
-    "ProjectFile", "ProjectFileBase", "ProjectFileCreate",
+    "ProjectFile", "ProjectFileBase", "ProjectFileCreate", "DownloadUrl",
+
+    # Upload session schemas
+    "UploadSessionCreate", "UploadSessionRead",
 
     # Course schemas
     "CourseBase", "CourseCreate", "CourseRead", "CourseUpdate", "CourseSummary",
@@ -2,7 +2,7 @@ from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
 
-from app.models.file import FileType
+from app.models.file import FileType, ExtractionStatus
 
 
 class ProjectFileBase(BaseModel):
@@ -10,6 +10,7 @@ class ProjectFileBase(BaseModel):
     file_type: FileType
     mime_type: Optional[str] = None
     file_size: Optional[int] = None
+    sha256: Optional[str] = None
 
 
 class ProjectFileCreate(ProjectFileBase):
@@ -21,6 +22,16 @@ class ProjectFile(ProjectFileBase):
     id: int
     saved_path: str
     created_at: datetime
+    # Background text extraction progress (main report PDFs only)
+    extraction_status: Optional[ExtractionStatus] = None
+    extraction_pages_done: Optional[int] = None
+    extraction_pages_total: Optional[int] = None
 
     class Config:
         from_attributes = True
+
+
+class DownloadUrl(BaseModel):
+    """Signed, expiring URL that downloads a file without an Authorization header"""
+    url: str
+    expires_at: datetime
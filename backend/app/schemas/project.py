@@ -72,6 +72,13 @@ class ProjectCreate(ProjectBase):
     })
 
 
+class DuplicateMatch(BaseModel):
+    """Existing project that looks like a near-duplicate of an upload"""
+    project_id: int
+    title: Optional[str] = None  # only for projects the uploader may see
+    similarity: float  # estimated Jaccard similarity of the text, 0-1
+
+
 class ProjectRead(ProjectBase):
     """Schema for project responses (read operations)"""
     id: int
@@ -95,6 +102,9 @@ class ProjectRead(ProjectBase):
     uploader: Optional[UserRead] = None
     advisor: Optional[UserRead] = None
 
+    # Filled in on upload responses when likely duplicates were found
+    possible_duplicates: List[DuplicateMatch] = []
+
     model_config = ConfigDict(from_attributes=True, json_schema_extra={
         "example": {
             "id": 1,
@@ -177,12 +187,18 @@ class ProjectSearch(BaseModel):
     query: Optional[str] = None
     year: Optional[int] = None
     tag: Optional[str] = None
+    author: Optional[str] = None
     privacy_level: Optional[PrivacyLevel] = None
     status: Optional[ProjectStatus] = None
     uploader_id: Optional[int] = None
     advisor_id: Optional[int] = None
-    skip: int = 0
-    limit: int = 20
+    semester: Optional[str] = None
+    class_name: Optional[str] = None
+    course_code: Optional[str] = None
+    sort: str = Field("relevance", pattern="^(relevance|newest)$")
+    cursor: Optional[str] = None  # Opaque keyset cursor from X-Next-Cursor
+    skip: int = Field(0, ge=0)
+    limit: int = Field(20, ge=1, le=100)
 
     model_config = ConfigDict(json_schema_extra={
         "example": {
@@ -190,6 +206,7 @@ class ProjectSearch(BaseModel):
             "year": 2024,
             "tag": "Python",
             "privacy_level": "public",
+            "sort": "newest",
             "skip": 0,
             "limit": 10
         }
@@ -216,4 +233,32 @@ class ProjectSummary(BaseModel):
     uploader_name: Optional[str] = None
     advisor_name: Optional[str] = None
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SimilarProject(ProjectSummary):
+    """Project summary with its cosine similarity to the requested project"""
+    score: float
+
+
+class FacetCount(BaseModel):
+    """Number of matching projects for one facet value"""
+    value: str
+    count: int
+
+
+class SearchFacets(BaseModel):
+    """Hit counts per facet value for the current (filtered, visible) result set"""
+    year: List[FacetCount] = Field(default_factory=list)
+    tag: List[FacetCount] = Field(default_factory=list)
+    semester: List[FacetCount] = Field(default_factory=list)
+    course_code: List[FacetCount] = Field(default_factory=list)
+    class_name: List[FacetCount] = Field(default_factory=list)
+    status: List[FacetCount] = Field(default_factory=list)
+
+
+class FacetedSearchResult(BaseModel):
+    """Search results and facet counts in a single response"""
+    results: List[ProjectSummary]
+    facets: SearchFacets
+    next_cursor: Optional[str] = None
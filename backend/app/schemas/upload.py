@@ -0,0 +1,50 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional
+from datetime import datetime
+
+from app.models.upload import UploadStatus
+
+
+class UploadSessionCreate(BaseModel):
+    """Schema for starting a resumable upload"""
+    filename: str = Field(..., max_length=500, description="Original filename; the extension must be allowed")
+    size: int = Field(..., gt=0, description="Total file size in bytes")
+    mime_type: Optional[str] = Field(None, max_length=100)
+    sha256: Optional[str] = Field(
+        None, pattern="^[0-9a-fA-F]{64}$", description="Optional hex SHA-256 of the whole file, checked on completion"
+    )
+
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "filename": "dataset.zip",
+            "size": 157286400,
+            "mime_type": "application/zip"
+        }
+    })
+
+
+class UploadSessionRead(BaseModel):
+    """Schema for upload session responses; `received` is the offset of the next chunk"""
+    id: str
+    filename: str
+    mime_type: Optional[str] = None
+    size: int
+    received: int
+    status: UploadStatus
+    sha256: Optional[str] = None
+    created_at: datetime
+    expires_at: datetime
+
+    model_config = ConfigDict(from_attributes=True, json_schema_extra={
+        "example": {
+            "id": "3f2b9c0d4e5a4b7c8d9e0f1a2b3c4d5e",
+            "filename": "dataset.zip",
+            "mime_type": "application/zip",
+            "size": 157286400,
+            "received": 67108864,
+            "status": "uploading",
+            "sha256": None,
+            "created_at": "2024-01-01T00:00:00Z",
+            "expires_at": "2024-01-02T00:00:00Z"
+        }
+    })
@@ -8,6 +8,20 @@ from app.services.auth_service import AuthService
 from app.services.project_service import ProjectService
 from app.services.file_service import FileService
 from app.services.course_service import CourseService
+from app.services.search_index_service import SearchIndexService
+from app.services.search_service import SearchService
+from app.services.tag_stats_service import TagStatsService
+from app.services.suggestion_service import SuggestionService
+from app.services.search_cache_service import SearchCacheService
+from app.services.ranking_service import RankingService
+from app.services.taxonomy_service import TaxonomyService
+from app.services.similarity_service import SimilarityService
+from app.services.duplicate_service import DuplicateService
+from app.services.extraction_service import ExtractionService
+from app.services.search_analytics_service import SearchAnalyticsService
+from app.services.visibility_service import VisibilityService
+from app.services.upload_service import UploadService
+from app.services.storage_service import StorageService
 
 # Export services for easy import
 __all__ = [
@@ -15,4 +29,18 @@ __all__ = [
     "ProjectService",
     "FileService",
     "CourseService",
+    "SearchIndexService",
+    "SearchService",
+    "TagStatsService",
+    "SuggestionService",
+    "SearchCacheService",
+    "RankingService",
+    "TaxonomyService",
+    "SimilarityService",
+    "DuplicateService",
+    "ExtractionService",
+    "SearchAnalyticsService",
+    "VisibilityService",
+    "UploadService",
+    "StorageService",
 ]
\ No newline at end of file
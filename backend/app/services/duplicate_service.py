@@ -0,0 +1,242 @@
+import hashlib
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.user import User
+from app.models.project import Project
+from app.models.file import ProjectFilePage
+from app.models.duplicate import ProjectSignature, ProjectLshBucket
+from app.schemas.project import DuplicateMatch
+from app.services.search_index_service import SearchIndexService
+
+
+settings = get_settings()
+
+
+# =====================================================
+# MINHASH / LSH CONFIGURATION
+# =====================================================
+
+# Word n-grams compared between documents
+SHINGLE_SIZE = 3
+
+# 128 permutations split into 32 bands of 4 rows: pairs with Jaccard
+# similarity 0.7 or more share a bucket with probability > 0.99, pairs at
+# 0.3 ~0.23; candidates are then compared on their full signatures
+NUM_PERM = 128
+BANDS = 32
+ROWS_PER_BAND = NUM_PERM // BANDS
+
+# Permutations are h -> (a * h + b) mod p on 32-bit shingle hashes; with
+# p = 2^31 - 1 the product wraps around p many times, so the permutations
+# are independent of the hash order, and a * h + b still fits in 64 bits
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.RandomState(1)
+# Fixed seed: signatures stored in the database must stay comparable
+_PERM_A = _rng.randint(1, (1 << 31) - 1, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, (1 << 31) - 1, size=NUM_PERM, dtype=np.uint64)
+
+# Shingle hashes permuted per step; bounds the NUM_PERM x n matrix a long
+# report would otherwise need (8 MB per step)
+MINHASH_CHUNK = 8192
+
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    """32-bit hashes of the distinct word shingles of `text`"""
+    terms = SearchIndexService.query_terms(text)
+    if len(terms) < SHINGLE_SIZE:
+        shingles = {" ".join(terms)} if terms else set()
+    else:
+        shingles = {" ".join(terms[i:i + SHINGLE_SIZE]) for i in range(len(terms) - SHINGLE_SIZE + 1)}
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little") for s in shingles),
+        dtype=np.uint64, count=len(shingles)
+    )
+
+
+def minhash(hashes: np.ndarray) -> np.ndarray:
+    """MinHash signature (NUM_PERM uint32 values) of a set of 32-bit shingle hashes"""
+    signature = np.full(NUM_PERM, np.iinfo(np.uint32).max, dtype=np.uint64)
+    for start in range(0, hashes.size, MINHASH_CHUNK):
+        # One row per permutation
+        permuted = (np.outer(_PERM_A, hashes[start:start + MINHASH_CHUNK]) + _PERM_B[:, None]) % _PRIME
+        np.minimum(signature, permuted.min(axis=1), out=signature)
+    return signature.astype(np.uint32)
+
+
+def band_buckets(signature: np.ndarray) -> List[int]:
+    """One signed 64-bit bucket key per LSH band"""
+    rows = signature.astype("<u4").reshape(BANDS, ROWS_PER_BAND)
+    return [
+        int.from_bytes(hashlib.blake2b(band.tobytes(), digest_size=8).digest(), "little", signed=True)
+        for band in rows
+    ]
+
+
+def _unpack(signature: bytes) -> np.ndarray:
+    return np.frombuffer(signature, dtype="<u4")
+
+
+# =====================================================
+# DUPLICATE SERVICE
+# =====================================================
+
+class DuplicateService:
+    """Near-duplicate submission detection with MinHash signatures and LSH banding"""
+
+    @staticmethod
+    def document_text(project, report_text: str = "") -> str:
+        """Text a project is compared on: title, abstract and extracted report text"""
+        return f"{project.title or ''} {project.abstract or ''} {report_text}"
+
+    @staticmethod
+    def report_text(db: Session, project_id: int) -> str:
+        """Extracted text of a project's main report, in page order (empty until extraction finishes)"""
+        pages = (
+            db.query(ProjectFilePage.text)
+            .filter(ProjectFilePage.project_id == project_id)
+            .order_by(ProjectFilePage.file_id, ProjectFilePage.page_number)
+        )
+        return " ".join(text for (text,) in pages)
+
+    @staticmethod
+    def _rows(project, report_text: str = "") -> Tuple[Optional[dict], List[dict]]:
+        """project_signatures and project_lsh_buckets rows of a project (None, [] without text)"""
+        hashes = _shingle_hashes(DuplicateService.document_text(project, report_text))
+        if not hashes.size:
+            return None, []
+        signature = minhash(hashes)
+        return (
+            {"project_id": project.id, "signature": signature.astype("<u4").tobytes(), "shingle_count": int(hashes.size)},
+            [
+                {"band": band, "bucket": bucket, "project_id": project.id}
+                for band, bucket in enumerate(band_buckets(signature))
+            ]
+        )
+
+    @staticmethod
+    def index_project(db: Session, project) -> bool:
+        """
+        (Re)compute and store a project's signature and LSH buckets. Must be
+        called after the project has been flushed; runs inside the caller's
+        transaction. Called again once the report's text has been extracted.
+
+        Returns:
+            bool: False when the project has no text to sign
+        """
+        DuplicateService.remove_project(db, project.id)
+        signature, buckets = DuplicateService._rows(project, DuplicateService.report_text(db, project.id))
+        if signature is None:
+            return False
+        db.execute(ProjectSignature.__table__.insert(), signature)
+        db.execute(ProjectLshBucket.__table__.insert(), buckets)
+        return True
+
+    @staticmethod
+    def remove_project(db: Session, project_id: int) -> None:
+        """Drop a project's signature and buckets (SQLite does not enforce ON DELETE CASCADE by default)"""
+        db.query(ProjectLshBucket).filter(ProjectLshBucket.project_id == project_id).delete(synchronize_session=False)
+        db.query(ProjectSignature).filter(ProjectSignature.project_id == project_id).delete(synchronize_session=False)
+
+    @staticmethod
+    def find_similar(
+        db: Session,
+        project_id: int,
+        threshold: Optional[float] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Projects whose estimated Jaccard similarity to `project_id` is at
+        least `threshold`, most similar first.
+
+        Candidates come from the (band, bucket) primary key, so the cost
+        depends on the number of colliding projects, not the archive size.
+        """
+        threshold = settings.DUPLICATE_SIMILARITY_THRESHOLD if threshold is None else threshold
+        row = db.get(ProjectSignature, project_id)
+        if row is None:
+            return []
+        signature = _unpack(row.signature)
+
+        keys = list(enumerate(band_buckets(signature)))
+        candidates = (
+            db.query(ProjectSignature.project_id, ProjectSignature.signature)
+            .filter(ProjectSignature.project_id.in_(
+                db.query(ProjectLshBucket.project_id)
+                .filter(tuple_(ProjectLshBucket.band, ProjectLshBucket.bucket).in_(keys))
+                .filter(ProjectLshBucket.project_id != project_id)
+            ))
+            .all()
+        )
+        if not candidates:
+            return []
+
+        ids = np.fromiter((c.project_id for c in candidates), np.int64, len(candidates))
+        matrix = np.frombuffer(b"".join(c.signature for c in candidates), dtype="<u4").reshape(-1, NUM_PERM)
+        similarity = (matrix == signature).mean(axis=1)
+
+        keep = similarity >= threshold
+        order = np.lexsort((ids[keep], -similarity[keep]))
+        return [(int(ids[keep][i]), float(similarity[keep][i])) for i in order]
+
+    @staticmethod
+    def likely_duplicates(
+        db: Session,
+        project_id: int,
+        current_user: Optional[User] = None
+    ) -> List[DuplicateMatch]:
+        """
+        Likely duplicates of a project for an upload response. Titles are
+        only filled in for projects the user may see.
+        """
+        from app.services.project_service import ProjectService
+
+        matches = DuplicateService.find_similar(db, project_id)
+        if not matches:
+            return []
+
+        ids = [match_id for match_id, _ in matches]
+        titles = dict(
+            ProjectService.apply_access_filter(db.query(Project), current_user)
+            .filter(Project.id.in_(ids))
+            .with_entities(Project.id, Project.title)
+            .all()
+        )
+        return [
+            DuplicateMatch(project_id=match_id, title=titles.get(match_id), similarity=round(similarity, 3))
+            for match_id, similarity in matches
+        ]
+
+    @staticmethod
+    def rebuild(db: Session, batch_size: int = 500) -> int:
+        """
+        Recompute every project's signature, replacing the stored ones with
+        batched multi-row inserts. Returns the number of projects signed.
+        """
+        db.query(ProjectLshBucket).delete(synchronize_session=False)
+        db.query(ProjectSignature).delete(synchronize_session=False)
+
+        count = 0
+        signatures, buckets = [], []
+        with_report = {project_id for (project_id,) in db.query(ProjectFilePage.project_id).distinct()}
+        rows = db.query(Project.id, Project.title, Project.abstract).order_by(Project.id).yield_per(batch_size)
+        for row in rows:
+            report_text = DuplicateService.report_text(db, row.id) if row.id in with_report else ""
+            signature, project_buckets = DuplicateService._rows(row, report_text)
+            if signature is None:
+                continue
+            signatures.append(signature)
+            buckets.extend(project_buckets)
+            count += 1
+            if len(signatures) >= batch_size:
+                db.execute(ProjectSignature.__table__.insert(), signatures)
+                db.execute(ProjectLshBucket.__table__.insert(), buckets)
+                signatures, buckets = [], []
+
+        if signatures:
+            db.execute(ProjectSignature.__table__.insert(), signatures)
+            db.execute(ProjectLshBucket.__table__.insert(), buckets)
+        return count
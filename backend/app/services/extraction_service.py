@@ -0,0 +1,339 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.project import Project
+from app.models.file import ProjectFile, ProjectFilePage, FileType, ExtractionStatus
+from app.services.search_index_service import SearchIndexService
+from app.services.search_cache_service import SearchCacheService
+from app.services.duplicate_service import DuplicateService
+
+
+settings = get_settings()
+
+UPLOAD_DIR = Path(settings.UPLOAD_DIR)
+
+
+# =====================================================
+# WORKER PROCESS
+# =====================================================
+
+def extract_file(file_id: int) -> int:
+    """
+    Extract the remaining pages of one PDF into project_file_pages.
+
+    Runs in an extraction worker process with its own session. Pages are
+    committed in batches together with extraction_pages_done, so a retry
+    resumes after the last committed batch. The PDF reader is reopened for
+    every batch, which discards its object cache: memory stays bounded by
+    one batch of pages, whatever the size of the file.
+
+    Returns:
+        int: total number of pages in the file
+    """
+    from pypdf import PdfReader
+
+    db = SessionLocal()
+    try:
+        db_file = db.get(ProjectFile, file_id)
+        if db_file is None:
+            return 0
+        path = UPLOAD_DIR / db_file.saved_path
+
+        with open(path, "rb") as stream:
+            total = len(PdfReader(stream).pages)
+        db_file.extraction_pages_total = total
+        db_file.extraction_updated_at = datetime.utcnow()
+        db.commit()
+
+        batch = max(settings.PDF_EXTRACTION_PAGE_BATCH, 1)
+        for batch_start in range(db_file.extraction_pages_done, total, batch):
+            batch_end = min(batch_start + batch, total)
+            with open(path, "rb") as stream:
+                reader = PdfReader(stream)
+                for page_number in range(batch_start, batch_end):
+                    page = ProjectFilePage(
+                        file_id=db_file.id,
+                        project_id=db_file.project_id,
+                        page_number=page_number,
+                        text=_page_text(reader, page_number)
+                    )
+                    db.add(page)
+                    db.flush()
+                    SearchIndexService.index_page(db, page)
+
+            db_file.extraction_pages_done = batch_end
+            db_file.extraction_updated_at = datetime.utcnow()
+            db.commit()
+        return total
+    finally:
+        db.close()
+
+
+def _page_text(reader, page_number: int) -> str:
+    """Text of one page; a page pypdf cannot parse is stored empty rather than failing the file"""
+    try:
+        text = reader.pages[page_number].extract_text() or ""
+    except Exception as e:
+        print(f"Error extracting page {page_number}: {e}")
+        return ""
+    # PostgreSQL text columns cannot hold NUL characters
+    return text.replace("\x00", "")
+
+
+# Dispatcher state (API process)
+_pool: Optional[ProcessPoolExecutor] = None
+_in_flight: Set[int] = set()
+_lock = threading.Lock()
+_wake = threading.Event()
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+# =====================================================
+# EXTRACTION SERVICE
+# =====================================================
+
+class ExtractionService:
+    """
+    Background text extraction of main report PDFs.
+
+    Uploads mark their ProjectFile PENDING; a dispatcher thread claims due
+    files (pending, retries whose delay has passed, and stale PROCESSING
+    rows left by a crashed worker) and hands them to a process pool.
+    Claims are compare-and-set updates, so several API processes can run a
+    dispatcher against the same database.
+    """
+
+    @staticmethod
+    def is_extractable(filename: str, file_type: FileType) -> bool:
+        return file_type == FileType.MAIN_REPORT and Path(filename).suffix.lower() == ".pdf"
+
+    @staticmethod
+    def enqueue(db_file: ProjectFile) -> None:
+        """Queue a new file for extraction (call before the upload commits)"""
+        db_file.extraction_status = ExtractionStatus.PENDING
+        db_file.extraction_pages_done = 0
+        db_file.extraction_attempts = 0
+        db_file.extraction_updated_at = datetime.utcnow()
+
+    @staticmethod
+    def enqueue_unprocessed(db: Session) -> int:
+        """Queue main report PDFs uploaded before extraction existed. Returns the number queued."""
+        return db.query(ProjectFile).filter(
+            ProjectFile.extraction_status.is_(None),
+            ProjectFile.file_type == FileType.MAIN_REPORT,
+            func.lower(ProjectFile.original_filename).like("%.pdf")
+        ).update(
+            {"extraction_status": ExtractionStatus.PENDING, "extraction_updated_at": datetime.utcnow()},
+            synchronize_session=False
+        )
+
+    @staticmethod
+    def notify() -> None:
+        """Wake the dispatcher after an upload committed, instead of waiting for the next poll"""
+        _wake.set()
+
+    @staticmethod
+    def remove_file(db: Session, file_id: int) -> None:
+        """Drop a file's extracted pages and their index entries (SQLite does not cascade)"""
+        SearchIndexService.remove_file_pages(db, file_id)
+        db.query(ProjectFilePage).filter(ProjectFilePage.file_id == file_id).delete(synchronize_session=False)
+
+    @staticmethod
+    def remove_project(db: Session, project_id: int) -> None:
+        """Drop a project's extracted pages (after SearchIndexService.remove_project dropped their index entries)"""
+        db.query(ProjectFilePage).filter(ProjectFilePage.project_id == project_id).delete(synchronize_session=False)
+
+    @staticmethod
+    def claim_due(db: Session, limit: int, skip: Optional[Set[int]] = None) -> List[int]:
+        """Mark up to `limit` due files PROCESSING and return their ids"""
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=settings.PDF_EXTRACTION_STALE_SECONDS)
+        rows = (
+            db.query(ProjectFile.id, ProjectFile.extraction_status, ProjectFile.extraction_updated_at)
+            .filter(or_(
+                ProjectFile.extraction_status == ExtractionStatus.PENDING,
+                and_(
+                    ProjectFile.extraction_status == ExtractionStatus.RETRY,
+                    or_(ProjectFile.extraction_next_attempt_at.is_(None), ProjectFile.extraction_next_attempt_at <= now)
+                ),
+                and_(
+                    ProjectFile.extraction_status == ExtractionStatus.PROCESSING,
+                    ProjectFile.extraction_updated_at < stale
+                ),
+            ))
+            .order_by(ProjectFile.id)
+            .limit(limit + len(skip or ()))
+            .all()
+        )
+
+        claimed = []
+        for file_id, status, updated_at in rows:
+            if len(claimed) >= limit:
+                break
+            if skip and file_id in skip:
+                continue
+            # Compare-and-set: loses cleanly if another dispatcher claimed it first
+            unchanged = (
+                ProjectFile.extraction_updated_at.is_(None) if updated_at is None
+                else ProjectFile.extraction_updated_at == updated_at
+            )
+            won = db.query(ProjectFile).filter(
+                ProjectFile.id == file_id, ProjectFile.extraction_status == status, unchanged
+            ).update(
+                {"extraction_status": ExtractionStatus.PROCESSING, "extraction_updated_at": now},
+                synchronize_session=False
+            )
+            if won:
+                claimed.append(file_id)
+        db.commit()
+        return claimed
+
+    @staticmethod
+    def record_result(db: Session, file_id: int, error: Optional[BaseException] = None) -> None:
+        """Store the outcome of one extraction attempt"""
+        db_file = db.get(ProjectFile, file_id)
+        if db_file is None:
+            return
+        now = datetime.utcnow()
+        db_file.extraction_updated_at = now
+
+        if error is None:
+            db_file.extraction_status = ExtractionStatus.DONE
+            db_file.extraction_error = None
+            db_file.extraction_next_attempt_at = None
+        else:
+            db_file.extraction_attempts += 1
+            db_file.extraction_error = f"{type(error).__name__}: {error}"[:2000]
+            if db_file.extraction_attempts >= settings.PDF_EXTRACTION_MAX_ATTEMPTS:
+                db_file.extraction_status = ExtractionStatus.FAILED
+                db_file.extraction_next_attempt_at = None
+            else:
+                db_file.extraction_status = ExtractionStatus.RETRY
+                delay = settings.PDF_EXTRACTION_RETRY_SECONDS * 2 ** (db_file.extraction_attempts - 1)
+                db_file.extraction_next_attempt_at = now + timedelta(seconds=delay)
+        db.commit()
+
+        if error is None:
+            project = db.get(Project, db_file.project_id)
+            if project is not None:
+                # Duplicate detection compares the report text too
+                DuplicateService.index_project(db, project)
+                db.commit()
+                # Searches may now match the report text
+                visibility = SearchCacheService.snapshot(project)
+                SearchCacheService.invalidate_project(db, project.id, visibility, visibility)
+
+    @staticmethod
+    def run_pending(workers: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Extract every due file and wait for the results (maintenance
+        scripts). Returns (files extracted, files failed).
+        """
+        workers = workers or settings.PDF_EXTRACTION_WORKERS
+        done = failed = 0
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            while True:
+                with SessionLocal() as db:
+                    file_ids = ExtractionService.claim_due(db, workers)
+                if not file_ids:
+                    return done, failed
+                futures = [(file_id, pool.submit(extract_file, file_id)) for file_id in file_ids]
+                for file_id, future in futures:
+                    error = future.exception()
+                    with SessionLocal() as db:
+                        ExtractionService.record_result(db, file_id, error)
+                    if error is None:
+                        done += 1
+                    else:
+                        failed += 1
+
+    @staticmethod
+    def start() -> None:
+        """Start the dispatcher thread and worker pool of this API process"""
+        global _pool, _thread
+        with _lock:
+            if _thread is not None:
+                return
+            _stop.clear()
+            _pool = ExtractionService._new_pool()
+            _thread = threading.Thread(target=ExtractionService._run, name="pdf-extraction", daemon=True)
+            _thread.start()
+
+    @staticmethod
+    def stop() -> None:
+        global _pool, _thread
+        with _lock:
+            thread, pool = _thread, _pool
+            _thread = _pool = None
+        if thread is None:
+            return
+        _stop.set()
+        _wake.set()
+        thread.join(timeout=5)
+        # Interrupted files stay PROCESSING and are reclaimed once stale
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _new_pool() -> ProcessPoolExecutor:
+        # spawn: workers must not inherit the API process's threads, locks or DB connections
+        return ProcessPoolExecutor(
+            max_workers=settings.PDF_EXTRACTION_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    @staticmethod
+    def _run() -> None:
+        while not _stop.is_set():
+            try:
+                ExtractionService._dispatch()
+            except Exception as e:
+                print(f"Error dispatching PDF extraction: {e}")
+            _wake.wait(settings.PDF_EXTRACTION_POLL_SECONDS)
+            _wake.clear()
+
+    @staticmethod
+    def _dispatch() -> None:
+        global _pool
+        with _lock:
+            free = settings.PDF_EXTRACTION_WORKERS - len(_in_flight)
+            busy = set(_in_flight)
+        if free <= 0 or _pool is None:
+            return
+
+        with SessionLocal() as db:
+            file_ids = ExtractionService.claim_due(db, free, skip=busy)
+
+        for file_id in file_ids:
+            with _lock:
+                _in_flight.add(file_id)
+                try:
+                    future = _pool.submit(extract_file, file_id)
+                except BrokenProcessPool:
+                    _pool = ExtractionService._new_pool()
+                    future = _pool.submit(extract_file, file_id)
+            future.add_done_callback(partial(ExtractionService._finished, file_id))
+
+    @staticmethod
+    def _finished(file_id: int, future: Future) -> None:
+        error = None if future.cancelled() else future.exception()
+        try:
+            if not future.cancelled():
+                with SessionLocal() as db:
+                    ExtractionService.record_result(db, file_id, error)
+        except Exception as e:
+            print(f"Error recording PDF extraction of file {file_id}: {e}")
+        finally:
+            with _lock:
+                _in_flight.discard(file_id)
+            _wake.set()
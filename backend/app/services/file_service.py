@@ -1,15 +1,18 @@
 import os
 import shutil
+import hashlib
 import aiofiles
 from fastapi import UploadFile, HTTPException
 from pathlib import Path
-from typing import Tuple, Optional, TYPE_CHECKING
-import uuid
+from typing import Tuple, Optional, Union, TYPE_CHECKING
 from datetime import datetime
 
 from sqlalchemy.orm import Session
 from app.config import get_settings
-from app.models import ProjectFile, FileType  # Import DB models
+from app.models import ProjectFile, FileType, UploadSession  # Import DB models
+from app.services.duplicate_service import DuplicateService
+from app.services.extraction_service import ExtractionService
+from app.services.storage_service import StorageService
 
 if TYPE_CHECKING:
     from app.models import Project
@@ -23,6 +26,7 @@ settings = get_settings()
 
 UPLOAD_DIR = Path(settings.UPLOAD_DIR)
 MAX_FILE_SIZE = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024  # Convert MB to bytes
+UPLOAD_CHUNK_SIZE = settings.UPLOAD_CHUNK_SIZE_KB * 1024
 ALLOWED_EXTENSIONS = {
     '.pdf', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.csv', '.xlsx', 
     '.xls', '.json', '.txt', '.py', '.ipynb', '.r', '.sql', '.md', 
@@ -39,25 +43,17 @@ class FileService:
         UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
     @staticmethod
-    def _get_user_dir(user_uuid: uuid.UUID) -> Path:
-        """Get the directory path for a specific user"""
-        return UPLOAD_DIR / str(user_uuid)
-
-    @staticmethod
-    def _ensure_user_dir(user_uuid: uuid.UUID) -> Path:
-        """Ensure user directory exists and return its path"""
-        user_dir = FileService._get_user_dir(user_uuid)
-        user_dir.mkdir(parents=True, exist_ok=True)
-        return user_dir
+    def _file_too_large(filename: str) -> HTTPException:
+        return HTTPException(
+            status_code=413,
+            detail=f"File '{filename}' is too large. Maximum size is {settings.MAX_UPLOAD_SIZE_MB}MB."
+        )
 
     @staticmethod
-    def _validate_file(file_size: int, filename: str):
-        """Internal helper to run all validations."""
-        if file_size > MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File '{filename}' is too large. Maximum size is {settings.MAX_UPLOAD_SIZE_MB}MB."
-            )
+    def _validate_file(file_size: Optional[int], filename: str):
+        """Internal helper to run all validations (file_size may be unknown before streaming)."""
+        if file_size is not None and file_size > MAX_FILE_SIZE:
+            raise FileService._file_too_large(filename)
         
         file_ext = Path(filename).suffix.lower()
         if file_ext not in ALLOWED_EXTENSIONS:
@@ -66,46 +62,89 @@ class FileService:
                 detail=f"File type '{file_ext}' is not allowed."
             )
 
+    @staticmethod
+    async def _stream_to_disk(upload_file: UploadFile, file_path: Path) -> Tuple[int, str]:
+        """
+        Copy an upload to `file_path` in UPLOAD_CHUNK_SIZE chunks, hashing
+        as it goes. Memory stays bounded by one chunk whatever the file
+        size; the size limit is checked after every chunk, so an oversize
+        upload stops as soon as it crosses MAX_FILE_SIZE.
+
+        Returns:
+            Tuple[int, str]: (bytes written, hex SHA-256 digest)
+        """
+        digest = hashlib.sha256()
+        file_size = 0
+        async with aiofiles.open(file_path, 'wb') as buffer:
+            while True:
+                chunk = await upload_file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                file_size += len(chunk)
+                if file_size > MAX_FILE_SIZE:
+                    raise FileService._file_too_large(upload_file.filename)
+                digest.update(chunk)
+                await buffer.write(chunk)
+        return file_size, digest.hexdigest()
+
+    @staticmethod
+    def _add_file_record(
+        db: Session,
+        project_id: int,
+        filename: str,
+        saved_path: str,
+        file_type: FileType,
+        mime_type: Optional[str],
+        file_size: int,
+        sha256: str,
+    ) -> ProjectFile:
+        """Create the ProjectFile row of a file already stored at `saved_path`"""
+        db_file = ProjectFile(
+            project_id=project_id,
+            original_filename=filename,
+            saved_path=saved_path,
+            file_type=file_type,
+            mime_type=mime_type,
+            file_size=file_size,
+            sha256=sha256,
+        )
+        if ExtractionService.is_extractable(filename, file_type):
+            # Text extraction runs in the background once the upload commits
+            ExtractionService.enqueue(db_file)
+
+        db.add(db_file)
+        return db_file
+
     @staticmethod
     async def create_project_file_record(
         db: Session,
         project_id: int,
-        user_uuid: uuid.UUID,
         upload_file: UploadFile,
         file_type: FileType,
     ) -> ProjectFile:
         """
         Saves an uploaded file and creates a corresponding ProjectFile record in the database.
+        The upload is streamed to disk, never held in memory as a whole, then
+        stored by content: a file identical to one already stored shares its blob.
         """
-        content = await upload_file.read()
-        file_size = len(content)
+        # Size is known up front when the client sent it; otherwise it is enforced while streaming
+        FileService._validate_file(upload_file.size, upload_file.filename)
 
-        FileService._validate_file(file_size, upload_file.filename)
-
-        user_dir = FileService._ensure_user_dir(user_uuid)
-
-        original_ext = Path(upload_file.filename).suffix
-        unique_filename = f"{uuid.uuid4()}{original_ext}"
-        file_path = user_dir / unique_filename
+        file_path = StorageService.temp_path()
 
         try:
-            async with aiofiles.open(file_path, 'wb') as buffer:
-                await buffer.write(content)
-
-            relative_path = str(file_path.relative_to(UPLOAD_DIR))
-
-            db_file = ProjectFile(
-                project_id=project_id,
-                original_filename=upload_file.filename,
-                saved_path=relative_path,
-                file_type=file_type,
-                mime_type=upload_file.content_type,
-                file_size=file_size,
-            )
+            file_size, sha256 = await FileService._stream_to_disk(upload_file, file_path)
+            saved_path = StorageService.store(db, file_path, sha256, file_size)
 
-            db.add(db_file)
-            return db_file
+            return FileService._add_file_record(
+                db, project_id, upload_file.filename, saved_path, file_type,
+                upload_file.content_type, file_size, sha256
+            )
 
+        except HTTPException:
+            if file_path.exists():
+                file_path.unlink()
+            raise
         except Exception as e:
             if file_path.exists():
                 file_path.unlink()
@@ -114,22 +153,62 @@ class FileService:
                 detail=f"Failed to save file '{upload_file.filename}': {str(e)}"
             )
 
+    @staticmethod
+    def create_project_file_record_from_upload(
+        db: Session,
+        project_id: int,
+        upload: UploadSession,
+        file_type: FileType,
+    ) -> ProjectFile:
+        """
+        Turns a completed resumable upload into a ProjectFile. The part file
+        is hard-linked into the blob store (no copy) and the session deleted
+        in the caller's transaction; the part file itself is only removed
+        once that commits, so after a rollback the session can be used again.
+        """
+        from app.services.upload_service import UploadService
+
+        try:
+            saved_path = StorageService.store(
+                db, UploadService.part_path(upload), upload.sha256, upload.size, keep_source=True
+            )
+        except OSError as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to save file '{upload.filename}': {str(e)}"
+            )
+
+        db_file = FileService._add_file_record(
+            db, project_id, upload.filename, saved_path, file_type,
+            upload.mime_type, upload.size, upload.sha256
+        )
+        UploadService.discard(db, upload)
+        return db_file
+
     @staticmethod
     def delete_file_record(db: Session, db_file: ProjectFile) -> None:
         """
-        Deletes a file from the filesystem and its corresponding record from the database.
+        Deletes a file's record from the database and drops its reference to
+        the stored blob, which is removed from disk once nothing uses it.
         Requires the db_file object to be passed in.
         """
         if not db_file:
             return
 
-        full_path = UPLOAD_DIR / db_file.saved_path
-        if full_path.exists():
-            try:
-                full_path.unlink()
-            except OSError as e:
-                # Log this error, but don't prevent DB deletion for now
-                print(f"Error deleting file from disk {full_path}: {e}")
+        if StorageService.is_blob(db_file.saved_path):
+            StorageService.release(db, db_file.sha256)
+        else:
+            # Stored per user before deduplication: not shared
+            full_path = UPLOAD_DIR / db_file.saved_path
+            if full_path.exists():
+                try:
+                    full_path.unlink()
+                except OSError as e:
+                    # Log this error, but don't prevent DB deletion for now
+                    print(f"Error deleting file from disk {full_path}: {e}")
+
+        if db_file.id is not None:
+            ExtractionService.remove_file(db, db_file.id)
 
         # Delete the object from the session
         db.delete(db_file)
@@ -138,12 +217,14 @@ class FileService:
     async def replace_main_report(
         db: Session,
         project: "Project",
-        user_uuid: uuid.UUID,
-        new_file: UploadFile
+        new_file: Union[UploadFile, UploadSession]
     ):
         """
-        Replaces the main report file for a project.
-        Deletes the old file and creates a new one.
+        Replaces the main report file for a project with an uploaded file
+        or a completed resumable upload.
+        Saves the new file first, so a rejected upload (too large, wrong
+        type) leaves the old report in place, then deletes the old file and
+        refreshes the project's duplicate-detection signature.
         """
         # Find the old main report
         old_report = db.query(ProjectFile).filter(
@@ -151,18 +232,29 @@ class FileService:
             ProjectFile.file_type == FileType.MAIN_REPORT
         ).first()
 
+        # Create the new file record
+        if isinstance(new_file, UploadSession):
+            FileService.create_project_file_record_from_upload(
+                db=db,
+                project_id=project.id,
+                upload=new_file,
+                file_type=FileType.MAIN_REPORT
+            )
+        else:
+            await FileService.create_project_file_record(
+                db=db,
+                project_id=project.id,
+                upload_file=new_file,
+                file_type=FileType.MAIN_REPORT
+            )
+
         # Delete the old report from disk and DB if it exists
         if old_report:
             FileService.delete_file_record(db, old_report)
 
-        # Create the new file record
-        await FileService.create_project_file_record(
-            db=db,
-            project_id=project.id,
-            user_uuid=user_uuid,
-            upload_file=new_file,
-            file_type=FileType.MAIN_REPORT
-        )
+        # Drop the old report's text from the duplicate signature; the new
+        # report's text is added once its extraction finishes
+        DuplicateService.index_project(db, project)
 
 # Ensure upload directories exist on import
 FileService._ensure_upload_dirs()
\ No newline at end of file
@@ -7,6 +7,18 @@ from app.models.user import User
 from app.models.project import Project, PrivacyLevel, ProjectStatus
 from app.models.access_request import AccessRequest, AccessRequestStatus
 from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectRead, ProjectSearch
+from app.services.search_index_service import SearchIndexService
+from app.services.tag_stats_service import TagStatsService
+from app.services.taxonomy_service import TaxonomyService
+from app.services.suggestion_service import SuggestionService
+from app.services.ranking_service import RankingService
+from app.services.similarity_service import SimilarityService
+from app.services.duplicate_service import DuplicateService
+from app.services.extraction_service import ExtractionService
+from app.services.search_cache_service import SearchCacheService
+from app.services.visibility_service import VisibilityService
+from app.services.storage_service import StorageService
+from app.utils.pagination import apply_keyset
 
 
 # =====================================================
@@ -38,8 +50,17 @@ class ProjectService:
             project.abstract_preview = project.abstract[:300] + "..." if len(project.abstract) > 300 else project.abstract
 
         db.add(project)
+        db.flush()
+        SearchIndexService.index_project(db, project)
+        TaxonomyService.sync_project(db, project)
+        DuplicateService.index_project(db, project)
+        TagStatsService.record_change(db, None, TagStatsService.snapshot(project))
         db.commit()
         db.refresh(project)
+        SuggestionService.index_project(project)
+        RankingService.index_project(project)
+        SimilarityService.index_project(project)
+        SearchCacheService.invalidate_project(db, project.id, None, SearchCacheService.snapshot(project))
         return project
 
     @staticmethod
@@ -58,23 +79,19 @@ class ProjectService:
         query = db.query(Project)
 
         # Apply search filters
+        rank = None
         if search_params.query:
-            # Search in title, abstract, authors, tags
-            search_term = f"%{search_params.query}%"
-            query = query.filter(
-                or_(
-                    Project.title.ilike(search_term),
-                    Project.abstract.ilike(search_term),
-                    func.array_to_string(Project.authors, ' ').ilike(search_term),
-                    func.array_to_string(Project.tags, ' ').ilike(search_term)
-                )
-            )
+            # Full-text match on title, tags, authors, abstract
+            query, rank = SearchIndexService.apply_text_search(db, query, search_params.query)
 
         if search_params.year:
             query = query.filter(Project.year == search_params.year)
 
         if search_params.tag:
-            query = query.filter(Project.tags.contains([search_params.tag]))
+            query = query.filter(TaxonomyService.tag_filter(search_params.tag))
+
+        if search_params.author:
+            query = query.filter(TaxonomyService.author_filter(search_params.author))
 
         if search_params.status:
             query = query.filter(Project.status == search_params.status)
@@ -88,18 +105,13 @@ class ProjectService:
         if search_params.advisor_id:
             query = query.filter(Project.advisor_id == search_params.advisor_id)
 
-        # Get projects
-        projects = query.offset(search_params.skip).limit(search_params.limit).all()
-
-        # Filter by access permissions if user is provided
-        if current_user:
-            accessible_projects = []
-            for project in projects:
-                if project.can_access(current_user.id, current_user.role):
-                    accessible_projects.append(project)
-            projects = accessible_projects
+        # Filter by access permissions before paginating
+        query = ProjectService.apply_access_filter(query, current_user)
 
-        return projects
+        # Get projects, best matches first when searching
+        if rank is not None:
+            query = query.order_by(rank.desc(), Project.created_at.desc())
+        return query.offset(search_params.skip).limit(search_params.limit).all()
 
     @staticmethod
     def update_project(
@@ -117,6 +129,8 @@ class ProjectService:
             )
 
         update_dict = update_data.model_dump(exclude_unset=True)
+        tags_before = TagStatsService.snapshot(project)
+        visibility_before = SearchCacheService.snapshot(project)
         
         # Manually convert Pydantic HttpUrl objects to strings for DB compatibility
         for field in ['code_repo_url', 'dataset_url', 'video_url']:
@@ -130,8 +144,19 @@ class ProjectService:
         if 'abstract' in update_dict and project.abstract:
             project.abstract_preview = project.abstract[:300] + "..." if len(project.abstract) > 300 else project.abstract
 
+        db.flush()
+        SearchIndexService.index_project(db, project)
+        if 'tags' in update_dict or 'authors' in update_dict:
+            TaxonomyService.sync_project(db, project)
+        if 'title' in update_dict or 'abstract' in update_dict:
+            DuplicateService.index_project(db, project)
+        TagStatsService.record_change(db, tags_before, TagStatsService.snapshot(project))
         db.commit()
         db.refresh(project)
+        SuggestionService.index_project(project)
+        RankingService.index_project(project)
+        SimilarityService.index_project(project)
+        SearchCacheService.invalidate_project(db, project.id, visibility_before, SearchCacheService.snapshot(project))
         return project
 
     @staticmethod
@@ -144,8 +169,23 @@ class ProjectService:
                 detail="You can only delete your own projects"
             )
 
+        SearchIndexService.remove_project(db, project.id)
+        TaxonomyService.remove_project(db, project.id)
+        DuplicateService.remove_project(db, project.id)
+        ExtractionService.remove_project(db, project.id)
+        StorageService.release_project(db, project.id)
+        TagStatsService.record_change(db, TagStatsService.snapshot(project), None)
+        project_id = project.id
+        # Grants are deleted with the project, so resolve who could see it first
+        stale_pages = SearchCacheService.affected_generations(
+            db, project_id, SearchCacheService.snapshot(project), None
+        )
         db.delete(project)
         db.commit()
+        SuggestionService.remove_project(project_id)
+        RankingService.remove_project(project_id)
+        SimilarityService.remove_project(project_id)
+        SearchCacheService.invalidate(stale_pages)
 
     @staticmethod
     def increment_view_count(db: Session, project: Project) -> None:
@@ -159,16 +199,30 @@ class ProjectService:
         project.download_count += 1
         db.commit()
 
+    @staticmethod
+    def apply_access_filter(query, current_user: Optional[User] = None):
+        """Restrict a Project query to rows the user may see (public only when anonymous)"""
+        return query.filter(VisibilityService.access_filter(query.session, current_user))
+
     @staticmethod
     def check_access(project: Project, user_id: int, user_role: str) -> bool:
         """Check if user can access a project"""
         return project.can_access(user_id, user_role)
 
     @staticmethod
-    def get_user_projects(db: Session, user_id: int) -> List[Project]:
-        """Get all projects uploaded by a user"""
+    def get_user_projects(
+        db: Session,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Project]:
+        """Get projects uploaded by a user, newest first (keyset-paged when limit is given)"""
         from sqlalchemy.orm import joinedload
-        return db.query(Project).options(joinedload(Project.files)).filter(Project.uploaded_by == user_id).all()
+        query = db.query(Project).options(joinedload(Project.files)).filter(Project.uploaded_by == user_id)
+        query = apply_keyset(query, Project.created_at, Project.id, cursor)
+        if limit:
+            query = query.limit(limit)
+        return query.all()
 
     @staticmethod
     def get_advisor_projects(db: Session, advisor_id: int) -> List[Project]:
@@ -188,16 +242,9 @@ class ProjectService:
         search_query = db.query(Project)
 
         # Text search
+        rank = None
         if query:
-            search_term = f"%{query}%"
-            search_query = search_query.filter(
-                or_(
-                    Project.title.ilike(search_term),
-                    Project.abstract.ilike(search_term),
-                    func.array_to_string(Project.authors, ' ').ilike(search_term),
-                    func.array_to_string(Project.tags, ' ').ilike(search_term)
-                )
-            )
+            search_query, rank = SearchIndexService.apply_text_search(db, search_query, query)
 
         # Apply additional filters
         if filters:
@@ -205,20 +252,23 @@ class ProjectService:
                 search_query = search_query.filter(Project.year == filters['year'])
             if 'tags' in filters:
                 for tag in filters['tags']:
-                    search_query = search_query.filter(Project.tags.contains([tag]))
+                    search_query = search_query.filter(TaxonomyService.tag_filter(tag))
             if 'status' in filters:
                 search_query = search_query.filter(Project.status == filters['status'])
             if 'privacy_level' in filters:
                 search_query = search_query.filter(Project.privacy_level == filters['privacy_level'])
 
-        # Get results
-        projects = search_query.offset(skip).limit(limit).all()
-
-        # Filter by access
-        if current_user:
-            projects = [p for p in projects if p.can_access(current_user.id, current_user.role)]
+        # Filter by access before paginating
+        search_query = ProjectService.apply_access_filter(search_query, current_user)
 
-        return projects
+        # Get results
+        if rank is not None and RankingService.ready():
+            page_ids = RankingService.ranked_page(db, search_query, rank, query, skip, limit)
+            projects = {p.id: p for p in db.query(Project).filter(Project.id.in_(page_ids))}
+            return [projects[project_id] for project_id in page_ids if project_id in projects]
+        if rank is not None:
+            search_query = search_query.order_by(rank.desc(), Project.created_at.desc())
+        return search_query.offset(skip).limit(limit).all()
 
     @staticmethod
     def get_project_stats(db: Session, project_id: int) -> Dict[str, Any]:
@@ -256,4 +306,6 @@ class ProjectService:
         ).update({'status': new_status})
 
         db.commit()
+        if updated:
+            SearchCacheService.invalidate_all()
         return updated
\ No newline at end of file
@@ -0,0 +1,322 @@
+import bisect
+import heapq
+import math
+from array import array
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy.orm import Session, Query
+
+from app.config import get_settings
+from app.models.project import Project
+from app.services.search_index_service import SearchIndexService
+from app.utils.live_index import LiveIndex
+from app.utils.search_query import parse_search_query
+
+
+settings = get_settings()
+
+
+# =====================================================
+# BM25F CONFIGURATION
+# =====================================================
+
+# Indexed fields, in the order their term frequencies are packed
+RANKED_FIELDS = ("title", "tags", "authors", "abstract")
+
+# Per-field boost and length normalization (b). Short fields get a low b so a
+# one-word title is not favoured just for being short.
+FIELD_BOOSTS = (4.0, 3.0, 2.0, 1.0)
+FIELD_B = (0.5, 0.3, 0.3, 0.75)
+K1 = 1.2
+
+# A short prefix can match thousands of terms; score only the most frequent
+MAX_PREFIX_EXPANSIONS = 50
+
+# Term frequencies are stored one byte per field in a single uint32
+_TF_CAP = 255
+_KEY_END = "\U0010ffff"
+
+
+def _field_terms(project) -> Tuple[List[str], ...]:
+    """Tokens per ranked field, using the same tokenizer as the text search"""
+    docs = SearchIndexService._documents(project)
+    return tuple(SearchIndexService.query_terms(docs[field]) for field in RANKED_FIELDS)
+
+
+# =====================================================
+# INVERTED INDEX
+# =====================================================
+
+class BM25Index:
+    """
+    In-memory inverted index scored with BM25F.
+
+    Postings per term are two parallel arrays sorted by project id: the ids
+    and the packed per-field term frequencies. Field lengths are kept per
+    document for length normalization. The indexed terms are the keys of
+    `postings`; a sorted copy serves prefix lookups and is brought up to
+    date lazily.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Tuple[array, array]] = {}
+        self.sorted_terms: List[str] = []
+        self._new_terms: List[str] = []
+        # Terms no longer indexed but still in sorted_terms
+        self._removed_terms: Set[str] = set()
+        self.lengths: Dict[int, Tuple[int, ...]] = {}
+        # Terms of each document as ids into self.terms, so removal touches
+        # only those posting lists
+        self.doc_terms: Dict[int, array] = {}
+        self.term_ids: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.total_lengths = [0] * len(RANKED_FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def add(self, project_id: int, field_terms: Sequence[List[str]]) -> None:
+        """Index a document (replacing any previous version)"""
+        self.remove(project_id)
+
+        packed: Dict[str, int] = {}
+        for position, terms in enumerate(field_terms):
+            shift = 8 * position
+            for term, tf in Counter(terms).items():
+                packed[term] = packed.get(term, 0) | (min(tf, _TF_CAP) << shift)
+
+        for term, tfs in packed.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = (array("I"), array("I"))
+                if term in self._removed_terms:
+                    self._removed_terms.discard(term)
+                else:
+                    self._new_terms.append(term)
+            ids, packed_tfs = postings
+            i = bisect.bisect_left(ids, project_id)
+            ids.insert(i, project_id)
+            packed_tfs.insert(i, tfs)
+
+        lengths = tuple(len(terms) for terms in field_terms)
+        self.lengths[project_id] = lengths
+        for position, length in enumerate(lengths):
+            self.total_lengths[position] += length
+
+        term_ids = array("I")
+        for term in packed:
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                term_id = self.term_ids[term] = len(self.terms)
+                self.terms.append(term)
+            term_ids.append(term_id)
+        self.doc_terms[project_id] = term_ids
+
+    def remove(self, project_id: int) -> None:
+        lengths = self.lengths.pop(project_id, None)
+        if lengths is None:
+            return
+        for position, length in enumerate(lengths):
+            self.total_lengths[position] -= length
+
+        for term_id in self.doc_terms.pop(project_id, ()):
+            term = self.terms[term_id]
+            ids, packed_tfs = self.postings[term]
+            i = bisect.bisect_left(ids, project_id)
+            if i < len(ids) and ids[i] == project_id:
+                del ids[i]
+                del packed_tfs[i]
+            if not ids:
+                # Left in sorted_terms until enough have piled up (see _sorted)
+                del self.postings[term]
+                self._removed_terms.add(term)
+
+    def _sorted(self) -> List[str]:
+        """sorted_terms with new terms merged in and, now and then, removed ones dropped"""
+        terms = self.sorted_terms
+        if self._new_terms:
+            if len(self._new_terms) > 32:
+                # Two sorted runs: the sort merges them in linear time
+                self._new_terms.sort()
+                terms.extend(self._new_terms)
+                terms.sort()
+            else:
+                for term in self._new_terms:
+                    bisect.insort(terms, term)
+            self._new_terms = []
+        if len(self._removed_terms) * 4 > len(terms):
+            terms[:] = [term for term in terms if term not in self._removed_terms]
+            self._removed_terms = set()
+        return terms
+
+    def expand(self, prefix: str) -> List[str]:
+        """Indexed terms starting with `prefix` (the search matches prefixes too)"""
+        terms = self._sorted()
+        lo = bisect.bisect_left(terms, prefix)
+        hi = bisect.bisect_left(terms, prefix + _KEY_END, lo)
+        matching = [term for term in terms[lo:hi] if term in self.postings]
+        if len(matching) <= MAX_PREFIX_EXPANSIONS:
+            return matching
+        expansions = heapq.nlargest(
+            MAX_PREFIX_EXPANSIONS, matching, key=lambda term: len(self.postings[term][0])
+        )
+        if prefix in self.postings and prefix not in expansions:
+            expansions.append(prefix)
+        return expansions
+
+    def score(self, query_terms: Iterable[str], candidates: Optional[Set[int]] = None) -> Dict[int, float]:
+        """
+        BM25F score per document for the query terms.
+
+        Each query term contributes the best score among the indexed terms it
+        prefixes, so "learn" matching both "learn" and "learning" in a
+        document is not counted twice. When `candidates` is much smaller than
+        a posting list, the candidates are looked up in it instead of
+        scanning it.
+        """
+        n_docs = len(self.lengths)
+        if not n_docs:
+            return {}
+        # (shift, boost, 1 - b, b / avg_length) per field
+        fields = tuple(
+            (8 * f, FIELD_BOOSTS[f], 1.0 - FIELD_B[f], FIELD_B[f] / max(total / n_docs, 1.0))
+            for f, total in enumerate(self.total_lengths)
+        )
+        lengths = self.lengths
+
+        scores: Dict[int, float] = defaultdict(float)
+        for query_term in dict.fromkeys(query_terms):
+            best: Dict[int, float] = {}
+            for term in self.expand(query_term):
+                ids, packed_tfs = self.postings[term]
+                df = len(ids)
+                idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+
+                if candidates is None:
+                    hits = zip(ids, packed_tfs)
+                elif len(candidates) * 16 < df:
+                    hits = self._lookup(ids, packed_tfs, candidates)
+                else:
+                    hits = ((i, tf) for i, tf in zip(ids, packed_tfs) if i in candidates)
+
+                for project_id, packed in hits:
+                    doc_lengths = lengths[project_id]
+                    weighted_tf = 0.0
+                    for f, (shift, boost, flat, slope) in enumerate(fields):
+                        tf = (packed >> shift) & 0xFF
+                        if tf:
+                            weighted_tf += boost * tf / (flat + slope * doc_lengths[f])
+                    term_score = idf * weighted_tf / (K1 + weighted_tf)
+                    if term_score > best.get(project_id, 0.0):
+                        best[project_id] = term_score
+            for project_id, term_score in best.items():
+                scores[project_id] += term_score
+        return scores
+
+    @staticmethod
+    def _lookup(ids: array, packed_tfs: array, candidates: Set[int]):
+        """(id, packed tf) for the candidates present in one posting list"""
+        for project_id in candidates:
+            i = bisect.bisect_left(ids, project_id)
+            if i < len(ids) and ids[i] == project_id:
+                yield project_id, packed_tfs[i]
+
+
+def _build_index(db: Session, batch_size: int = 1000) -> BM25Index:
+    index = BM25Index()
+    rows = db.query(
+        Project.id, Project.title, Project.tags, Project.authors, Project.abstract
+    ).yield_per(batch_size)
+    for row in rows:
+        index.add(row.id, _field_terms(row))
+    index._sorted()
+    return index
+
+
+# Process-wide index, built in the background (see LiveIndex)
+_live: LiveIndex[BM25Index] = LiveIndex("ranking index", _build_index, settings.RANKING_INDEX_REFRESH_SECONDS)
+
+
+# =====================================================
+# RANKING SERVICE
+# =====================================================
+
+class RankingService:
+    """BM25F relevance ranking for text searches"""
+
+    @staticmethod
+    def enabled() -> bool:
+        return settings.SEARCH_RANKING == "bm25"
+
+    @staticmethod
+    def ready() -> bool:
+        """Enabled and loaded; until then searches keep the database rank"""
+        return RankingService.enabled() and _live.current is not None
+
+    @staticmethod
+    def start() -> None:
+        if RankingService.enabled():
+            _live.start()
+
+    @staticmethod
+    def stop() -> None:
+        _live.stop()
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Build the index from the database and swap it in. Returns the number of projects indexed."""
+        return len(_live.rebuild(db))
+
+    @staticmethod
+    def index_project(project: Project) -> None:
+        """Add or refresh one project after its transaction has committed"""
+        project_id, field_terms = project.id, _field_terms(project)
+        _live.apply(lambda index: index.add(project_id, field_terms))
+
+    @staticmethod
+    def remove_project(project_id: int) -> None:
+        """Drop a deleted project from the index"""
+        _live.apply(lambda index: index.remove(project_id))
+
+    @staticmethod
+    def ranked_page(
+        db: Session,
+        matches: Query,
+        rank,
+        search_text: str,
+        skip: int,
+        limit: int
+    ) -> List[int]:
+        """
+        Project ids of one page of `matches`, best BM25F score first.
+
+        Only the RANKING_RERANK_CANDIDATES best matches by database `rank`
+        are read and reordered with BM25F, so a page costs the same however
+        many projects match; results past them keep the database order.
+        Call only when ready().
+
+        Args:
+            matches: filtered, access-controlled query of matching projects
+            rank: its database relevance expression
+        """
+        window = settings.RANKING_RERANK_CANDIDATES
+        by_rank = matches.with_entities(Project.id).order_by(
+            rank.desc(), Project.created_at.desc(), Project.id.desc()
+        )
+
+        page: List[int] = []
+        if skip < window:
+            candidates = [project_id for (project_id,) in by_rank.limit(window)]
+            with _live.lock:
+                scores = _live.current.score(parse_search_query(search_text).rank_terms, set(candidates))
+            # Newest (highest id) first among equal scores
+            ranked = heapq.nlargest(
+                skip + limit, candidates, key=lambda project_id: (scores.get(project_id, 0.0), project_id)
+            )
+            page = ranked[skip:]
+            if len(page) == limit or len(candidates) < window:
+                return page
+
+        page += [project_id for (project_id,) in by_rank.offset(max(skip, window)).limit(limit - len(page))]
+        return page
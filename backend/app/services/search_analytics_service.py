@@ -0,0 +1,297 @@
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.search_log import SearchQueryLog
+from app.schemas.project import ProjectSearch
+from app.utils.search_query import parse_search_query
+
+
+settings = get_settings()
+
+# ProjectSearch fields stored as filters and named in query shapes
+FILTER_FIELDS = (
+    "year", "tag", "author", "privacy_level", "status", "uploader_id",
+    "advisor_id", "semester", "class_name", "course_code",
+)
+
+# Raw (timestamp, endpoint, query, filters, hit_count, first_page, latency_ms)
+# tuples. deque.append is atomic, and with maxlen the oldest entry is
+# dropped instead of blocking when the flusher falls behind.
+_buffer: deque = deque(maxlen=settings.SEARCH_ANALYTICS_BUFFER_SIZE)
+_stats = {"recorded": 0, "flushed": 0, "dropped": 0, "flush_errors": 0}
+_lock = threading.Lock()
+_wake = threading.Event()
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def normalize_query(text: Optional[str]) -> Optional[str]:
+    """Whitespace collapsed, case-folded query; None when empty"""
+    if not text:
+        return None
+    return " ".join(text.split()).casefold()[:500] or None
+
+
+def query_shape(endpoint: str, query: Optional[str], filters: Dict, first_page: bool = True) -> str:
+    """
+    The parameters a request used, without their values, e.g.
+    `search(q,tag:,year)`: free text `q`, excluded text `-q`, qualified
+    clauses `field:` and filter parameter names.
+    """
+    parts = set(filters)
+    for clause in parse_search_query(query).clauses:
+        name = f"{clause.field}:" if clause.field else "q"
+        parts.add(f"-{name}" if clause.negated else name)
+    if not first_page:
+        parts.add("page")
+    return f"{endpoint}({','.join(sorted(parts))})"
+
+
+# =====================================================
+# SEARCH ANALYTICS SERVICE
+# =====================================================
+
+class SearchAnalyticsService:
+    """
+    Search query analytics with batched persistence.
+
+    Requests only append a tuple to an in-process ring buffer; a background
+    thread normalizes the entries and batch-inserts them into
+    search_query_logs every SEARCH_ANALYTICS_FLUSH_SECONDS (or sooner when
+    a full batch is waiting). A database outage costs at most the buffered
+    entries, never request latency.
+    """
+
+    @staticmethod
+    def record_search(params: ProjectSearch, hit_count: int, latency_ms: float) -> None:
+        """Buffer one /search request (cheap; safe on the request path)"""
+        if not settings.SEARCH_ANALYTICS_ENABLED:
+            return
+        filters = {name: getattr(params, name) for name in FILTER_FIELDS if getattr(params, name) is not None}
+        first_page = not params.cursor and not params.skip
+        if params.sort == "newest":
+            filters["sort"] = "newest"
+        SearchAnalyticsService._append("search", params.query, filters, hit_count, first_page, latency_ms)
+
+    @staticmethod
+    def record_suggestions(query: str, hit_count: int, latency_ms: float) -> None:
+        """Buffer one /search/suggestions request"""
+        if not settings.SEARCH_ANALYTICS_ENABLED:
+            return
+        SearchAnalyticsService._append("suggestions", query, {}, hit_count, True, latency_ms)
+
+    @staticmethod
+    def _append(endpoint, query, filters, hit_count, first_page, latency_ms) -> None:
+        if len(_buffer) == _buffer.maxlen:
+            _stats["dropped"] += 1
+        _buffer.append((datetime.utcnow(), endpoint, query, filters, hit_count, first_page, latency_ms))
+        _stats["recorded"] += 1
+        if len(_buffer) >= settings.SEARCH_ANALYTICS_FLUSH_BATCH:
+            _wake.set()
+
+    @staticmethod
+    def _row(entry) -> Dict:
+        created_at, endpoint, query, filters, hit_count, first_page, latency_ms = entry
+        return {
+            "created_at": created_at,
+            "endpoint": endpoint,
+            "query": normalize_query(query),
+            "shape": query_shape(endpoint, query, filters, first_page),
+            "filters": {key: getattr(value, "value", value) for key, value in filters.items()} or None,
+            "hit_count": hit_count,
+            "first_page": first_page,
+            "latency_ms": round(latency_ms, 3),
+        }
+
+    @staticmethod
+    def flush() -> int:
+        """Write every buffered entry in batches. Returns the number of rows written."""
+        written = 0
+        batch_size = settings.SEARCH_ANALYTICS_FLUSH_BATCH
+        while _buffer:
+            entries = []
+            while _buffer and len(entries) < batch_size:
+                entries.append(_buffer.popleft())
+
+            db = SessionLocal()
+            try:
+                db.execute(SearchQueryLog.__table__.insert(), [SearchAnalyticsService._row(e) for e in entries])
+                db.commit()
+                written += len(entries)
+            except Exception as e:
+                db.rollback()
+                _stats["flush_errors"] += 1
+                _stats["dropped"] += len(entries)
+                print(f"Error flushing {len(entries)} search analytics entries: {e}")
+                break
+            finally:
+                db.close()
+
+        _stats["flushed"] += written
+        return written
+
+    @staticmethod
+    def start() -> None:
+        """Start the background flusher of this API process"""
+        global _thread
+        with _lock:
+            if _thread is not None:
+                return
+            _stop.clear()
+            _thread = threading.Thread(target=SearchAnalyticsService._run, name="search-analytics", daemon=True)
+            _thread.start()
+
+    @staticmethod
+    def stop() -> None:
+        """Stop the flusher and write what is still buffered"""
+        global _thread
+        with _lock:
+            thread, _thread = _thread, None
+        if thread is not None:
+            _stop.set()
+            _wake.set()
+            thread.join(timeout=5)
+        SearchAnalyticsService.flush()
+
+    @staticmethod
+    def _run() -> None:
+        while not _stop.is_set():
+            _wake.wait(settings.SEARCH_ANALYTICS_FLUSH_SECONDS)
+            _wake.clear()
+            if _stop.is_set():
+                break
+            try:
+                SearchAnalyticsService.flush()
+            except Exception as e:
+                print(f"Error in search analytics flusher: {e}")
+
+    @staticmethod
+    def stats() -> Dict:
+        """Buffer counters of this worker process"""
+        return {**_stats, "buffered": len(_buffer)}
+
+    @staticmethod
+    def _recent(db: Session, days: int, *columns):
+        since = datetime.utcnow() - timedelta(days=days)
+        return db.query(*columns).filter(SearchQueryLog.created_at >= since)
+
+    @staticmethod
+    def top_queries(db: Session, days: int = 7, limit: int = 20, endpoint: str = "search") -> List[Dict]:
+        """Most frequent normalized text queries (first pages only)"""
+        count = func.count().label("count")
+        rows = (
+            SearchAnalyticsService._recent(
+                db, days, SearchQueryLog.query, count,
+                func.avg(SearchQueryLog.hit_count).label("avg_hits"),
+                func.avg(SearchQueryLog.latency_ms).label("avg_latency_ms"),
+            )
+            .filter(
+                SearchQueryLog.endpoint == endpoint,
+                SearchQueryLog.first_page.is_(True),
+                SearchQueryLog.query.isnot(None),
+            )
+            .group_by(SearchQueryLog.query)
+            .order_by(count.desc(), SearchQueryLog.query)
+            .limit(limit)
+            .all()
+        )
+        return [
+            {
+                "query": row.query,
+                "count": row.count,
+                "avg_hits": round(float(row.avg_hits), 2),
+                "avg_latency_ms": round(float(row.avg_latency_ms), 2),
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def zero_result_queries(db: Session, days: int = 7, limit: int = 20) -> List[Dict]:
+        """Text queries whose first page came back empty, most frequent first"""
+        count = func.count().label("count")
+        rows = (
+            SearchAnalyticsService._recent(
+                db, days, SearchQueryLog.query, count, func.max(SearchQueryLog.created_at).label("last_seen")
+            )
+            .filter(
+                SearchQueryLog.endpoint == "search",
+                SearchQueryLog.first_page.is_(True),
+                SearchQueryLog.hit_count == 0,
+                SearchQueryLog.query.isnot(None),
+            )
+            .group_by(SearchQueryLog.query)
+            .order_by(count.desc(), SearchQueryLog.query)
+            .limit(limit)
+            .all()
+        )
+        return [{"query": row.query, "count": row.count, "last_seen": row.last_seen} for row in rows]
+
+    @staticmethod
+    def latency_by_shape(db: Session, days: int = 7, limit: int = 20) -> List[Dict]:
+        """
+        Request count, total time and p50/p95 latency per query shape,
+        heaviest shapes (total time) first.
+        """
+        count = func.count().label("count")
+        total = func.sum(SearchQueryLog.latency_ms).label("total_ms")
+        if db.get_bind().dialect.name == "postgresql":
+            rows = (
+                SearchAnalyticsService._recent(
+                    db, days, SearchQueryLog.shape, count, total,
+                    func.percentile_cont(0.5).within_group(SearchQueryLog.latency_ms).label("p50_ms"),
+                    func.percentile_cont(0.95).within_group(SearchQueryLog.latency_ms).label("p95_ms"),
+                )
+                .group_by(SearchQueryLog.shape)
+                .order_by(total.desc())
+                .limit(limit)
+                .all()
+            )
+            return [SearchAnalyticsService._latency(row.shape, row.count, row.total_ms, row.p50_ms, row.p95_ms) for row in rows]
+
+        # No percentile aggregate elsewhere: pick the heaviest shapes in SQL,
+        # then read their latencies in order and take the percentiles here
+        heaviest = (
+            SearchAnalyticsService._recent(db, days, SearchQueryLog.shape, count, total)
+            .group_by(SearchQueryLog.shape)
+            .order_by(total.desc())
+            .limit(limit)
+            .all()
+        )
+        result = []
+        for row in heaviest:
+            latencies = [
+                value for (value,) in SearchAnalyticsService._recent(db, days, SearchQueryLog.latency_ms)
+                .filter(SearchQueryLog.shape == row.shape)
+                .order_by(SearchQueryLog.latency_ms)
+            ]
+            result.append(SearchAnalyticsService._latency(
+                row.shape, row.count, row.total_ms, _percentile(latencies, 0.5), _percentile(latencies, 0.95)
+            ))
+        return result
+
+    @staticmethod
+    def _latency(shape: str, count: int, total_ms: float, p50_ms: float, p95_ms: float) -> Dict:
+        return {
+            "shape": shape,
+            "count": count,
+            "total_ms": round(float(total_ms), 1),
+            "p50_ms": round(float(p50_ms), 2),
+            "p95_ms": round(float(p95_ms), 2),
+        }
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    """Linear-interpolated percentile of a sorted list (PostgreSQL's percentile_cont)"""
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
@@ -0,0 +1,301 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.user import User
+from app.models.project import Project, PrivacyLevel
+from app.models.access_request import AccessRequest, AccessRequestStatus
+from app.schemas.project import ProjectSearch, ProjectSummary
+
+
+settings = get_settings()
+
+# (results, next_cursor) as returned by SearchService.search
+CachedPage = Tuple[List[ProjectSummary], Optional[str]]
+
+# (privacy_level, uploaded_by) of a project at one point in time
+VisibilitySnapshot = Tuple[PrivacyLevel, int]
+
+# Generation counters. A cached page is keyed by the counters of every scope
+# that can see it, so bumping a counter orphans exactly those pages.
+GEN_ALL = "all"            # everyone (public projects)
+GEN_DOSEN = "dosen"        # dosen see every project
+GEN_STUDENTS = "students"  # every student (class-visible projects)
+
+
+def _user_gen(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+# =====================================================
+# CACHE BACKENDS
+# =====================================================
+
+class MemoryCacheBackend:
+    """Per-process LRU cache with a TTL per entry"""
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, CachedPage]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def generations(self, names: Tuple[str, ...]) -> Tuple[int, ...]:
+        return tuple(self._generations.get(name, 0) for name in names)
+
+    def bump(self, names: Iterable[str]) -> None:
+        with self._lock:
+            for name in names:
+                self._generations[name] = self._generations.get(name, 0) + 1
+
+    def get(self, key: str) -> Optional[CachedPage]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, page = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return page
+
+    def set(self, key: str, page: CachedPage) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, page)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def size(self) -> Optional[int]:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """
+    Cache shared by every worker process. Pages are stored as JSON with a
+    Redis TTL; generation counters are plain Redis integers. Redis errors
+    degrade to cache misses instead of failing the search.
+    """
+
+    PREFIX = "search-cache:"
+
+    def __init__(self, url: str, ttl: int):
+        import redis
+
+        self.ttl = ttl
+        self._errors = redis.RedisError
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5)
+
+    def generations(self, names: Tuple[str, ...]) -> Tuple[int, ...]:
+        try:
+            values = self.client.mget([f"{self.PREFIX}gen:{name}" for name in names])
+        except self._errors:
+            return ()
+        return tuple(int(value or 0) for value in values)
+
+    def bump(self, names: Iterable[str]) -> None:
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for name in names:
+                pipe.incr(f"{self.PREFIX}gen:{name}")
+            pipe.execute()
+        except self._errors:
+            pass
+
+    def get(self, key: str) -> Optional[CachedPage]:
+        try:
+            raw = self.client.get(self.PREFIX + key)
+        except self._errors:
+            return None
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return [ProjectSummary.model_validate(item) for item in data["results"]], data["next_cursor"]
+
+    def set(self, key: str, page: CachedPage) -> None:
+        results, cursor = page
+        payload = json.dumps({
+            "results": [summary.model_dump(mode="json") for summary in results],
+            "next_cursor": cursor,
+        })
+        try:
+            self.client.set(self.PREFIX + key, payload, ex=self.ttl)
+        except self._errors:
+            pass
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+def _create_backend():
+    if settings.SEARCH_CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.REDIS_URL, settings.SEARCH_CACHE_TTL_SECONDS)
+    if settings.SEARCH_CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(settings.SEARCH_CACHE_MAX_ENTRIES, settings.SEARCH_CACHE_TTL_SECONDS)
+    return None
+
+
+_backend = _create_backend()
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+# =====================================================
+# SEARCH CACHE SERVICE
+# =====================================================
+
+class SearchCacheService:
+    """Result cache in front of SearchService.search"""
+
+    @staticmethod
+    def visibility_scope(current_user: Optional[User]) -> Tuple[str, Tuple[str, ...]]:
+        """
+        Cache partition for a caller and the generation counters it depends on.
+
+        Anonymous users and dosen each share one partition. Students get their
+        own, since owner, class and granted rows differ per student.
+        """
+        if current_user is None:
+            return "anon", (GEN_ALL,)
+        if current_user.role == "dosen":
+            return "dosen", (GEN_ALL, GEN_DOSEN)
+        return f"user:{current_user.id}", (GEN_ALL, GEN_STUDENTS, _user_gen(current_user.id))
+
+    @staticmethod
+    def generation_stamp(current_user: Optional[User]) -> Optional[Tuple[int, ...]]:
+        """
+        Current generation counters of a caller's scope: a version stamp that
+        changes whenever what the caller may see changes. None when there is
+        no cache backend or it is unreachable.
+        """
+        if _backend is None:
+            return None
+        _, generation_names = SearchCacheService.visibility_scope(current_user)
+        generations = _backend.generations(generation_names)
+        return generations if len(generations) == len(generation_names) else None
+
+    @staticmethod
+    def normalize_params(params: ProjectSearch) -> str:
+        """Canonical form of the search parameters (case and spacing folded where matching ignores them)"""
+        data = params.model_dump(mode="json", exclude_none=True)
+        if "query" in data:
+            data["query"] = " ".join(data["query"].lower().split())
+        for field in ("tag", "author", "class_name", "course_code"):
+            if field in data:
+                data[field] = data[field].strip().lower()
+        return json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+    @staticmethod
+    def cache_key(params: ProjectSearch, current_user: Optional[User]) -> Optional[str]:
+        scope, _ = SearchCacheService.visibility_scope(current_user)
+        generations = SearchCacheService.generation_stamp(current_user)
+        if generations is None:
+            return None
+        digest = hashlib.sha1(SearchCacheService.normalize_params(params).encode("utf-8")).hexdigest()
+        return f"{scope}:{'.'.join(map(str, generations))}:{digest}"
+
+    @staticmethod
+    def search(
+        db: Session,
+        params: ProjectSearch,
+        current_user: Optional[User] = None
+    ) -> CachedPage:
+        """SearchService.search, answered from the cache when possible"""
+        from app.services.search_service import SearchService
+
+        if _backend is None:
+            return SearchService.search(db, params, current_user)
+
+        key = SearchCacheService.cache_key(params, current_user)
+        if key is not None:
+            page = _backend.get(key)
+            if page is not None:
+                _stats["hits"] += 1
+                return page
+
+        _stats["misses"] += 1
+        page = SearchService.search(db, params, current_user)
+        if key is not None:
+            _backend.set(key, page)
+        return page
+
+    @staticmethod
+    def snapshot(project: Project) -> VisibilitySnapshot:
+        """Capture who can see a project (call before mutating it)"""
+        return project.privacy_level, project.uploaded_by
+
+    @staticmethod
+    def affected_generations(
+        db: Session,
+        project_id: int,
+        before: Optional[VisibilitySnapshot],
+        after: Optional[VisibilitySnapshot]
+    ) -> Set[str]:
+        """
+        Generation counters of every caller who could see the project before
+        or after a change. Use before=None for a new project and after=None
+        for a deleted one.
+        """
+        snapshots = [s for s in (before, after) if s is not None]
+        levels = {privacy_level for privacy_level, _ in snapshots}
+
+        if PrivacyLevel.PUBLIC in levels:
+            return {GEN_ALL}
+
+        names = {GEN_DOSEN}
+        names.update(_user_gen(owner) for _, owner in snapshots)
+        if PrivacyLevel.CLASS in levels:
+            names.add(GEN_STUDENTS)
+        grantees = db.query(AccessRequest.requester_id).filter(
+            AccessRequest.project_id == project_id,
+            AccessRequest.status == AccessRequestStatus.APPROVED
+        )
+        names.update(_user_gen(requester_id) for (requester_id,) in grantees)
+        return names
+
+    @staticmethod
+    def invalidate(names: Set[str]) -> None:
+        """Bump generation counters, orphaning every page keyed by them"""
+        if _backend is not None and names:
+            _backend.bump(names)
+            _stats["invalidations"] += 1
+
+    @staticmethod
+    def invalidate_project(
+        db: Session,
+        project_id: int,
+        before: Optional[VisibilitySnapshot],
+        after: Optional[VisibilitySnapshot]
+    ) -> None:
+        """Orphan the cached pages of every caller who could see the project (call after commit)"""
+        if _backend is not None:
+            SearchCacheService.invalidate(
+                SearchCacheService.affected_generations(db, project_id, before, after)
+            )
+
+    @staticmethod
+    def invalidate_user(user_id: int) -> None:
+        """Orphan one student's pages (e.g. after an access grant changes)"""
+        SearchCacheService.invalidate({_user_gen(user_id)})
+
+    @staticmethod
+    def invalidate_all() -> None:
+        SearchCacheService.invalidate({GEN_ALL})
+
+    @staticmethod
+    def stats() -> Dict:
+        """Hit/miss counters of this process"""
+        lookups = _stats["hits"] + _stats["misses"]
+        return {
+            "backend": settings.SEARCH_CACHE_BACKEND,
+            **_stats,
+            "hit_ratio": round(_stats["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": _backend.size() if _backend is not None else 0,
+        }
@@ -0,0 +1,331 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import false, func, literal_column, not_, or_, select, text, update, Float, Integer
+from sqlalchemy.orm import Session, Query, noload
+
+from app.models.project import Project
+from app.models.file import ProjectFilePage
+from app.services.taxonomy_service import TaxonomyService
+from app.utils.search_query import QueryClause, parse_search_query, parse_year_range
+
+
+# =====================================================
+# SEARCH INDEX CONFIGURATION
+# =====================================================
+
+# 'simple' keeps Indonesian and English terms unstemmed, which is what
+# students type (course codes, acronyms, proper names).
+TS_CONFIG = "simple"
+
+# Field weights, highest first: title > tags > authors > abstract
+FIELD_WEIGHTS: Tuple[Tuple[str, str], ...] = (
+    ("title", "A"),
+    ("tags", "B"),
+    ("authors", "C"),
+    ("abstract", "D"),
+)
+
+# bm25() column weights for the SQLite FTS5 table, same order as FIELD_WEIGHTS
+FTS5_TABLE = "projects_fts"
+FTS5_WEIGHTS = (10.0, 5.0, 3.0, 1.0)
+
+# Extracted report pages (see ExtractionService): FTS5 table keyed by page id
+PAGES_FTS5_TABLE = "project_pages_fts"
+
+# A match only in report text ranks below a comparable metadata match
+PAGE_RANK_WEIGHT = 0.5
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+# Engines whose FTS5 table is known to exist, so the DDL check runs once
+_fts_ready_engines = set()
+
+
+class SearchIndexService:
+    """
+    Maintains the full-text search index for projects.
+
+    PostgreSQL: `projects.search_vector` (weighted tsvector, GIN indexed).
+    SQLite: the FTS5 shadow table `projects_fts` keyed by project id.
+
+    Extracted report text is indexed per page, outside `projects`:
+    `project_file_pages.search_vector` on PostgreSQL, `project_pages_fts`
+    on SQLite. Free-text queries match a project when its metadata matches
+    or one page of its report contains every term.
+    """
+
+    @staticmethod
+    def _is_sqlite(db: Session) -> bool:
+        return db.get_bind().dialect.name == "sqlite"
+
+    @staticmethod
+    def _documents(project: Project) -> Dict[str, str]:
+        """Flatten the indexed fields of a project into plain strings"""
+        return {
+            "title": project.title or "",
+            "tags": " ".join(project.tags or []),
+            "authors": " ".join(project.authors or []),
+            "abstract": project.abstract or "",
+        }
+
+    @staticmethod
+    def query_terms(search_text: Optional[str]) -> List[str]:
+        """Split a free-text query into lowercase word tokens"""
+        if not search_text:
+            return []
+        return _TERM_RE.findall(search_text.lower())
+
+    @staticmethod
+    def ensure_index(db: Session) -> None:
+        """Create the FTS5 shadow tables on SQLite (no-op on PostgreSQL)"""
+        bind = db.get_bind()
+        if bind.dialect.name == "sqlite" and bind.url not in _fts_ready_engines:
+            db.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS5_TABLE} "
+                "USING fts5(title, tags, authors, abstract)"
+            ))
+            db.execute(text(f"CREATE VIRTUAL TABLE IF NOT EXISTS {PAGES_FTS5_TABLE} USING fts5(text)"))
+            _fts_ready_engines.add(bind.url)
+
+    @staticmethod
+    def index_project(db: Session, project: Project) -> None:
+        """
+        (Re)index a single project. Must be called after the project has been
+        flushed so it has an id; runs inside the caller's transaction.
+        """
+        docs = SearchIndexService._documents(project)
+
+        if SearchIndexService._is_sqlite(db):
+            SearchIndexService.ensure_index(db)
+            db.execute(text(f"DELETE FROM {FTS5_TABLE} WHERE rowid = :id"), {"id": project.id})
+            db.execute(
+                text(
+                    f"INSERT INTO {FTS5_TABLE} (rowid, title, tags, authors, abstract) "
+                    "VALUES (:id, :title, :tags, :authors, :abstract)"
+                ),
+                {"id": project.id, **docs}
+            )
+            return
+
+        config = literal_column(f"'{TS_CONFIG}'::regconfig")
+        vector = None
+        for field, weight in FIELD_WEIGHTS:
+            part = func.setweight(func.to_tsvector(config, docs[field]), weight)
+            vector = part if vector is None else vector.op("||")(part)
+
+        db.execute(
+            update(Project)
+            .where(Project.id == project.id)
+            .values(search_vector=vector)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def remove_project(db: Session, project_id: int) -> None:
+        """Drop a project from the index (PostgreSQL rows go away with the project)"""
+        if SearchIndexService._is_sqlite(db):
+            SearchIndexService.ensure_index(db)
+            db.execute(text(f"DELETE FROM {FTS5_TABLE} WHERE rowid = :id"), {"id": project_id})
+            db.execute(
+                text(
+                    f"DELETE FROM {PAGES_FTS5_TABLE} WHERE rowid IN "
+                    "(SELECT id FROM project_file_pages WHERE project_id = :id)"
+                ),
+                {"id": project_id}
+            )
+
+    @staticmethod
+    def index_page(db: Session, page: ProjectFilePage) -> None:
+        """Index one extracted report page (flushed, so it has an id); runs inside the caller's transaction"""
+        if SearchIndexService._is_sqlite(db):
+            SearchIndexService.ensure_index(db)
+            db.execute(
+                text(f"INSERT INTO {PAGES_FTS5_TABLE} (rowid, text) VALUES (:id, :text)"),
+                {"id": page.id, "text": page.text}
+            )
+            return
+
+        db.execute(
+            update(ProjectFilePage)
+            .where(ProjectFilePage.id == page.id)
+            .values(search_vector=func.to_tsvector(literal_column(f"'{TS_CONFIG}'::regconfig"), page.text))
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def remove_file_pages(db: Session, file_id: int) -> None:
+        """Drop the index entries of a file's pages (before the page rows are deleted)"""
+        if SearchIndexService._is_sqlite(db):
+            SearchIndexService.ensure_index(db)
+            db.execute(
+                text(
+                    f"DELETE FROM {PAGES_FTS5_TABLE} WHERE rowid IN "
+                    "(SELECT id FROM project_file_pages WHERE file_id = :id)"
+                ),
+                {"id": file_id}
+            )
+
+    @staticmethod
+    def rebuild(db: Session, batch_size: int = 500) -> int:
+        """Reindex every project. Returns the number of projects indexed."""
+        if SearchIndexService._is_sqlite(db):
+            SearchIndexService.ensure_index(db)
+            db.execute(text(f"DELETE FROM {FTS5_TABLE}"))
+            db.execute(text(f"DELETE FROM {PAGES_FTS5_TABLE}"))
+            db.execute(text(f"INSERT INTO {PAGES_FTS5_TABLE} (rowid, text) SELECT id, text FROM project_file_pages"))
+        else:
+            db.execute(
+                update(ProjectFilePage)
+                .values(search_vector=func.to_tsvector(
+                    literal_column(f"'{TS_CONFIG}'::regconfig"), ProjectFilePage.text
+                ))
+                .execution_options(synchronize_session=False)
+            )
+
+        count = 0
+        projects = db.query(Project).options(noload(Project.files)).order_by(Project.id).yield_per(batch_size)
+        for project in projects:
+            SearchIndexService.index_project(db, project)
+            count += 1
+        return count
+
+    @staticmethod
+    def _fts5_expression(clause: QueryClause) -> str:
+        """FTS5 MATCH syntax for one text clause"""
+        if clause.phrase:
+            expression = '"' + " ".join(clause.terms) + '"'
+        else:
+            expression = " AND ".join(f'"{term}"*' for term in clause.terms)
+        if clause.field:
+            expression = f"{clause.field} : ({expression})"
+        return f"({expression})"
+
+    @staticmethod
+    def _tsquery_expression(clause: QueryClause) -> str:
+        """to_tsquery syntax for one text clause; qualified fields match their weight label"""
+        weight = dict(FIELD_WEIGHTS).get(clause.field, "")
+        if clause.phrase:
+            expression = " <-> ".join(f"{term}:{weight}" if weight else term for term in clause.terms)
+        else:
+            expression = " & ".join(f"{term}:*{weight}" for term in clause.terms)
+        return f"({expression})"
+
+    @staticmethod
+    def apply_filter_clauses(db: Session, query: Query, clauses: List[QueryClause]) -> Query:
+        """Compile tag:, year: and course: clauses into indexed column predicates"""
+        for clause in clauses:
+            if clause.field == "year":
+                low, high = parse_year_range(clause.value)
+                if low == high:
+                    condition = Project.year == low
+                elif low is None:
+                    condition = Project.year <= high
+                elif high is None:
+                    condition = Project.year >= low
+                else:
+                    condition = Project.year.between(low, high)
+            elif clause.field == "tags":
+                condition = TaxonomyService.tag_filter(clause.value)
+            else:
+                # Matches the functional index on upper(course_code)
+                condition = func.upper(Project.course_code) == clause.value.upper()
+
+            if clause.negated:
+                # Rows with no tags / course are kept by an exclusion
+                condition = not_(func.coalesce(condition, false()))
+            query = query.filter(condition)
+        return query
+
+    @staticmethod
+    def apply_text_search(db: Session, query: Query, search_text: str) -> Tuple[Query, Optional[object]]:
+        """
+        Apply a search query (see app.utils.search_query for the syntax) and
+        return the query together with a relevance expression where higher
+        means better.
+
+        Free text, quoted phrases, title: and author: clauses are matched via
+        the full-text index (words as prefixes, all required); -clauses are
+        excluded; tag:, year: and course: become column predicates. The
+        relevance expression is None when nothing positive was matched.
+        """
+        parsed = parse_search_query(search_text)
+        query = SearchIndexService.apply_filter_clauses(db, query, parsed.filter_clauses)
+
+        positive = [c for c in parsed.text_clauses if not c.negated]
+        negative = [c for c in parsed.text_clauses if c.negated]
+        if not positive and not negative:
+            return query, None
+        # Report pages have no title/author fields, so only plain text can match there
+        search_pages = bool(positive) and all(c.field is None for c in positive)
+
+        if SearchIndexService._is_sqlite(db):
+            SearchIndexService.ensure_index(db)
+            excluded = " OR ".join(SearchIndexService._fts5_expression(c) for c in negative)
+            if not positive:
+                hits = text(
+                    f"SELECT rowid FROM {FTS5_TABLE} WHERE {FTS5_TABLE} MATCH :match"
+                ).bindparams(match=excluded).columns(rowid=Integer)
+                return query.filter(Project.id.notin_(hits)), None
+
+            match = " AND ".join(SearchIndexService._fts5_expression(c) for c in positive)
+            if excluded:
+                # FTS5 NOT is binary: positives NOT (any exclusion)
+                match = f"({match}) NOT ({excluded})"
+            weights = ", ".join(str(w) for w in FTS5_WEIGHTS)
+            sql = (
+                f"SELECT rowid AS project_id, bm25({FTS5_TABLE}, {weights}) AS score "
+                f"FROM {FTS5_TABLE} WHERE {FTS5_TABLE} MATCH :match"
+            )
+            params = {"match": match}
+            if search_pages:
+                # Every matching page; the outer min() keeps each project's best hit.
+                # Excluded projects are dropped via the metadata index.
+                page_sql = (
+                    f"SELECT pages.project_id AS project_id, bm25({PAGES_FTS5_TABLE}) * {PAGE_RANK_WEIGHT} AS score "
+                    f"FROM {PAGES_FTS5_TABLE} JOIN project_file_pages AS pages ON pages.id = {PAGES_FTS5_TABLE}.rowid "
+                    f"WHERE {PAGES_FTS5_TABLE} MATCH :page_match"
+                )
+                params["page_match"] = " AND ".join(SearchIndexService._fts5_expression(c) for c in positive)
+                if excluded:
+                    page_sql += (
+                        f" AND pages.project_id NOT IN "
+                        f"(SELECT rowid FROM {FTS5_TABLE} WHERE {FTS5_TABLE} MATCH :excluded)"
+                    )
+                    params["excluded"] = excluded
+                sql = f"SELECT project_id, min(score) AS score FROM ({sql} UNION ALL {page_sql}) GROUP BY project_id"
+
+            hits = text(sql).bindparams(**params).columns(project_id=Integer, score=Float).subquery("fts_hits")
+            query = query.join(hits, hits.c.project_id == Project.id)
+            # bm25() is lower-is-better; negate so callers can always sort DESC
+            return query, -hits.c.score
+
+        config = literal_column(f"'{TS_CONFIG}'::regconfig")
+        parts = [SearchIndexService._tsquery_expression(c) for c in positive]
+        negated = [f"!{SearchIndexService._tsquery_expression(c)}" for c in negative]
+
+        if search_pages:
+            tsquery = func.to_tsquery(config, " & ".join(parts))
+            page_hits = select(ProjectFilePage.project_id).where(ProjectFilePage.search_vector.op("@@")(tsquery))
+            query = query.filter(or_(Project.search_vector.op("@@")(tsquery), Project.id.in_(page_hits)))
+            if negated:
+                # Exclusions apply to metadata; projects without a vector are kept
+                kept = func.to_tsquery(config, " & ".join(negated))
+                query = query.filter(func.coalesce(Project.search_vector.op("@@")(kept), True))
+            # Best of the metadata rank and the best page's rank scaled by
+            # PAGE_RANK_WEIGHT, as the SQLite branch does with bm25()
+            page_rank = (
+                select(func.max(func.ts_rank(ProjectFilePage.search_vector, tsquery)))
+                .where(ProjectFilePage.project_id == Project.id, ProjectFilePage.search_vector.op("@@")(tsquery))
+                .scalar_subquery()
+            )
+            return query, func.greatest(
+                func.ts_rank(func.coalesce(Project.search_vector, ""), tsquery),
+                func.coalesce(page_rank, 0) * PAGE_RANK_WEIGHT
+            )
+
+        tsquery = func.to_tsquery(config, " & ".join(parts + negated))
+        query = query.filter(Project.search_vector.op("@@")(tsquery))
+        if not positive:
+            return query, None
+        return query, func.ts_rank(Project.search_vector, tsquery)
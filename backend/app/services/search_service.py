@@ -0,0 +1,405 @@
+import csv
+import io
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from sqlalchemy.orm import Session, Query, aliased
+from sqlalchemy import func, select, literal, cast, union_all, String
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.user import User
+from app.models.project import Project, ProjectStatus
+from app.models.taxonomy import Tag, ProjectTag
+from app.schemas.project import ProjectSearch, ProjectSummary, FacetCount, SearchFacets
+from app.services.project_service import ProjectService
+from app.services.search_index_service import SearchIndexService
+from app.services.ranking_service import RankingService
+from app.services.taxonomy_service import TaxonomyService
+from app.utils.pagination import apply_keyset, next_cursor
+
+
+# =====================================================
+# SUMMARY PROJECTION
+# =====================================================
+# Only the columns ProjectSummary needs: no abstract text, no project_files
+# join, no ORM entities. Names come from two outer joins on users.
+
+_Uploader = aliased(User, name="uploader")
+_Advisor = aliased(User, name="advisor")
+
+SUMMARY_COLUMNS = (
+    Project.id,
+    Project.title,
+    Project.abstract_preview,
+    Project.authors,
+    Project.tags,
+    Project.year,
+    Project.semester,
+    Project.status,
+    Project.privacy_level,
+    Project.uploaded_by,
+    Project.advisor_id,
+    Project.view_count,
+    Project.created_at,
+    _Uploader.full_name.label("uploader_name"),
+    _Advisor.full_name.label("advisor_name"),
+)
+
+
+# Columns of /search/export, in output order
+EXPORT_COLUMNS = (
+    Project.id,
+    Project.title,
+    Project.authors,
+    Project.tags,
+    Project.year,
+    Project.semester,
+    Project.course_code,
+    Project.class_name,
+    Project.assignment_type,
+    Project.status,
+    Project.privacy_level,
+    _Uploader.full_name.label("uploader_name"),
+    _Advisor.full_name.label("advisor_name"),
+    Project.view_count,
+    Project.download_count,
+    Project.created_at,
+)
+
+
+# Scalar columns faceted with a plain GROUP BY; tags are unnested separately
+FACET_COLUMNS = ("year", "semester", "course_code", "class_name", "status")
+TAG_FACET_LIMIT = 50
+
+
+settings = get_settings()
+
+# Totals are counted on their own connections while the request thread runs
+# the page query
+_count_pool = ThreadPoolExecutor(
+    max_workers=settings.SEARCH_COUNT_WORKERS, thread_name_prefix="search-count"
+)
+
+
+# =====================================================
+# SEARCH SERVICE
+# =====================================================
+
+class SearchService:
+    """Service class for the /search endpoints"""
+
+    @staticmethod
+    def filtered_query(
+        db: Session,
+        params: ProjectSearch,
+        current_user: Optional[User] = None
+    ) -> Tuple[Query, Optional[object]]:
+        """
+        Build the filtered, access-controlled project query for a search.
+
+        Returns:
+            tuple: (query, rank) where rank is the relevance expression when
+            a full-text query was given, otherwise None
+        """
+        query = db.query(Project)
+
+        # Apply full-text search (tsvector/GIN on PostgreSQL, FTS5 on SQLite)
+        rank = None
+        if params.query:
+            query, rank = SearchIndexService.apply_text_search(db, query, params.query)
+
+        # Apply filters
+        if params.year:
+            query = query.filter(Project.year == params.year)
+
+        if params.tag:
+            # Case-insensitive exact tag, via the tags / project_tags index
+            query = query.filter(TaxonomyService.tag_filter(params.tag))
+
+        if params.author:
+            query = query.filter(TaxonomyService.author_filter(params.author))
+
+        if params.privacy_level:
+            query = query.filter(Project.privacy_level == params.privacy_level)
+
+        if params.status:
+            query = query.filter(Project.status == params.status)
+
+        if params.uploader_id:
+            query = query.filter(Project.uploaded_by == params.uploader_id)
+
+        if params.advisor_id:
+            query = query.filter(Project.advisor_id == params.advisor_id)
+
+        if params.semester:
+            query = query.filter(Project.semester == params.semester)
+
+        if params.class_name:
+            query = query.filter(Project.class_name.ilike(f"%{params.class_name}%"))
+
+        if params.course_code:
+            query = query.filter(Project.course_code.ilike(f"%{params.course_code}%"))
+
+        # Apply access control in SQL so pagination counts only visible rows
+        query = ProjectService.apply_access_filter(query, current_user)
+
+        return query, rank
+
+    @staticmethod
+    def project_summary_rows(query: Query) -> Query:
+        """Turn a filtered Project query into a column-projected summary query"""
+        return (
+            query.with_entities(*SUMMARY_COLUMNS)
+            .outerjoin(_Uploader, _Uploader.id == Project.uploaded_by)
+            .outerjoin(_Advisor, _Advisor.id == Project.advisor_id)
+        )
+
+    @staticmethod
+    def summary_from_row(row) -> ProjectSummary:
+        """Build a ProjectSummary straight from a projected result row"""
+        data = row._asdict()
+        data["authors"] = data["authors"] or []
+        data["tags"] = data["tags"] or []
+        # Values come from typed DB columns; skip re-validation
+        return ProjectSummary.model_construct(**data)
+
+    @staticmethod
+    def search(
+        db: Session,
+        params: ProjectSearch,
+        current_user: Optional[User] = None
+    ) -> Tuple[List[ProjectSummary], Optional[str]]:
+        """
+        Run a search and return one page of summaries.
+
+        Relevance-ranked searches page with skip/limit, ordered by the BM25F
+        ranking engine (or the database rank when SEARCH_RANKING=database or
+        while the ranking index is still loading).
+        Newest-first pages (sort=newest, no text query, or a cursor was given)
+        use keyset pagination on (created_at, id) and also return the next cursor.
+
+        Returns:
+            tuple: (results, next_cursor)
+        """
+        query, rank = SearchService.filtered_query(db, params, current_user)
+        relevance = rank is not None and params.sort == "relevance" and not params.cursor
+
+        if relevance and RankingService.ready():
+            # Matching and access control stay in SQL; BM25F orders the best matches
+            page_ids = RankingService.ranked_page(db, query, rank, params.query, params.skip, params.limit)
+            rows = SearchService.project_summary_rows(
+                db.query(Project).filter(Project.id.in_(page_ids))
+            ).all()
+            by_id = {row.id: row for row in rows}
+            return [SearchService.summary_from_row(by_id[i]) for i in page_ids if i in by_id], None
+
+        query = SearchService.project_summary_rows(query)
+
+        if relevance:
+            # Best matches first, newest first among equal ranks
+            query = query.order_by(rank.desc(), Project.created_at.desc(), Project.id.desc())
+            rows = query.offset(params.skip).limit(params.limit).all()
+            return [SearchService.summary_from_row(row) for row in rows], None
+
+        query = apply_keyset(query, Project.created_at, Project.id, params.cursor)
+        if not params.cursor:
+            query = query.offset(params.skip)
+        rows = query.limit(params.limit).all()
+
+        return [SearchService.summary_from_row(row) for row in rows], next_cursor(rows, params.limit)
+
+    @staticmethod
+    def count_total(
+        db: Session,
+        params: ProjectSearch,
+        current_user: Optional[User] = None,
+        exact_limit: Optional[int] = None
+    ) -> Tuple[int, str]:
+        """
+        Number of projects matching a search, computed cheaply.
+
+        Counts at most exact_limit + 1 matching ids, so the cost is bounded
+        however broad the search is. Beyond the limit PostgreSQL reports the
+        planner's row estimate; other databases report the limit itself as
+        a lower bound.
+
+        Returns:
+            tuple: (total, accuracy) where accuracy is "exact", "estimate"
+            or "capped" (meaning "total or more")
+        """
+        exact_limit = settings.SEARCH_TOTAL_EXACT_LIMIT if exact_limit is None else exact_limit
+        query, _ = SearchService.filtered_query(db, params, current_user)
+        ids = query.with_entities(Project.id).order_by(None)
+
+        counted = db.query(func.count()).select_from(ids.limit(exact_limit + 1).subquery()).scalar()
+        if counted <= exact_limit:
+            return counted, "exact"
+
+        if db.get_bind().dialect.name == "postgresql":
+            estimate = SearchService._planner_estimate(db, ids)
+            if estimate > exact_limit:
+                return estimate, "estimate"
+        return exact_limit, "capped"
+
+    @staticmethod
+    def _planner_estimate(db: Session, query: Query) -> int:
+        """Row count the PostgreSQL planner expects `query` to return (EXPLAIN, not executed)"""
+        dialect = db.get_bind().dialect
+        sql = query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+        plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @staticmethod
+    def start_count(params: ProjectSearch, current_user: Optional[User] = None) -> "Future[Tuple[int, str]]":
+        """
+        Run count_total in the background on a separate session, so a
+        requested total adds no latency on top of the page query.
+
+        Returns:
+            Future: resolves to count_total's (total, accuracy)
+        """
+        user_id = current_user.id if current_user else None
+
+        def run() -> Tuple[int, str]:
+            with SessionLocal() as db:
+                user = db.get(User, user_id) if user_id is not None else None
+                return SearchService.count_total(db, params, user)
+
+        return _count_pool.submit(run)
+
+    @staticmethod
+    def export_rows(
+        db: Session,
+        params: ProjectSearch,
+        current_user: Optional[User] = None,
+        batch_size: Optional[int] = None
+    ):
+        """
+        Every project matching a search, newest first, as EXPORT_COLUMNS rows.
+
+        Paging parameters are ignored. Rows come from a server-side cursor
+        batch_size at a time, so memory does not grow with the result size.
+        """
+        batch_size = batch_size or settings.SEARCH_EXPORT_BATCH
+        query, _ = SearchService.filtered_query(db, params, current_user)
+        return (
+            query.with_entities(*EXPORT_COLUMNS)
+            .outerjoin(_Uploader, _Uploader.id == Project.uploaded_by)
+            .outerjoin(_Advisor, _Advisor.id == Project.advisor_id)
+            .order_by(Project.created_at.desc(), Project.id.desc())
+            .yield_per(batch_size)
+        )
+
+    @staticmethod
+    def _export_values(row) -> Dict:
+        """JSON-ready values of one export row"""
+        data = row._asdict()
+        data["authors"] = data["authors"] or []
+        data["tags"] = data["tags"] or []
+        for key in ("assignment_type", "status", "privacy_level"):
+            if data[key] is not None:
+                data[key] = data[key].value
+        data["created_at"] = data["created_at"].isoformat() if data["created_at"] else None
+        return data
+
+    @staticmethod
+    def stream_export(
+        params: ProjectSearch,
+        current_user: Optional[User] = None,
+        fmt: str = "csv"
+    ) -> Iterator[str]:
+        """
+        Encode a search export as CSV or NDJSON chunks, one chunk per cursor
+        batch. Uses its own session: a streamed response outlives the
+        request's dependencies.
+        """
+        user_id = current_user.id if current_user else None
+        batch_size = settings.SEARCH_EXPORT_BATCH
+
+        with SessionLocal() as db:
+            user = db.get(User, user_id) if user_id is not None else None
+            buffer = io.StringIO()
+            writer = csv.writer(buffer) if fmt == "csv" else None
+            if writer is not None:
+                writer.writerow([column.key for column in EXPORT_COLUMNS])
+
+            pending = 0
+            for row in SearchService.export_rows(db, params, user, batch_size):
+                data = SearchService._export_values(row)
+                if writer is not None:
+                    data["authors"] = "; ".join(data["authors"])
+                    data["tags"] = "; ".join(data["tags"])
+                    writer.writerow(data.values())
+                else:
+                    buffer.write(json.dumps(data, ensure_ascii=False))
+                    buffer.write("\n")
+
+                pending += 1
+                if pending == batch_size:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+                    pending = 0
+
+            if buffer.tell():
+                yield buffer.getvalue()
+
+    @staticmethod
+    def facets(
+        db: Session,
+        params: ProjectSearch,
+        current_user: Optional[User] = None,
+        include_tags: bool = True
+    ) -> SearchFacets:
+        """
+        Hit counts per year, tag, semester, course_code, class_name and status
+        for the filtered, access-controlled result set.
+
+        One statement: the matching rows are materialized once in a CTE and
+        each facet is a GROUP BY over it, glued together with UNION ALL.
+        """
+        query, _ = SearchService.filtered_query(db, params, current_user)
+        hits = query.with_entities(
+            Project.id, *(getattr(Project, name) for name in FACET_COLUMNS)
+        ).cte("hits")
+
+        parts = []
+        for name in FACET_COLUMNS:
+            column = hits.c[name]
+            parts.append(
+                select(
+                    literal(name).label("facet"),
+                    cast(column, String).label("value"),
+                    func.count().label("count")
+                ).where(column.isnot(None)).group_by(column)
+            )
+
+        # One row per (project, tag) through the project_tags link table
+        if include_tags:
+            parts.append(
+                select(
+                    literal("tag").label("facet"),
+                    Tag.name.label("value"),
+                    func.count().label("count")
+                ).select_from(hits)
+                .join(ProjectTag, ProjectTag.project_id == hits.c.id)
+                .join(Tag, Tag.id == ProjectTag.tag_id)
+                .group_by(Tag.id, Tag.name)
+            )
+
+        grouped: Dict[str, List[FacetCount]] = {"tag": [], **{name: [] for name in FACET_COLUMNS}}
+        for facet, value, count in db.execute(union_all(*parts)).all():
+            if facet == "status" and value in ProjectStatus.__members__:
+                # Enum columns store member names; expose the API values
+                value = ProjectStatus[value].value
+            grouped[facet].append(FacetCount(value=value, count=count))
+
+        for name, counts in grouped.items():
+            counts.sort(key=lambda c: (-c.count, c.value))
+        grouped["tag"] = grouped["tag"][:TAG_FACET_LIMIT]
+
+        return SearchFacets(**grouped)
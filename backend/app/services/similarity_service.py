@@ -0,0 +1,376 @@
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.user import User
+from app.models.project import Project, PrivacyLevel
+from app.schemas.project import SimilarProject
+from app.services.search_index_service import SearchIndexService
+from app.services.visibility_service import VisibilityService
+from app.utils.live_index import LiveIndex
+
+
+settings = get_settings()
+
+
+# =====================================================
+# TF-IDF CONFIGURATION
+# =====================================================
+
+# Fields of the "more like this" model and the weight of their terms
+SIMILARITY_FIELDS = (("title", 2.0), ("tags", 2.0), ("abstract", 1.0))
+
+# Terms found in more than this share of projects say little about a project
+# but have the longest posting lists; they are left out of query vectors once
+# the archive holds at least MIN_DOCS_FOR_DF_CUTOFF projects
+MAX_DF_RATIO = 0.5
+MIN_DOCS_FOR_DF_CUTOFF = 100
+
+# Projects changed since the last compaction are scored from a small delta
+# segment; past this size the segments are merged
+DELTA_LIMIT = 1000
+
+
+def _term_weights(project) -> Dict[str, float]:
+    """Sublinear, field-weighted term frequencies of a project"""
+    docs = SearchIndexService._documents(project)
+    weights: Dict[str, float] = {}
+    for field, boost in SIMILARITY_FIELDS:
+        for term, tf in Counter(SearchIndexService.query_terms(docs[field])).items():
+            weights[term] = weights.get(term, 0.0) + boost * (1.0 + math.log(tf))
+    return weights
+
+
+def _gather(ptr: np.ndarray, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions covered by the ranges ptr[k]:ptr[k+1] of each key, and the range lengths"""
+    starts = ptr[keys]
+    lengths = ptr[keys + 1] - starts
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(offsets.size), lengths
+
+
+# =====================================================
+# TF-IDF INDEX
+# =====================================================
+
+class TfidfIndex:
+    """
+    L2-normalized float32 TF-IDF vectors of every project.
+
+    Compacted vectors are stored twice as sparse matrices: row-wise (CSR,
+    the vector of one project) and column-wise (CSC, the projects holding a
+    term), so cosine similarity against every project is one gather and one
+    np.bincount. Projects added or changed since the last compaction live in
+    a small delta segment scored with the same vectorized operations; their
+    old compacted rows are masked out.
+    """
+
+    def __init__(self):
+        self.term_ids: Dict[str, int] = {}
+        self.df = np.zeros(1024, dtype=np.int32)
+        self.n_docs = 0
+
+        # Compacted segment
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.public = np.zeros(0, dtype=bool)
+        self.alive = np.zeros(0, dtype=bool)
+        self.row_of: Dict[int, int] = {}
+        self.row_ptr = np.zeros(1, dtype=np.int64)
+        self.row_terms = np.zeros(0, dtype=np.int32)
+        self.row_weights = np.zeros(0, dtype=np.float32)
+        self.col_ptr = np.zeros(1, dtype=np.int64)
+        self.col_rows = np.zeros(0, dtype=np.int32)
+        self.col_weights = np.zeros(0, dtype=np.float32)
+
+        # Delta segment: project id -> (sorted term ids, weights, is_public)
+        self.delta: Dict[int, Tuple[np.ndarray, np.ndarray, bool]] = {}
+        self._delta_arrays = None
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+    @classmethod
+    def build(cls, docs: Iterable[Tuple[int, Dict[str, float], bool]]) -> "TfidfIndex":
+        """Index (project_id, term weights, is_public) tuples in one pass plus one vectorized weighting"""
+        index = cls()
+        ids, public, rows = [], [], []
+        for project_id, weights, is_public in docs:
+            terms = index._term_array(weights)
+            index._count(terms, 1)
+            ids.append(project_id)
+            public.append(is_public)
+            order = np.argsort(terms)
+            rows.append((terms[order], np.fromiter(weights.values(), np.float32, len(weights))[order]))
+
+        lengths = np.fromiter((terms.size for terms, _ in rows), np.int64, len(rows))
+        row_terms = np.concatenate([terms for terms, _ in rows]) if rows else np.zeros(0, np.int32)
+        row_weights = np.concatenate([w for _, w in rows]) if rows else np.zeros(0, np.float32)
+        row_weights *= index._idf(row_terms)
+        index._compact(np.array(ids, np.int64), np.array(public, bool), lengths, row_terms, row_weights)
+        return index
+
+    def add(self, project_id: int, weights: Dict[str, float], is_public: bool) -> None:
+        """Index a project (replacing any previous version) in the delta segment"""
+        self.remove(project_id)
+        terms = self._term_array(weights)
+        self._count(terms, 1)
+        values = np.fromiter(weights.values(), np.float32, len(weights)) * self._idf(terms)
+        order = np.argsort(terms)
+        terms, values = terms[order], values[order]
+        norm = np.linalg.norm(values)
+        if norm:
+            values /= norm
+        self.delta[project_id] = (terms, values, is_public)
+        self._delta_arrays = None
+        if len(self.delta) > DELTA_LIMIT:
+            self.compact()
+
+    def remove(self, project_id: int) -> None:
+        entry = self.delta.pop(project_id, None)
+        if entry is not None:
+            self._delta_arrays = None
+            self._count(entry[0], -1)
+            return
+        row = self.row_of.pop(project_id, None)
+        if row is not None and self.alive[row]:
+            self.alive[row] = False
+            self._count(self.row_terms[self.row_ptr[row]:self.row_ptr[row + 1]], -1)
+
+    def compact(self) -> None:
+        """Merge the delta segment into the compacted one, dropping replaced rows"""
+        live = np.flatnonzero(self.alive)
+        positions, lengths = _gather(self.row_ptr, live)
+        delta = list(self.delta.items())
+
+        ids = np.concatenate([self.ids[live], np.fromiter((i for i, _ in delta), np.int64, len(delta))])
+        public = np.concatenate([self.public[live], np.fromiter((e[2] for _, e in delta), bool, len(delta))])
+        lengths = np.concatenate([lengths, np.fromiter((e[0].size for _, e in delta), np.int64, len(delta))])
+        row_terms = np.concatenate([self.row_terms[positions]] + [e[0] for _, e in delta])
+        row_weights = np.concatenate([self.row_weights[positions]] + [e[1] for _, e in delta])
+
+        self.delta = {}
+        self._delta_arrays = None
+        self._compact(ids, public, lengths, row_terms, row_weights, normalized=True)
+
+    def vector(self, project_id: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(sorted term ids, weights) of a project, or None if it is not indexed"""
+        entry = self.delta.get(project_id)
+        if entry is not None:
+            return entry[0], entry[1]
+        row = self.row_of.get(project_id)
+        if row is None:
+            return None
+        start, end = self.row_ptr[row], self.row_ptr[row + 1]
+        return self.row_terms[start:end], self.row_weights[start:end]
+
+    def most_similar(
+        self,
+        project_id: int,
+        k: int,
+        visible_restricted: Optional[Set[int]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        The k projects with the highest cosine similarity to `project_id`.
+
+        Args:
+            visible_restricted: non-public project ids that may be returned;
+                None allows every project
+
+        Returns:
+            list: (project_id, score) pairs, best first
+        """
+        vector = self.vector(project_id)
+        if vector is None:
+            return []
+        terms, weights = vector
+        if self.n_docs >= MIN_DOCS_FOR_DF_CUTOFF:
+            informative = self.df[terms] <= MAX_DF_RATIO * self.n_docs
+            terms, weights = terms[informative], weights[informative]
+
+        # Compacted segment: walk the posting lists of the query terms
+        known = terms < self.col_ptr.size - 1
+        positions, lengths = _gather(self.col_ptr, terms[known])
+        scores = np.bincount(
+            self.col_rows[positions],
+            weights=self.col_weights[positions] * np.repeat(weights[known], lengths),
+            minlength=self.ids.size
+        )
+        rows = np.flatnonzero(scores)
+        rows = rows[self.alive[rows]]
+        candidate_ids = [self.ids[rows]]
+        candidate_scores = [scores[rows]]
+        candidate_public = [self.public[rows]]
+
+        # Delta segment: match its entries against the sorted query terms
+        if self.delta and terms.size:
+            delta_ids, delta_public, entry_rows, entry_terms, entry_weights = self._delta()
+            slot = np.minimum(np.searchsorted(terms, entry_terms), terms.size - 1)
+            hit = terms[slot] == entry_terms
+            delta_scores = np.bincount(
+                entry_rows[hit], weights=entry_weights[hit] * weights[slot[hit]], minlength=delta_ids.size
+            )
+            rows = np.flatnonzero(delta_scores)
+            candidate_ids.append(delta_ids[rows])
+            candidate_scores.append(delta_scores[rows])
+            candidate_public.append(delta_public[rows])
+
+        ids = np.concatenate(candidate_ids)
+        scores = np.concatenate(candidate_scores)
+        allowed = ids != project_id
+        if visible_restricted is not None:
+            restricted = np.fromiter(visible_restricted, np.int64, len(visible_restricted))
+            allowed &= np.concatenate(candidate_public) | np.isin(ids, restricted)
+        ids, scores = ids[allowed], scores[allowed]
+
+        if ids.size > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            ids, scores = ids[top], scores[top]
+        order = np.lexsort((-ids, -scores))
+        return [(int(ids[i]), float(scores[i])) for i in order]
+
+    def _term_array(self, weights: Dict[str, float]) -> np.ndarray:
+        """Term ids of the keys of `weights`, in iteration order, registering new terms"""
+        term_ids = self.term_ids
+        for term in weights:
+            if term not in term_ids:
+                term_ids[term] = len(term_ids)
+        if len(term_ids) > self.df.size:
+            self.df = np.concatenate([self.df, np.zeros(max(len(term_ids), self.df.size), np.int32)])
+        return np.fromiter((term_ids[t] for t in weights), np.int32, len(weights))
+
+    def _count(self, terms: np.ndarray, delta: int) -> None:
+        self.df[terms] += delta
+        self.n_docs += delta
+
+    def _idf(self, terms: np.ndarray) -> np.ndarray:
+        """Smoothed inverse document frequency at the current counts"""
+        return (np.log((1.0 + self.n_docs) / (1.0 + self.df[terms])) + 1.0).astype(np.float32)
+
+    def _compact(
+        self,
+        ids: np.ndarray,
+        public: np.ndarray,
+        lengths: np.ndarray,
+        row_terms: np.ndarray,
+        row_weights: np.ndarray,
+        normalized: bool = False
+    ) -> None:
+        """Install new compacted CSR/CSC arrays from concatenated rows, each sorted by term id"""
+        row_ptr = np.zeros(ids.size + 1, dtype=np.int64)
+        np.cumsum(lengths, out=row_ptr[1:])
+        row_index = np.repeat(np.arange(ids.size, dtype=np.int32), lengths)
+
+        if not normalized and row_weights.size:
+            norms = np.sqrt(np.bincount(row_index, weights=row_weights.astype(np.float64) ** 2, minlength=ids.size))
+            row_weights /= np.maximum(norms, 1e-12).astype(np.float32)[row_index]
+
+        by_term = np.argsort(row_terms)
+        col_ptr = np.zeros(len(self.term_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row_terms, minlength=len(self.term_ids)), out=col_ptr[1:])
+
+        self.ids, self.public = ids, public
+        self.alive = np.ones(ids.size, dtype=bool)
+        self.row_of = {int(project_id): row for row, project_id in enumerate(ids)}
+        self.row_ptr, self.row_terms, self.row_weights = row_ptr, row_terms, row_weights
+        self.col_ptr, self.col_rows, self.col_weights = col_ptr, row_index[by_term], row_weights[by_term]
+
+    def _delta(self):
+        """Delta segment flattened to arrays (cached until the delta changes)"""
+        if self._delta_arrays is None:
+            entries = list(self.delta.items())
+            lengths = np.fromiter((e[0].size for _, e in entries), np.int64, len(entries))
+            self._delta_arrays = (
+                np.fromiter((i for i, _ in entries), np.int64, len(entries)),
+                np.fromiter((e[2] for _, e in entries), bool, len(entries)),
+                np.repeat(np.arange(len(entries), dtype=np.int32), lengths),
+                np.concatenate([e[0] for _, e in entries]),
+                np.concatenate([e[1] for _, e in entries]),
+            )
+        return self._delta_arrays
+
+
+def _build_index(db: Session, batch_size: int = 1000) -> TfidfIndex:
+    rows = db.query(
+        Project.id, Project.title, Project.tags, Project.authors, Project.abstract, Project.privacy_level
+    ).yield_per(batch_size)
+    return TfidfIndex.build(
+        (row.id, _term_weights(row), row.privacy_level == PrivacyLevel.PUBLIC) for row in rows
+    )
+
+
+# Process-wide index, built in the background (see LiveIndex)
+_live: LiveIndex[TfidfIndex] = LiveIndex(
+    "similarity index", _build_index, settings.SIMILARITY_INDEX_REFRESH_SECONDS
+)
+
+
+# =====================================================
+# SIMILARITY SERVICE
+# =====================================================
+
+class SimilarityService:
+    """"More like this" recommendations from TF-IDF cosine similarity"""
+
+    @staticmethod
+    def start() -> None:
+        _live.start()
+
+    @staticmethod
+    def stop() -> None:
+        _live.stop()
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Build the index from the database and swap it in. Returns the number of projects indexed."""
+        return len(_live.rebuild(db))
+
+    @staticmethod
+    def index_project(project: Project) -> None:
+        """Add or refresh one project after its transaction has committed"""
+        project_id, weights = project.id, _term_weights(project)
+        is_public = project.privacy_level == PrivacyLevel.PUBLIC
+        _live.apply(lambda index: index.add(project_id, weights, is_public))
+
+    @staticmethod
+    def remove_project(project_id: int) -> None:
+        """Drop a deleted project from the index"""
+        _live.apply(lambda index: index.remove(project_id))
+
+    @staticmethod
+    def similar_projects(
+        db: Session,
+        project_id: int,
+        limit: int = 10,
+        current_user: Optional[User] = None
+    ) -> List[SimilarProject]:
+        """
+        Projects most similar to `project_id` that the user may see, best first.
+        Visibility is applied to the scores before the top-k is taken, so the
+        page is always full when enough visible projects match. Empty until
+        the index has been built after startup.
+        """
+        from app.services.search_service import SearchService
+
+        index = _live.current
+        if index is None:
+            return []
+        visible = VisibilityService.visible_restricted_ids(db, current_user)
+        with _live.lock:
+            ranked = index.most_similar(project_id, limit, visible)
+        if not ranked:
+            return []
+
+        rows = SearchService.project_summary_rows(
+            db.query(Project).filter(Project.id.in_([i for i, _ in ranked]))
+        ).all()
+        by_id = {row.id: row for row in rows}
+        return [
+            SimilarProject.model_construct(
+                **SearchService.summary_from_row(by_id[i]).model_dump(), score=round(score, 4)
+            )
+            for i, score in ranked if i in by_id
+        ]
@@ -0,0 +1,280 @@
+import hashlib
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.file import ProjectFile, FileBlob
+
+
+settings = get_settings()
+
+UPLOAD_DIR = Path(settings.UPLOAD_DIR)
+BLOB_PREFIX = "blobs"
+BLOB_DIR = UPLOAD_DIR / BLOB_PREFIX
+# Uploads being written; same filesystem as the blobs, so placing one is a rename
+TEMP_DIR = BLOB_DIR / "tmp"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Session.info keys: digests released and files discarded in the open transaction
+_RELEASED = "storage_released_blobs"
+_DISCARDED = "storage_discarded_files"
+
+
+def _collect_released(session: Session) -> None:
+    for sha256 in session.info.pop(_RELEASED, ()):
+        try:
+            StorageService.collect(sha256)
+        except Exception as e:
+            print(f"Error removing blob {sha256}: {e}")
+    for path in session.info.pop(_DISCARDED, ()):
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"Error deleting file from disk {path}: {e}")
+
+
+def _forget_released(session: Session, previous_transaction) -> None:
+    # Savepoint rollbacks (a lost insert race) leave the transaction's work in place
+    if previous_transaction.parent is None:
+        session.info.pop(_RELEASED, None)
+        session.info.pop(_DISCARDED, None)
+
+
+# Blobs and discarded files are only removed once the transaction that
+# dropped them has committed; a rollback restores the reference and the file
+event.listen(Session, "after_commit", _collect_released)
+event.listen(Session, "after_soft_rollback", _forget_released)
+
+
+def file_sha256(path: Path) -> str:
+    """Hex SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# =====================================================
+# STORAGE SERVICE
+# =====================================================
+
+class StorageService:
+    """
+    Content-addressed file storage with reference counting.
+
+    Each distinct content is stored once under blobs/<2>/<2>/<sha256>; a
+    FileBlob row counts the ProjectFile rows that use it. References are
+    taken and dropped inside the caller's transaction. A blob whose count
+    reaches zero is removed after that transaction commits, by `collect`,
+    which deletes the row and the file while holding the row lock, so a
+    concurrent upload of the same content either keeps it alive or
+    re-creates it afterwards.
+    """
+
+    @staticmethod
+    def blob_path(sha256: str) -> str:
+        """saved_path of a blob, relative to UPLOAD_DIR"""
+        return f"{BLOB_PREFIX}/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+    @staticmethod
+    def is_blob(saved_path: str) -> bool:
+        """False for files stored per user before deduplication"""
+        return saved_path.startswith(f"{BLOB_PREFIX}/")
+
+    @staticmethod
+    def temp_path() -> Path:
+        """A fresh path to write an incoming file to before it is stored"""
+        TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        return TEMP_DIR / uuid.uuid4().hex
+
+    @staticmethod
+    def store(db: Session, source: Path, sha256: str, size: int, keep_source: bool = False) -> str:
+        """
+        Take a reference to the blob of `source`'s content, moving the file
+        into place when the content is new. Otherwise the file is dropped
+        (or left alone with keep_source) and the existing blob is shared.
+
+        Returns:
+            str: saved_path of the blob
+        """
+        # Reference first: the row lock keeps `collect` off this blob until commit
+        StorageService._add_reference(db, sha256, size)
+
+        saved_path = StorageService.blob_path(sha256)
+        target = UPLOAD_DIR / saved_path
+        if target.exists():
+            # Fresh mtime: `collect_garbage` spares it until this reference commits
+            os.utime(target)
+            if not keep_source:
+                source.unlink(missing_ok=True)
+            return saved_path
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if keep_source:
+            staged = StorageService.temp_path()
+            try:
+                os.link(source, staged)
+            except OSError:
+                shutil.copyfile(source, staged)
+            os.replace(staged, target)
+        else:
+            os.replace(source, target)
+        os.utime(target)
+        return saved_path
+
+    @staticmethod
+    def remove_after_commit(db: Session, path: Path) -> None:
+        """Delete `path` once the open transaction commits; a rollback keeps it"""
+        db.info.setdefault(_DISCARDED, []).append(path)
+
+    @staticmethod
+    def _add_reference(db: Session, sha256: str, size: int) -> None:
+        if StorageService._change_count(db, sha256, 1):
+            return
+        try:
+            with db.begin_nested():
+                db.add(FileBlob(sha256=sha256, size=size, ref_count=1))
+        except IntegrityError:
+            # Another upload of the same content created the row first
+            StorageService._change_count(db, sha256, 1)
+
+    @staticmethod
+    def _change_count(db: Session, sha256: str, delta: int) -> bool:
+        return bool(db.query(FileBlob).filter(FileBlob.sha256 == sha256).update(
+            {"ref_count": FileBlob.ref_count + delta}, synchronize_session=False
+        ))
+
+    @staticmethod
+    def release(db: Session, sha256: str, count: int = 1) -> None:
+        """Drop `count` references; at zero the blob is removed after commit"""
+        if not StorageService._change_count(db, sha256, -count):
+            return
+        remaining = db.query(FileBlob.ref_count).filter(FileBlob.sha256 == sha256).scalar()
+        if remaining is not None and remaining <= 0:
+            db.info.setdefault(_RELEASED, set()).add(sha256)
+
+    @staticmethod
+    def release_project(db: Session, project_id: int) -> None:
+        """Drop the references of every file of a project (before the project is deleted)"""
+        rows = (
+            db.query(ProjectFile.sha256, ProjectFile.saved_path)
+            .filter(ProjectFile.project_id == project_id, ProjectFile.sha256.isnot(None))
+            .all()
+        )
+        counts: Dict[str, int] = {}
+        for sha256, saved_path in rows:
+            if StorageService.is_blob(saved_path):
+                counts[sha256] = counts.get(sha256, 0) + 1
+        for sha256, count in counts.items():
+            StorageService.release(db, sha256, count)
+
+    @staticmethod
+    def collect(sha256: str) -> bool:
+        """Remove an unreferenced blob (own session). Returns True if it was removed."""
+        db = SessionLocal()
+        try:
+            removed = db.query(FileBlob).filter(
+                FileBlob.sha256 == sha256, FileBlob.ref_count <= 0
+            ).delete(synchronize_session=False)
+            if removed:
+                (UPLOAD_DIR / StorageService.blob_path(sha256)).unlink(missing_ok=True)
+            db.commit()
+            return bool(removed)
+        finally:
+            db.close()
+
+    @staticmethod
+    def collect_garbage(db: Session, min_age_seconds: int = 3600) -> Tuple[int, int]:
+        """
+        Remove unreferenced blobs, blob files without a row and stale temp
+        files (left by crashed requests) older than `min_age_seconds`.
+
+        Returns:
+            Tuple[int, int]: (blobs removed, stray files removed)
+        """
+        unreferenced = [sha256 for (sha256,) in db.query(FileBlob.sha256).filter(FileBlob.ref_count <= 0)]
+        blobs = sum(StorageService.collect(sha256) for sha256 in unreferenced)
+
+        if not BLOB_DIR.exists():
+            return blobs, 0
+        cutoff = time.time() - min_age_seconds
+        known = {sha256 for (sha256,) in db.query(FileBlob.sha256)}
+        stray = 0
+        for path in BLOB_DIR.glob("*/*/*"):
+            if path.is_file() and path.name not in known and path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                stray += 1
+        for path in TEMP_DIR.glob("*") if TEMP_DIR.exists() else ():
+            if path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                stray += 1
+        return blobs, stray
+
+    @staticmethod
+    def deduplicate_existing(db: Session, batch_size: int = 100) -> Dict[str, int]:
+        """
+        Move files stored per user into the blob store, in place.
+
+        Each file is hashed (unless its digest is known), linked into its
+        blob and repointed, then the old file is removed after the batch
+        commits. Safe to re-run after an interruption: files are only
+        deleted once no row points at them.
+
+        Returns:
+            Dict[str, int]: files moved, files missing on disk, bytes freed
+        """
+        stats = {"moved": 0, "missing": 0, "bytes_freed": 0}
+        last_id = 0
+        while True:
+            files = (
+                db.query(ProjectFile)
+                .filter(ProjectFile.id > last_id, ~ProjectFile.saved_path.startswith(f"{BLOB_PREFIX}/"))
+                .order_by(ProjectFile.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not files:
+                return stats
+            last_id = files[-1].id
+
+            replaced = []
+            for db_file in files:
+                source = UPLOAD_DIR / db_file.saved_path
+                if not source.exists():
+                    stats["missing"] += 1
+                    continue
+                size = source.stat().st_size
+                sha256 = db_file.sha256 or file_sha256(source)
+                shared = (UPLOAD_DIR / StorageService.blob_path(sha256)).exists()
+                db_file.saved_path = StorageService.store(db, source, sha256, size, keep_source=True)
+                db_file.sha256 = sha256
+                db_file.file_size = size
+                replaced.append(source)
+                stats["moved"] += 1
+                if shared:
+                    stats["bytes_freed"] += size
+            db.commit()
+
+            for source in replaced:
+                source.unlink(missing_ok=True)
+
+    @staticmethod
+    def stats(db: Session) -> Dict[str, Optional[int]]:
+        """Blob count, stored bytes and the bytes deduplication avoids storing"""
+        blobs, stored = db.query(func.count(FileBlob.sha256), func.sum(FileBlob.size)).one()
+        referenced = db.query(func.sum(FileBlob.size * FileBlob.ref_count)).scalar()
+        return {
+            "blobs": blobs,
+            "stored_bytes": stored or 0,
+            "saved_bytes": (referenced or 0) - (stored or 0),
+        }
@@ -0,0 +1,250 @@
+import bisect
+import heapq
+from itertools import groupby
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.user import User
+from app.models.project import Project, PrivacyLevel
+from app.services.visibility_service import VisibilityService
+from app.utils.live_index import LiveIndex
+
+
+settings = get_settings()
+
+# Suggestion groups returned by /search/suggestions, in response order
+SUGGESTION_FIELDS = ("titles", "authors", "tags", "courses")
+
+# Sorts after every real character, so [prefix, prefix + _KEY_END) is the prefix range
+_KEY_END = "\U0010ffff"
+
+# A completion looks at no more than this many keys of its prefix range.
+# Prefixes up to SHORT_PREFIX_LENGTH characters with a larger range use the
+# SHORT_PREFIX_CANDIDATES keys most projects contribute, chosen at build time.
+MAX_COMPLETION_SCAN = 2000
+SHORT_PREFIX_LENGTH = 3
+SHORT_PREFIX_CANDIDATES = 100
+
+
+def _fold(value: str) -> str:
+    return value.strip().casefold()
+
+
+def _field_values(project) -> Dict[str, Tuple[str, ...]]:
+    """Completion values a project contributes (works on Project rows and entities)"""
+    return {
+        "titles": (project.title,) if project.title else (),
+        "authors": tuple(a for a in (project.authors or []) if a),
+        "tags": tuple(t for t in (project.tags or []) if t),
+        "courses": (project.course_code,) if project.course_code else (),
+    }
+
+
+# =====================================================
+# PREFIX INDEX
+# =====================================================
+
+class PrefixIndex:
+    """
+    Case-folded completion keys kept in a sorted list and searched with bisect.
+
+    Each key remembers which projects contribute it, split into public and
+    restricted, so completions can be weighted by the number of projects the
+    caller can actually see and restricted-only keys never leak.
+    """
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.display: Dict[str, str] = {}
+        self.public: Dict[str, Set[int]] = {}
+        self.restricted: Dict[str, Set[int]] = {}
+        # New keys, merged into self.keys before the next lookup
+        self._new_keys: List[str] = []
+        # Short prefix -> its most contributed keys (see prepare)
+        self.popular: Dict[str, List[str]] = {}
+
+    def add(self, value: str, project_id: int, is_public: bool) -> None:
+        key = _fold(value)
+        if not key:
+            return
+        if key not in self.display:
+            self._new_keys.append(key)
+            self.display[key] = value.strip()
+            self.public[key] = set()
+            self.restricted[key] = set()
+        (self.public if is_public else self.restricted)[key].add(project_id)
+
+    def discard(self, value: str, project_id: int) -> None:
+        key = _fold(value)
+        if key not in self.display:
+            return
+        self.public[key].discard(project_id)
+        self.restricted[key].discard(project_id)
+        if not self.public[key] and not self.restricted[key]:
+            del self.display[key], self.public[key], self.restricted[key]
+            keys = self._sorted()
+            del keys[bisect.bisect_left(keys, key)]
+
+    def _sorted(self) -> List[str]:
+        """self.keys with the new keys merged in"""
+        if self._new_keys:
+            if len(self._new_keys) > 32:
+                # Two sorted runs: the sort merges them in linear time
+                self._new_keys.sort()
+                self.keys.extend(self._new_keys)
+                self.keys.sort()
+            else:
+                for key in self._new_keys:
+                    bisect.insort(self.keys, key)
+            self._new_keys = []
+        return self.keys
+
+    def prepare(self) -> None:
+        """Sort the keys and pick the popular keys of crowded short prefixes (after a build)"""
+        keys = self._sorted()
+        weight = lambda key: -(len(self.public[key]) + len(self.restricted[key]))
+        self.popular = {}
+        for length in range(1, SHORT_PREFIX_LENGTH + 1):
+            for prefix, group in groupby(keys, key=lambda key: key[:length]):
+                group = list(group)
+                if len(group) > MAX_COMPLETION_SCAN:
+                    self.popular[prefix] = heapq.nsmallest(SHORT_PREFIX_CANDIDATES, group, key=weight)
+
+    def complete(self, prefix: str, limit: int, visible: Optional[Set[int]]) -> List[str]:
+        """
+        Top `limit` completions of `prefix`, most projects first.
+
+        Args:
+            visible: ids of restricted projects the caller may see,
+                or None when every project is visible
+        """
+        prefix = _fold(prefix)
+        keys = self._sorted()
+        lo = bisect.bisect_left(keys, prefix)
+        hi = bisect.bisect_left(keys, prefix + _KEY_END, lo)
+        if hi - lo > MAX_COMPLETION_SCAN:
+            # Keys added since the build are not among the popular ones
+            # until the next rebuild; removed ones are skipped
+            popular = self.popular.get(prefix)
+            if popular is not None:
+                scan = [key for key in popular if key in self.display]
+            else:
+                scan = keys[lo:lo + MAX_COMPLETION_SCAN]
+        else:
+            scan = keys[lo:hi]
+
+        candidates = []
+        for key in scan:
+            restricted = self.restricted[key]
+            if visible is None:
+                weight = len(self.public[key]) + len(restricted)
+            elif restricted and visible:
+                weight = len(self.public[key]) + len(restricted & visible)
+            else:
+                weight = len(self.public[key])
+            if weight:
+                candidates.append((-weight, key))
+
+        return [self.display[key] for _, key in heapq.nsmallest(limit, candidates)]
+
+
+class SuggestionIndex:
+    """Prefix indexes for every suggestion group, plus what each project put in them"""
+
+    def __init__(self):
+        self.fields: Dict[str, PrefixIndex] = {name: PrefixIndex() for name in SUGGESTION_FIELDS}
+        self.projects: Dict[int, Dict[str, Tuple[str, ...]]] = {}
+
+    def add(self, project_id: int, values: Dict[str, Tuple[str, ...]], is_public: bool) -> None:
+        """Index a project's completion values (replacing any previous version)"""
+        self.remove(project_id)
+        for name, field_values in values.items():
+            for value in field_values:
+                self.fields[name].add(value, project_id, is_public)
+        self.projects[project_id] = values
+
+    def remove(self, project_id: int) -> None:
+        values = self.projects.pop(project_id, None)
+        if not values:
+            return
+        for name, field_values in values.items():
+            for value in field_values:
+                self.fields[name].discard(value, project_id)
+
+    def prepare(self) -> None:
+        for field in self.fields.values():
+            field.prepare()
+
+
+def _build_index(db: Session) -> SuggestionIndex:
+    index = SuggestionIndex()
+    rows = db.query(
+        Project.id, Project.title, Project.authors, Project.tags,
+        Project.course_code, Project.privacy_level
+    ).yield_per(1000)
+    for row in rows:
+        index.add(row.id, _field_values(row), row.privacy_level == PrivacyLevel.PUBLIC)
+    index.prepare()
+    return index
+
+
+# Process-wide index, built in the background (see LiveIndex)
+_live: LiveIndex[SuggestionIndex] = LiveIndex(
+    "suggestion index", _build_index, settings.SUGGESTION_INDEX_REFRESH_SECONDS
+)
+
+
+# =====================================================
+# SUGGESTION SERVICE
+# =====================================================
+
+class SuggestionService:
+    """Autocomplete for /search/suggestions served from an in-process prefix index"""
+
+    @staticmethod
+    def start() -> None:
+        _live.start()
+
+    @staticmethod
+    def stop() -> None:
+        _live.stop()
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Build the index from the database and swap it in. Returns the number of projects indexed."""
+        return len(_live.rebuild(db).projects)
+
+    @staticmethod
+    def index_project(project: Project) -> None:
+        """Add or refresh one project after its transaction has committed"""
+        project_id, values = project.id, _field_values(project)
+        is_public = project.privacy_level == PrivacyLevel.PUBLIC
+        _live.apply(lambda index: index.add(project_id, values, is_public))
+
+    @staticmethod
+    def remove_project(project_id: int) -> None:
+        """Drop a deleted project from the index"""
+        _live.apply(lambda index: index.remove(project_id))
+
+    @staticmethod
+    def suggest(
+        db: Session,
+        prefix: str,
+        limit: int,
+        current_user: Optional[User] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Weighted prefix completions per group, limited to visible projects.
+        Every group is empty until the index has been built after startup.
+        """
+        index = _live.current
+        if index is None:
+            return {name: [] for name in SUGGESTION_FIELDS}
+        visible = VisibilityService.visible_restricted_ids(db, current_user)
+        with _live.lock:
+            return {
+                name: index.fields[name].complete(prefix, limit, visible)
+                for name in SUGGESTION_FIELDS
+            }
@@ -0,0 +1,147 @@
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.models.user import User
+from app.models.project import Project, PrivacyLevel
+from app.models.tag_stat import TagStat
+from app.models.taxonomy import Tag
+from app.services.taxonomy_service import normalize_key
+from app.services.visibility_service import VisibilityService
+
+
+# (tag keys, privacy_level) of a project at one point in time
+TagSnapshot = Tuple[Tuple[str, ...], PrivacyLevel]
+
+
+# =====================================================
+# TAG STATS SERVICE
+# =====================================================
+
+class TagStatsService:
+    """
+    Maintains and reads the tag_stats read model.
+
+    Counts are keyed on the normalized tag (tags.key), so "NLP" and "nlp"
+    are one tag here just as in the tag filter; responses show tags.name.
+    """
+
+    @staticmethod
+    def _keys(tags) -> Tuple[str, ...]:
+        """Distinct normalized keys of a tag list"""
+        return tuple(dict.fromkeys(normalize_key(t) for t in (tags or []) if t and t.strip()))
+
+    @staticmethod
+    def snapshot(project: Project) -> TagSnapshot:
+        """Capture what a project contributes to tag_stats (call before mutating it)"""
+        return TagStatsService._keys(project.tags), project.privacy_level
+
+    @staticmethod
+    def record_change(db: Session, before: Optional[TagSnapshot], after: Optional[TagSnapshot]) -> None:
+        """
+        Apply the count delta between two snapshots of a project.
+        Use before=None for a new project and after=None for a deleted one.
+        Runs inside the caller's transaction.
+        """
+        delta: Counter = Counter()
+        if before:
+            tags, visibility = before
+            for tag in tags:
+                delta[(tag, visibility)] -= 1
+        if after:
+            tags, visibility = after
+            for tag in tags:
+                delta[(tag, visibility)] += 1
+
+        for (tag, visibility), change in delta.items():
+            if change:
+                TagStatsService._adjust(db, tag, visibility, change)
+
+        if any(change < 0 for change in delta.values()):
+            db.query(TagStat).filter(TagStat.project_count <= 0).delete(synchronize_session=False)
+
+    @staticmethod
+    def _adjust(db: Session, tag: str, visibility: PrivacyLevel, change: int) -> None:
+        """Atomic upsert: project_count += change"""
+        insert = sqlite_insert if db.get_bind().dialect.name == "sqlite" else pg_insert
+        stmt = insert(TagStat).values(tag=tag, visibility=visibility, project_count=change)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TagStat.tag, TagStat.visibility],
+            set_={"project_count": TagStat.project_count + stmt.excluded.project_count}
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """
+        Recompute tag_stats from scratch in one INSERT ... SELECT over the
+        project_tags links. Returns the number of rows written.
+        """
+        db.query(TagStat).delete(synchronize_session=False)
+        result = db.execute(text(
+            "INSERT INTO tag_stats (tag, visibility, project_count) "
+            "SELECT t.key, p.privacy_level, COUNT(*) "
+            "FROM project_tags pt "
+            "JOIN tags t ON t.id = pt.tag_id "
+            "JOIN projects p ON p.id = pt.project_id "
+            "GROUP BY t.key, p.privacy_level"
+        ))
+        return result.rowcount
+
+    @staticmethod
+    def popular_tags(db: Session, current_user: Optional[User], limit: int) -> List[Dict]:
+        """
+        Most used tags among the projects the user can see.
+
+        Anonymous users read the public counts; dosen (who may see every
+        project's metadata) read all classes. Students read public counts
+        plus the few non-public projects visible to them.
+        """
+        if current_user is not None and current_user.role == "dosen":
+            total = func.sum(TagStat.project_count)
+            rows = (
+                db.query(Tag.name, total)
+                .join(Tag, Tag.key == TagStat.tag)
+                .group_by(TagStat.tag, Tag.name)
+                .order_by(total.desc(), TagStat.tag)
+                .limit(limit)
+                .all()
+            )
+            return [{"tag": name, "count": int(count)} for name, count in rows]
+
+        public = db.query(TagStat.tag, TagStat.project_count).filter(
+            TagStat.visibility == PrivacyLevel.PUBLIC
+        )
+        if current_user is None:
+            rows = (
+                public.with_entities(Tag.name, TagStat.project_count)
+                .join(Tag, Tag.key == TagStat.tag)
+                .order_by(TagStat.project_count.desc(), TagStat.tag)
+                .limit(limit)
+                .all()
+            )
+            return [{"tag": name, "count": count} for name, count in rows]
+
+        # Non-public projects this student can see (own, advised, class, granted)
+        extra: Counter = Counter()
+        visible = db.query(Project.tags).filter(
+            Project.privacy_level != PrivacyLevel.PUBLIC,
+            VisibilityService.access_filter(db, current_user)
+        )
+        for (tags,) in visible:
+            extra.update(TagStatsService._keys(tags))
+
+        # Any tag outside the public top-k and `extra` cannot outrank them
+        public_counts = dict(public.order_by(TagStat.project_count.desc()).limit(limit).all())
+        if extra:
+            public_counts.update(public.filter(TagStat.tag.in_(list(extra))).all())
+        counts = Counter(public_counts)
+        counts.update(extra)
+
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        names = dict(db.query(Tag.key, Tag.name).filter(Tag.key.in_([key for key, _ in ranked])).all())
+        return [{"tag": names.get(key, key), "count": count} for key, count in ranked]
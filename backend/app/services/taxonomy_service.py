@@ -0,0 +1,118 @@
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.models.project import Project
+from app.models.taxonomy import Tag, Author, ProjectTag, ProjectAuthor
+
+
+def normalize_key(value: str) -> str:
+    """Canonical lookup key: whitespace collapsed, case-folded"""
+    return " ".join(value.split()).casefold()
+
+
+# =====================================================
+# TAXONOMY SERVICE
+# =====================================================
+
+class TaxonomyService:
+    """
+    Keeps the normalized tags/authors tables and their project links in sync
+    with the Project.tags / Project.authors arrays, and builds the indexed
+    tag/author filters used by search.
+    """
+
+    @staticmethod
+    def _insert(db: Session):
+        return sqlite_insert if db.get_bind().dialect.name == "sqlite" else pg_insert
+
+    @staticmethod
+    def _resolve(db: Session, model, names: Optional[Iterable[str]]) -> Set[int]:
+        """Ids of the Tag/Author rows for `names`, creating missing ones"""
+        wanted: Dict[str, str] = {}
+        for name in names or []:
+            if name and name.strip():
+                wanted.setdefault(normalize_key(name), " ".join(name.split()))
+        if not wanted:
+            return set()
+
+        ids = dict(db.query(model.key, model.id).filter(model.key.in_(list(wanted))).all())
+        missing = [{"key": key, "name": name} for key, name in wanted.items() if key not in ids]
+        if missing:
+            # Another request may create the same key concurrently
+            db.execute(
+                TaxonomyService._insert(db)(model).on_conflict_do_nothing(index_elements=["key"]),
+                missing
+            )
+            ids.update(db.query(model.key, model.id).filter(model.key.in_([m["key"] for m in missing])).all())
+        return set(ids.values())
+
+    @staticmethod
+    def _sync_links(db: Session, link_model, column: str, project_id: int, wanted: Set[int]) -> None:
+        """Make the project's link rows match `wanted`, touching only the difference"""
+        link_column = getattr(link_model, column)
+        current = {value for (value,) in db.query(link_column).filter(link_model.project_id == project_id)}
+
+        stale = current - wanted
+        if stale:
+            db.query(link_model).filter(
+                link_model.project_id == project_id, link_column.in_(stale)
+            ).delete(synchronize_session=False)
+
+        new = wanted - current
+        if new:
+            db.execute(
+                link_model.__table__.insert(),
+                [{"project_id": project_id, column: value} for value in new]
+            )
+
+    @staticmethod
+    def sync_project(db: Session, project: Project) -> None:
+        """
+        Mirror project.tags and project.authors into the link tables.
+        Must be called after the project has been flushed; runs inside the
+        caller's transaction.
+        """
+        TaxonomyService._sync_links(
+            db, ProjectTag, "tag_id", project.id, TaxonomyService._resolve(db, Tag, project.tags)
+        )
+        TaxonomyService._sync_links(
+            db, ProjectAuthor, "author_id", project.id, TaxonomyService._resolve(db, Author, project.authors)
+        )
+
+    @staticmethod
+    def remove_project(db: Session, project_id: int) -> None:
+        """Drop a project's links (SQLite does not enforce ON DELETE CASCADE by default)"""
+        db.query(ProjectTag).filter(ProjectTag.project_id == project_id).delete(synchronize_session=False)
+        db.query(ProjectAuthor).filter(ProjectAuthor.project_id == project_id).delete(synchronize_session=False)
+
+    @staticmethod
+    def rebuild(db: Session, batch_size: int = 500) -> int:
+        """Re-sync every project's links. Returns the number of projects processed."""
+        count = 0
+        rows = db.query(Project.id, Project.tags, Project.authors).order_by(Project.id).yield_per(batch_size)
+        for row in rows:
+            TaxonomyService.sync_project(db, row)
+            count += 1
+        return count
+
+    @staticmethod
+    def tag_filter(tag: str):
+        """Projects carrying `tag` (case-insensitive exact match) via tags.key -> project_tags"""
+        return Project.id.in_(
+            select(ProjectTag.project_id)
+            .join(Tag, Tag.id == ProjectTag.tag_id)
+            .where(Tag.key == normalize_key(tag))
+        )
+
+    @staticmethod
+    def author_filter(author: str):
+        """Projects by `author` (case-insensitive exact name) via authors.key -> project_authors"""
+        return Project.id.in_(
+            select(ProjectAuthor.project_id)
+            .join(Author, Author.id == ProjectAuthor.author_id)
+            .where(Author.key == normalize_key(author))
+        )
@@ -0,0 +1,257 @@
+import hashlib
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator, List, Optional
+
+import aiofiles
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.user import User
+from app.models.upload import UploadSession, UploadChunk, UploadStatus
+from app.schemas.upload import UploadSessionCreate
+from app.services.file_service import FileService, UPLOAD_DIR, UPLOAD_CHUNK_SIZE
+from app.services.storage_service import StorageService
+
+
+settings = get_settings()
+
+# Part files of sessions in progress; user directories are UUIDs, so no clash
+SESSION_DIR = UPLOAD_DIR / "_sessions"
+MAX_CHUNK_SIZE = settings.UPLOAD_SESSION_MAX_CHUNK_MB * 1024 * 1024
+
+
+# =====================================================
+# UPLOAD SERVICE
+# =====================================================
+
+class UploadService:
+    """
+    Resumable uploads: a session is created with the file's name and size,
+    chunks are PATCHed at the current offset, and a completed session is
+    attached to a project through FileService in place of an UploadFile.
+
+    Every chunk is hashed as it is written and its SHA-256 stored; on
+    completion the part file is re-read once, checking each chunk against
+    its checksum while hashing the whole file.
+    """
+
+    @staticmethod
+    def part_path(upload: UploadSession) -> Path:
+        return SESSION_DIR / f"{upload.id}.part"
+
+    @staticmethod
+    def _touch(upload: UploadSession) -> None:
+        upload.updated_at = datetime.utcnow()
+        upload.expires_at = upload.updated_at + timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS)
+
+    @staticmethod
+    def create_session(db: Session, user: User, data: UploadSessionCreate) -> UploadSession:
+        """Start a session after validating the file like a direct upload would be"""
+        FileService._validate_file(data.size, data.filename)
+        UploadService.expire_sessions(db)
+
+        upload = UploadSession(
+            id=uuid.uuid4().hex,
+            user_id=user.id,
+            filename=data.filename,
+            mime_type=data.mime_type,
+            size=data.size,
+            received=0,
+            expected_sha256=data.sha256.lower() if data.sha256 else None,
+            status=UploadStatus.UPLOADING,
+        )
+        UploadService._touch(upload)
+
+        SESSION_DIR.mkdir(parents=True, exist_ok=True)
+        UploadService.part_path(upload).touch()
+        db.add(upload)
+        db.commit()
+        db.refresh(upload)
+        return upload
+
+    @staticmethod
+    def get_session(db: Session, upload_id: str, user: User) -> UploadSession:
+        """The user's live session, or 404 (other users' and expired sessions look missing)"""
+        upload = db.get(UploadSession, upload_id)
+        if upload is None or upload.user_id != user.id or upload.expires_at <= datetime.utcnow():
+            raise HTTPException(status_code=404, detail="Upload session not found or expired")
+        return upload
+
+    @staticmethod
+    def get_completed(db: Session, upload_id: str, user: User) -> UploadSession:
+        """A session ready to become a ProjectFile (project create/update)"""
+        upload = UploadService.get_session(db, upload_id, user)
+        if upload.status != UploadStatus.COMPLETE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Upload '{upload.filename}' is not complete ({upload.received} of {upload.size} bytes)"
+            )
+        return upload
+
+    @staticmethod
+    async def append_chunk(
+        db: Session,
+        upload: UploadSession,
+        offset: int,
+        body: AsyncIterator[bytes],
+        checksum: Optional[str] = None
+    ) -> UploadSession:
+        """
+        Write one chunk at `offset`, which must equal the bytes received so
+        far. The body is streamed to the part file, so memory stays bounded
+        whatever the chunk size. A failed or rejected chunk leaves the
+        session at its previous offset.
+
+        Args:
+            checksum: optional hex SHA-256 of the chunk sent by the client
+        """
+        if upload.status != UploadStatus.UPLOADING:
+            raise HTTPException(status_code=409, detail="Upload is already complete")
+        if offset != upload.received:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Chunk offset {offset} does not match the upload offset {upload.received}"
+            )
+
+        limit = min(MAX_CHUNK_SIZE, upload.size - upload.received)
+        digest = hashlib.sha256()
+        length = 0
+        path = UploadService.part_path(upload)
+        async with aiofiles.open(path, "r+b") as part:
+            try:
+                # Drop what an interrupted earlier attempt left past the offset
+                await part.truncate(offset)
+                await part.seek(offset)
+                async for data in body:
+                    length += len(data)
+                    if length > limit:
+                        raise HTTPException(
+                            status_code=413,
+                            detail=f"Chunk exceeds {limit} bytes (remaining size or UPLOAD_SESSION_MAX_CHUNK_MB)"
+                        )
+                    digest.update(data)
+                    await part.write(data)
+                if length == 0:
+                    raise HTTPException(status_code=400, detail="Empty chunk")
+                if checksum and checksum.lower() != digest.hexdigest():
+                    raise HTTPException(status_code=400, detail="Chunk checksum mismatch")
+            except BaseException:
+                await part.truncate(offset)
+                raise
+
+        # Compare-and-set: a concurrent request for the same offset loses here
+        now = datetime.utcnow()
+        won = db.query(UploadSession).filter(
+            UploadSession.id == upload.id, UploadSession.received == offset
+        ).update({
+            "received": offset + length,
+            "updated_at": now,
+            "expires_at": now + timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS),
+        }, synchronize_session=False)
+        if not won:
+            db.rollback()
+            raise HTTPException(status_code=409, detail="Chunk at this offset was stored by another request")
+        db.add(UploadChunk(session_id=upload.id, offset=offset, length=length, sha256=digest.hexdigest()))
+        db.commit()
+        db.refresh(upload)
+        return upload
+
+    @staticmethod
+    async def complete(db: Session, upload: UploadSession) -> UploadSession:
+        """
+        Verify every stored chunk and compute the file's SHA-256. A chunk
+        that no longer matches its checksum (disk error, overlapping
+        writers) is dropped with everything after it, and the client
+        resumes from its offset.
+        """
+        if upload.status == UploadStatus.COMPLETE:
+            return upload
+        if upload.received != upload.size:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Upload is incomplete: {upload.received} of {upload.size} bytes received"
+            )
+
+        digest = hashlib.sha256()
+        chunks: List[UploadChunk] = list(upload.chunks)
+        async with aiofiles.open(UploadService.part_path(upload), "rb") as part:
+            for index, chunk in enumerate(chunks):
+                chunk_digest = hashlib.sha256()
+                remaining = chunk.length
+                await part.seek(chunk.offset)
+                while remaining:
+                    data = await part.read(min(UPLOAD_CHUNK_SIZE, remaining))
+                    if not data:
+                        break
+                    remaining -= len(data)
+                    chunk_digest.update(data)
+                    digest.update(data)
+                if remaining or chunk_digest.hexdigest() != chunk.sha256:
+                    await UploadService._rewind(db, upload, chunks[index:])
+                    raise HTTPException(
+                        status_code=409,
+                        detail=f"Stored chunk at offset {chunk.offset} is corrupted; resume from that offset"
+                    )
+
+        sha256 = digest.hexdigest()
+        if upload.expected_sha256 and upload.expected_sha256 != sha256:
+            raise HTTPException(status_code=400, detail="File checksum does not match the declared sha256")
+
+        upload.sha256 = sha256
+        upload.status = UploadStatus.COMPLETE
+        UploadService._touch(upload)
+        db.commit()
+        db.refresh(upload)
+        return upload
+
+    @staticmethod
+    async def _rewind(db: Session, upload: UploadSession, bad: List[UploadChunk]) -> None:
+        """Forget `bad` chunks (the tail of the session) and truncate the part file to the first of them"""
+        offset = bad[0].offset
+        async with aiofiles.open(UploadService.part_path(upload), "r+b") as part:
+            await part.truncate(offset)
+        for chunk in bad:
+            upload.chunks.remove(chunk)
+        upload.received = offset
+        UploadService._touch(upload)
+        db.commit()
+
+    @staticmethod
+    def discard(db: Session, upload: UploadSession) -> None:
+        """Delete a session's rows (caller commits); its part file goes once that commit succeeds"""
+        StorageService.remove_after_commit(db, UploadService.part_path(upload))
+        db.query(UploadChunk).filter(UploadChunk.session_id == upload.id).delete(synchronize_session=False)
+        db.delete(upload)
+
+    @staticmethod
+    def expire_sessions(db: Session, now: Optional[datetime] = None) -> int:
+        """Delete expired sessions and their part files. Returns the number removed."""
+        now = now or datetime.utcnow()
+        expired = db.query(UploadSession).filter(UploadSession.expires_at <= now).all()
+        for upload in expired:
+            UploadService.discard(db, upload)
+        if expired:
+            db.commit()
+        return len(expired)
+
+    @staticmethod
+    def remove_orphaned_parts(db: Session) -> int:
+        """
+        Delete part files without a session (left by a crash between
+        writing and committing) once they are older than the session TTL.
+        Returns the number removed.
+        """
+        if not SESSION_DIR.exists():
+            return 0
+        cutoff = time.time() - settings.UPLOAD_SESSION_TTL_HOURS * 3600
+        live = {upload_id for (upload_id,) in db.query(UploadSession.id)}
+        removed = 0
+        for path in SESSION_DIR.glob("*.part"):
+            if path.stem not in live and path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
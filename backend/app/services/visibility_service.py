@@ -0,0 +1,162 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.user import User
+from app.models.project import Project, PrivacyLevel
+from app.models.access_request import AccessRequest, AccessRequestStatus
+from app.services.search_cache_service import SearchCacheService
+
+
+settings = get_settings()
+
+
+class VisibleIdSet:
+    """
+    Immutable set of project ids stored as a sorted int32 array (4 bytes per
+    id). Membership is a binary search; `set & VisibleIdSet` works like a
+    set intersection.
+    """
+
+    __slots__ = ("ids",)
+
+    def __init__(self, ids: Iterable[int]):
+        self.ids = np.unique(np.fromiter(ids, dtype=np.int32))
+
+    def __contains__(self, project_id) -> bool:
+        i = int(np.searchsorted(self.ids, project_id))
+        return i < self.ids.size and int(self.ids[i]) == project_id
+
+    def __len__(self) -> int:
+        return int(self.ids.size)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ids.tolist())
+
+    def __and__(self, other: Iterable[int]) -> Set[int]:
+        return {project_id for project_id in other if project_id in self}
+
+    __rand__ = __and__
+
+    def __repr__(self):
+        return f"<VisibleIdSet(size={self.ids.size})>"
+
+
+# user id -> (generation stamp, monotonic deadline, ids); least recently used first
+_cache: "OrderedDict[int, Tuple[Tuple[int, ...], float, VisibleIdSet]]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "builds": 0}
+
+# The memory cache backend keeps generation counters per process, so with
+# several workers a revoke or privacy change made in one would only reach the
+# others' cached sets at their TTL. Cache only when every worker sees the bump.
+_CACHE_ENABLED = settings.SEARCH_CACHE_BACKEND == "redis" or settings.WEB_CONCURRENCY <= 1
+
+
+# =====================================================
+# VISIBILITY SERVICE
+# =====================================================
+
+class VisibilityService:
+    """
+    Per-student sets of the non-public projects they may see (own, advisor,
+    class and granted projects), built lazily and cached per process.
+
+    Dosen and anonymous callers need no set: dosen see every project, and
+    anonymous callers only public ones. A cached set is stamped with the
+    search cache generation counters of the user's scope, which are bumped
+    when projects change visibility or the user's grants are approved or
+    revoked, and expires at the user's next grant expiry or after
+    VISIBILITY_CACHE_TTL_SECONDS, whichever comes first. With more than one
+    worker (WEB_CONCURRENCY) the counters must be the shared Redis ones;
+    otherwise sets are built per request.
+    """
+
+    @staticmethod
+    def visible_restricted_ids(db: Session, current_user: Optional[User]) -> Optional[VisibleIdSet]:
+        """
+        Non-public project ids the user may see: None means all (dosen),
+        an empty set means public only (anonymous).
+        """
+        if current_user is None:
+            return VisibleIdSet(())
+        if current_user.role == "dosen":
+            return None
+
+        visible = VisibilityService._cached(db, current_user)
+        if visible is None:
+            visible, _ = VisibilityService._build(db, current_user)
+        return visible
+
+    @staticmethod
+    def _cached(db: Session, user: User) -> Optional[VisibleIdSet]:
+        """The user's set from the cache, building it on a miss; None when there is no version stamp"""
+        if not _CACHE_ENABLED:
+            return None
+        stamp = SearchCacheService.generation_stamp(user)
+        if stamp is None:
+            return None
+        with _lock:
+            entry = _cache.get(user.id)
+            if entry is not None and entry[0] == stamp and entry[1] > time.monotonic():
+                _cache.move_to_end(user.id)
+                _stats["hits"] += 1
+                return entry[2]
+
+        visible, deadline = VisibilityService._build(db, user)
+        with _lock:
+            _cache[user.id] = (stamp, deadline, visible)
+            _cache.move_to_end(user.id)
+            while len(_cache) > settings.VISIBILITY_CACHE_MAX_USERS:
+                _cache.popitem(last=False)
+        return visible
+
+    @staticmethod
+    def _build(db: Session, user: User) -> Tuple[VisibleIdSet, float]:
+        """The user's set and the monotonic time it stops being valid"""
+        _stats["builds"] += 1
+        now = datetime.utcnow()
+        rows = db.query(Project.id).filter(
+            Project.privacy_level != PrivacyLevel.PUBLIC,
+            Project.access_filter(user.id, user.role)
+        )
+        visible = VisibleIdSet(project_id for (project_id,) in rows)
+
+        ttl = float(settings.VISIBILITY_CACHE_TTL_SECONDS)
+        next_expiry = db.query(func.min(AccessRequest.expires_at)).filter(
+            AccessRequest.requester_id == user.id,
+            AccessRequest.status == AccessRequestStatus.APPROVED,
+            AccessRequest.expires_at > now
+        ).scalar()
+        if next_expiry is not None:
+            ttl = min(ttl, (next_expiry - now).total_seconds())
+        return visible, time.monotonic() + ttl
+
+    @staticmethod
+    def access_filter(db: Session, current_user: Optional[User]):
+        """
+        Project.access_filter for a caller, answered from the cached set when
+        it is small enough to inline: `public OR id IN (...)` replaces the
+        owner / advisor / class / grant subqueries.
+        """
+        if current_user is None:
+            return Project.access_filter(None, None)
+        if current_user.role == "dosen":
+            return Project.access_filter(current_user.id, current_user.role)
+
+        visible = VisibilityService._cached(db, current_user)
+        if visible is None or len(visible) > settings.VISIBILITY_INLINE_LIMIT:
+            return Project.access_filter(current_user.id, current_user.role)
+        return or_(Project.privacy_level == PrivacyLevel.PUBLIC, Project.id.in_(visible.ids.tolist()))
+
+    @staticmethod
+    def stats() -> Dict:
+        """Cache counters of this process"""
+        return {**_stats, "users": len(_cache)}
@@ -0,0 +1,281 @@
+import re
+import uuid
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import AsyncIterator, List, Mapping, Optional, Tuple
+from urllib.parse import quote
+
+import aiofiles
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+
+# =====================================================
+# CONDITIONAL AND RANGE REQUESTS (RFC 9110)
+# =====================================================
+# Stored files never change in place (a replacement is a new ProjectFile),
+# so a file's content hash is a strong validator and its created_at is its
+# Last-Modified. Clients revalidate with If-None-Match / If-Modified-Since
+# (304) and fetch parts with Range (206), guarded by If-Range.
+
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# More ranges than this in one request are ignored and the whole file is sent
+MAX_RANGES = 16
+
+# Private: downloads are authorized per user. no-cache: revalidate every time
+CACHE_CONTROL = "private, no-cache"
+
+# Stored MIME types come from the uploading client, so only these are ever
+# displayed inline; anything else is an octet-stream attachment
+INLINE_MEDIA_TYPES = frozenset({"application/pdf"})
+
+# Sent with every file body: no type sniffing, and a sandboxed document if a
+# browser renders it anyway (no scripts, no same-origin access to the API)
+CONTENT_SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "Content-Security-Policy": "sandbox",
+}
+
+_RANGE_SPEC = re.compile(r"^(\d*)-(\d*)$")
+
+ByteRange = Tuple[int, int]  # inclusive (first byte, last byte)
+
+
+def file_etag(sha256: Optional[str], size: int, mtime: float) -> str:
+    """Strong ETag from the content hash; weak from size and mtime for files stored without one"""
+    if sha256:
+        return f'"{sha256}"'
+    return f'W/"{size:x}-{int(mtime):x}"'
+
+
+def http_date(value: datetime) -> str:
+    """IMF-fixdate of a naive UTC datetime"""
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _etag_list(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(headers: Mapping[str, str], etag: str, last_modified: datetime) -> bool:
+    """If-None-Match (weak comparison) or, without it, If-Modified-Since"""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = _etag_list(if_none_match)
+        return "*" in tags or _opaque(etag) in {_opaque(tag) for tag in tags}
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        since = _parse_http_date(if_modified_since)
+        return since is not None and last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def _if_range_matches(value: str, etag: str, last_modified: datetime) -> bool:
+    """If-Range needs a strong match: the same strong ETag or exactly the Last-Modified date"""
+    value = value.strip()
+    if value.startswith('"') or value.startswith("W/"):
+        return not etag.startswith("W/") and value == etag
+    since = _parse_http_date(value)
+    return since is not None and since == last_modified.replace(microsecond=0)
+
+
+def parse_range(header: str, size: int) -> Optional[List[ByteRange]]:
+    """
+    Byte ranges of a Range header, sorted with overlapping and adjacent
+    ranges merged.
+
+    Returns:
+        None when the header is malformed or not worth honouring (the
+        whole file is sent), an empty list when no range is satisfiable
+        (416).
+    """
+    unit, _, specs = header.partition("=")
+    if unit.strip().lower() != "bytes":
+        return None
+    parts = [spec.strip() for spec in specs.split(",") if spec.strip()]
+    if not parts or len(parts) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for spec in parts:
+        match = _RANGE_SPEC.match(spec)
+        if not match or match.group(0) == "-":
+            return None
+        first, last = match.groups()
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length and size:
+                ranges.append((max(size - length, 0), size - 1))
+            continue
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        if start < size:
+            ranges.append((start, min(int(last), size - 1) if last else size - 1))
+
+    merged: List[ByteRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def evaluate_request(
+    headers: Mapping[str, str],
+    size: int,
+    etag: str,
+    last_modified: datetime
+) -> Tuple[int, List[ByteRange]]:
+    """
+    Status a download request should get: 304, 416, 206 with its ranges,
+    or 200.
+    """
+    if is_not_modified(headers, etag, last_modified):
+        return 304, []
+
+    range_header = headers.get("range")
+    if range_header:
+        if_range = headers.get("if-range")
+        if if_range is None or _if_range_matches(if_range, etag, last_modified):
+            ranges = parse_range(range_header, size)
+            if ranges is not None:
+                return (206, ranges) if ranges else (416, [])
+    return 200, []
+
+
+def inline_media_type(mime_type: Optional[str]) -> Optional[str]:
+    """The type to display a file inline with, or None when it must be downloaded"""
+    media_type = (mime_type or "").split(";")[0].strip().lower()
+    return media_type if media_type in INLINE_MEDIA_TYPES else None
+
+
+def _content_disposition(filename: str, inline: bool = False) -> str:
+    disposition = "inline" if inline else "attachment"
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition}; filename*=utf-8''{quoted}"
+    return f'{disposition}; filename="{filename}"'
+
+
+async def _read_range(path: str, start: int, end: int) -> AsyncIterator[bytes]:
+    async with aiofiles.open(path, "rb") as f:
+        await f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = await f.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+
+async def _read_multipart(path: str, parts: List[Tuple[bytes, ByteRange]], closing: bytes) -> AsyncIterator[bytes]:
+    for part_header, (start, end) in parts:
+        yield part_header
+        async for data in _read_range(path, start, end):
+            yield data
+    yield closing
+
+
+def accel_redirect_response(
+    location: str,
+    saved_path: str,
+    filename: str,
+    media_type: str,
+    etag: str,
+    last_modified: datetime,
+    inline: bool = False
+) -> Response:
+    """
+    Empty response telling nginx to send the file itself from its internal
+    `location` (X-Accel-Redirect). Only for 200/206 outcomes of
+    `evaluate_request`: nginx applies the Range header, checking If-Range
+    against the ETag and Last-Modified set here.
+    """
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(last_modified),
+        "Cache-Control": CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+        **CONTENT_SECURITY_HEADERS,
+        "Content-Disposition": _content_disposition(filename, inline),
+        "X-Accel-Redirect": location.rstrip("/") + "/" + quote(saved_path),
+    }
+    return Response(media_type=media_type, headers=headers)
+
+
+def download_response(
+    status_code: int,
+    ranges: List[ByteRange],
+    path: str,
+    filename: str,
+    media_type: str,
+    size: int,
+    etag: str,
+    last_modified: datetime,
+    inline: bool = False
+) -> Response:
+    """Response for the outcome of `evaluate_request`; `inline` lets browsers display the file"""
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(last_modified),
+        "Cache-Control": CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+        **CONTENT_SECURITY_HEADERS,
+    }
+
+    if status_code == 304:
+        return Response(status_code=304, headers=headers)
+    if status_code == 416:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+    if status_code == 200:
+        return FileResponse(
+            path=path, filename=filename, media_type=media_type, headers=headers,
+            content_disposition_type="inline" if inline else "attachment"
+        )
+
+    headers["Content-Disposition"] = _content_disposition(filename, inline)
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(_read_range(path, start, end), status_code=206, media_type=media_type, headers=headers)
+
+    # multipart/byteranges: the length is known up front, so send it
+    boundary = uuid.uuid4().hex
+    parts = [
+        (
+            f"\r\n--{boundary}\r\nContent-Type: {media_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n".encode("ascii"),
+            (start, end)
+        )
+        for start, end in ranges
+    ]
+    closing = f"\r\n--{boundary}--\r\n".encode("ascii")
+    headers["Content-Length"] = str(
+        sum(len(part_header) + end - start + 1 for part_header, (start, end) in parts) + len(closing)
+    )
+    return StreamingResponse(
+        _read_multipart(path, parts, closing),
+        status_code=206,
+        media_type=f"multipart/byteranges; boundary={boundary}",
+        headers=headers
+    )
@@ -0,0 +1,99 @@
+import threading
+from typing import Callable, Generic, List, Optional, TypeVar
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+
+
+T = TypeVar("T")
+
+# Retry interval while the first build keeps failing (e.g. database not up yet)
+RETRY_SECONDS = 30
+
+
+# =====================================================
+# LIVE IN-MEMORY INDEX
+# =====================================================
+
+class LiveIndex(Generic[T]):
+    """
+    A process-wide in-memory index that requests read but never build.
+
+    A background thread builds it when the API starts and again every
+    `refresh_seconds`, which also picks up writes made by other worker
+    processes. Only one build runs at a time. Until the first build has
+    finished `current` is None and callers fall back to the database.
+
+    Writes go through `apply`. While a build is running they are also
+    queued, and replayed on the new index before it is swapped in, so a
+    write committed after the build read its rows is not lost.
+    """
+
+    def __init__(self, name: str, build: Callable[[Session], T], refresh_seconds: int):
+        self.name = name
+        self._build = build
+        self._refresh_seconds = refresh_seconds
+        # Guards the live index: hold it while reading from `current`
+        self.lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._index: Optional[T] = None
+        self._pending: Optional[List[Callable[[T], None]]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def current(self) -> Optional[T]:
+        """The live index, or None before the first build has finished"""
+        return self._index
+
+    def apply(self, update: Callable[[T], None]) -> None:
+        """Run `update` on the live index, and on the one being built if any"""
+        with self.lock:
+            if self._index is not None:
+                update(self._index)
+            if self._pending is not None:
+                self._pending.append(update)
+
+    def rebuild(self, db: Session) -> T:
+        """Build a new index from the database and swap it in (waits for a build already running)"""
+        with self._build_lock:
+            # Start queueing before the build reads anything
+            with self.lock:
+                self._pending = []
+            try:
+                index = self._build(db)
+            except BaseException:
+                with self.lock:
+                    self._pending = None
+                raise
+            with self.lock:
+                for update in self._pending:
+                    update(index)
+                self._pending = None
+                self._index = index
+            return index
+
+    def start(self) -> None:
+        """Start the background builder of this API process"""
+        with self.lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with SessionLocal() as db:
+                    self.rebuild(db)
+            except Exception as e:
+                print(f"Error building the {self.name}: {e}")
+            self._stop.wait(self._refresh_seconds if self._index is not None else RETRY_SECONDS)
@@ -0,0 +1,80 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+
+
+# =====================================================
+# KEYSET (CURSOR) PAGINATION
+# =====================================================
+# Cursors are opaque to clients: base64url(JSON {"c": created_at, "i": id}).
+# Pages are ordered by (created_at DESC, id DESC), so the next page is every
+# row strictly "below" the last row of the current one.
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Optional result totals: the count and whether it is exact, a lower bound
+# ("capped", i.e. N+) or the PostgreSQL planner's estimate
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_ACCURACY_HEADER = "X-Total-Count-Accuracy"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Encode the sort key of the last row on a page into an opaque cursor.
+
+    Args:
+        created_at: created_at of the last row
+        row_id: id of the last row
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    payload = json.dumps({"c": created_at.isoformat(), "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor string from a previous response
+
+    Returns:
+        tuple: (created_at, id)
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def apply_keyset(query, created_at_column, id_column, cursor: Optional[str]):
+    """
+    Order a query by (created_at DESC, id DESC) and, if a cursor is given,
+    keep only the rows after it. Matches the composite (created_at, id) indexes.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(created_at_column, id_column) < tuple_(created_at, row_id))
+    return query.order_by(created_at_column.desc(), id_column.desc())
+
+
+def next_cursor(rows, limit: int) -> Optional[str]:
+    """Cursor for the page after `rows`, or None when this was the last page"""
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last.created_at, last.id)
@@ -0,0 +1,118 @@
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+
+# =====================================================
+# STRUCTURED SEARCH QUERIES
+# =====================================================
+# The `q` parameter accepts free text plus qualified clauses:
+#
+#     deep learning author:"Budi Santoso" tag:NLP year:2022..2024
+#     course:CS101 "sistem informasi" -skripsi -tag:draft
+#
+# Unknown qualifiers (e.g. "http:") are kept as plain text.
+
+# Qualifier -> field it targets
+QUALIFIERS = {
+    "title": "title",
+    "author": "authors",
+    "authors": "authors",
+    "tag": "tags",
+    "tags": "tags",
+    "year": "year",
+    "course": "course_code",
+}
+
+# Fields matched through the full-text index rather than a column predicate
+TEXT_FIELDS = (None, "title", "authors")
+
+_CLAUSE_RE = re.compile(r'(-?)(?:(\w+):)?(?:"([^"]*)"?|(\S+))', re.UNICODE)
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+_YEAR_RE = re.compile(r"^(\d{4})?(\.\.)?(\d{4})?$")
+
+
+class QueryClause(NamedTuple):
+    """One clause of a search query"""
+    field: Optional[str]    # None for free text, otherwise a QUALIFIERS value
+    value: str              # raw value as typed (quotes removed)
+    terms: Tuple[str, ...]  # lowercase word tokens of the value
+    phrase: bool            # value was quoted
+    negated: bool           # clause started with '-'
+
+
+class ParsedQuery(NamedTuple):
+    clauses: Tuple[QueryClause, ...]
+
+    @property
+    def text_clauses(self) -> List[QueryClause]:
+        """Clauses answered by the full-text index"""
+        return [c for c in self.clauses if c.field in TEXT_FIELDS and c.terms]
+
+    @property
+    def filter_clauses(self) -> List[QueryClause]:
+        """Clauses answered by column predicates (tag, year, course)"""
+        return [c for c in self.clauses if c.field not in TEXT_FIELDS]
+
+    @property
+    def rank_terms(self) -> List[str]:
+        """Words that should drive relevance ranking"""
+        return [term for c in self.text_clauses if not c.negated for term in c.terms]
+
+
+def parse_search_query(text: Optional[str]) -> ParsedQuery:
+    """
+    Split a search string into clauses.
+
+    Args:
+        text: Raw `q` parameter
+
+    Returns:
+        ParsedQuery: clauses in the order they were typed
+    """
+    clauses = []
+    for match in _CLAUSE_RE.finditer(text or ""):
+        negated, qualifier, quoted, bare = match.groups()
+        phrase = quoted is not None
+        value = (quoted if phrase else bare) or ""
+
+        field = QUALIFIERS.get((qualifier or "").lower())
+        if qualifier and field is None:
+            # Not a known qualifier: keep "foo:bar" as text
+            value = f"{qualifier}:{value}"
+        if field in ("tags", "course_code", "year"):
+            value = value.strip()
+            if not value:
+                continue
+            clauses.append(QueryClause(field, value, (), phrase, bool(negated)))
+            continue
+
+        terms = tuple(_TERM_RE.findall(value.lower()))
+        if terms:
+            # A qualified value split by punctuation (author:Budi-Santoso) is still one name
+            phrase = phrase or (field is not None and len(terms) > 1)
+            clauses.append(QueryClause(field, value, terms, phrase, bool(negated)))
+
+    return ParsedQuery(tuple(clauses))
+
+
+def parse_year_range(value: str) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Parse `2022`, `2022..2024`, `2022..` or `..2024` into (low, high).
+
+    Raises:
+        HTTPException: 400 if the value is not a year or year range
+    """
+    match = _YEAR_RE.match(value)
+    if not match or not (match.group(1) or match.group(3)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid year filter: {value!r} (use 2024 or 2022..2024)"
+        )
+    low, dots, high = match.groups()
+    low = int(low) if low else None
+    high = int(high) if high else None
+    if not dots:
+        high = low
+    return low, high
@@ -0,0 +1,172 @@
+"""
+Benchmark: in-memory BM25F ranking index on a synthetic project corpus
+
+Generates projects with Zipf-distributed vocabulary (titles, tags, authors,
+abstracts) and reports, for the BM25Index used by RankingService:
+    - full build time and resident memory of the index
+    - incremental update latency (re-index one project)
+    - ranking latency per query over the projects matching every term
+For comparison the same corpus is loaded into an SQLite FTS5 table and ranked
+with bm25() ORDER BY ... LIMIT, which is what SEARCH_RANKING=database does.
+
+Usage:
+    python benchmarks/bench_bm25_ranking.py [--projects 100000] [--abstract-words 80]
+"""
+
+import argparse
+import bisect
+import gc
+import heapq
+import os
+import random
+import sqlite3
+import sys
+import time
+import resource
+from types import SimpleNamespace
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.services.ranking_service import BM25Index, _field_terms
+from app.services.search_index_service import FTS5_WEIGHTS
+
+
+QUERIES = ("sistem", "learning", "analisis data", "deteksi citra", "jaringan saraf tiruan", "w17")
+
+
+def make_vocabulary(size: int, rng: random.Random):
+    base = ["sistem", "data", "learning", "analisis", "jaringan", "model", "deteksi", "citra",
+            "informasi", "aplikasi", "mobile", "cloud", "keamanan", "teks", "saraf", "tiruan"]
+    words = base + [f"w{i}" for i in range(size - len(base))]
+    # Flattened Zipf: the most common word appears in a minority of abstracts
+    weights = [1.0 / (rank + 200) for rank in range(len(words))]
+    return words, weights
+
+
+def make_corpus(n_projects: int, abstract_words: int, seed: int = 42):
+    rng = random.Random(seed)
+    words, weights = make_vocabulary(20000, rng)
+    tags = words[:300]
+    for project_id in range(1, n_projects + 1):
+        yield SimpleNamespace(
+            id=project_id,
+            title=" ".join(rng.choices(words, weights, k=rng.randint(5, 10))),
+            tags=rng.sample(tags, rng.randint(2, 5)),
+            authors=[f"Author{rng.randint(1, 5000)} Nama{rng.randint(1, 200)}" for _ in range(rng.randint(1, 3))],
+            abstract=" ".join(rng.choices(words, weights, k=abstract_words)),
+        )
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def current_rss_mb():
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * resource.getpagesize() / 1024 / 1024
+
+
+def and_matches(index, terms):
+    """Projects containing every term (prefix matched) - what the SQL match hands the ranker"""
+    result = None
+    for term in terms:
+        ids = set()
+        lo = bisect.bisect_left(index.sorted_terms, term)
+        for expanded in index.sorted_terms[lo:]:
+            if not expanded.startswith(term):
+                break
+            if expanded in index.postings:
+                ids.update(index.postings[expanded][0])
+        result = ids if result is None else result & ids
+    return result or set()
+
+
+def bench_index(corpus, repeat):
+    gc.collect()
+    rss_before = current_rss_mb()
+    start = time.perf_counter()
+    index = BM25Index()
+    for project in corpus:
+        index.add(project.id, _field_terms(project))
+    index._sorted()
+    build_s = time.perf_counter() - start
+    gc.collect()
+    memory_mb = current_rss_mb() - rss_before
+
+    postings = sum(len(ids) for ids, _ in index.postings.values())
+    print(f"\nBM25Index: built {len(index)} projects in {build_s:.1f}s, "
+          f"{len(index.postings)} terms, {postings} postings, ~{memory_mb:.0f} MB resident")
+
+    # Incremental update: re-index existing projects with new text
+    samples = []
+    for project in corpus[:: max(1, len(corpus) // 200)]:
+        start = time.perf_counter()
+        index.add(project.id, _field_terms(project))
+        samples.append(time.perf_counter() - start)
+    print(f"incremental re-index: p50 {percentile(samples, .5) * 1000:.2f} ms, "
+          f"p95 {percentile(samples, .95) * 1000:.2f} ms")
+
+    print(f"\n{'query':<26}{'matches':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for query in QUERIES:
+        terms = query.split()
+        candidates = and_matches(index, terms)
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            scores = index.score(terms, candidates)
+            heapq.nlargest(20, scores.items(), key=lambda item: item[1])
+            samples.append(time.perf_counter() - start)
+        print(f"{query:<26}{len(candidates):>10}{percentile(samples, .5) * 1000:>10.2f}{percentile(samples, .95) * 1000:>10.2f}")
+
+
+def bench_fts5(corpus, repeat):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE VIRTUAL TABLE projects_fts USING fts5(title, tags, authors, abstract)")
+    start = time.perf_counter()
+    conn.executemany(
+        "INSERT INTO projects_fts (rowid, title, tags, authors, abstract) VALUES (?, ?, ?, ?, ?)",
+        ((p.id, p.title, " ".join(p.tags), " ".join(p.authors), p.abstract) for p in corpus)
+    )
+    conn.commit()
+    print(f"\nSQLite FTS5: built in {time.perf_counter() - start:.1f}s")
+
+    weights = ", ".join(str(w) for w in FTS5_WEIGHTS)
+    print(f"{'query':<26}{'matches':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for query in QUERIES:
+        match = " AND ".join(f'"{term}"*' for term in query.split())
+        matches = conn.execute("SELECT count(*) FROM projects_fts WHERE projects_fts MATCH ?", (match,)).fetchone()[0]
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(
+                f"SELECT rowid FROM projects_fts WHERE projects_fts MATCH ? "
+                f"ORDER BY bm25(projects_fts, {weights}) LIMIT 20", (match,)
+            ).fetchall()
+            samples.append(time.perf_counter() - start)
+        print(f"{query:<26}{matches:>10}{percentile(samples, .5) * 1000:>10.2f}{percentile(samples, .95) * 1000:>10.2f}")
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=100000)
+    parser.add_argument("--abstract-words", type=int, default=80)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--skip-fts5", action="store_true")
+    args = parser.parse_args()
+
+    print(f"Generating {args.projects} synthetic projects...")
+    corpus = list(make_corpus(args.projects, args.abstract_words))
+
+    bench_index(corpus, args.repeat)
+    if not args.skip_fts5:
+        bench_fts5(corpus, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark: memory of /search/export on growing result sets
+
+Seeds a throwaway SQLite database with synthetic projects and, for each
+export size, consumes SearchService.stream_export (CSV and NDJSON) the way
+StreamingResponse does. Reports wall time, bytes produced and the Python
+heap peak (tracemalloc) while exporting. For comparison the same rows are
+loaded at once with .all(), as paging through everything in one query would.
+
+Usage:
+    python benchmarks/bench_export.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+WORK_DIR = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'bench.db')}"
+os.environ["UPLOAD_DIR"] = os.path.join(WORK_DIR, "uploads")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import select
+
+from app.database import Base, engine, SessionLocal
+from app.models import User, Project, PrivacyLevel, ProjectStatus
+from app.schemas.project import ProjectSearch
+from app.services.search_service import SearchService
+
+
+WORDS = ("data", "learning", "sistem", "analisis", "jaringan", "model", "deteksi",
+         "informasi", "aplikasi", "mobile", "cloud", "keamanan", "citra", "teks")
+
+
+def seed(n_projects: int) -> None:
+    """Bulk-insert projects; the year column is the export size bucket"""
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    rng = random.Random(42)
+    users = [
+        User(email=f"user{i}@example.com", hashed_password="x", full_name=f"User {i}",
+             role="student", student_id=f"S{i}")
+        for i in range(100)
+    ]
+    db.add_all(users)
+    db.commit()
+    user_ids = [u.id for u in users]
+
+    start = datetime(2020, 1, 1)
+    batch = []
+    for i in range(n_projects):
+        batch.append({
+            "title": " ".join(rng.choice(WORDS) for _ in range(8)),
+            "abstract": " ".join(rng.choice(WORDS) for _ in range(50)),
+            "authors": [f"Author {rng.randint(1, 500)}" for _ in range(3)],
+            "tags": rng.sample(WORDS, 4),
+            "year": 2020,
+            "semester": "Ganjil",
+            "course_code": f"CS{rng.randint(100, 199)}",
+            "status": ProjectStatus.COMPLETED,
+            "privacy_level": PrivacyLevel.PUBLIC,
+            "uploaded_by": rng.choice(user_ids),
+            "view_count": 0,
+            "download_count": 0,
+            "created_at": start + timedelta(minutes=i),
+            "updated_at": start + timedelta(minutes=i),
+        })
+        if len(batch) == 5000:
+            db.execute(Project.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.execute(Project.__table__.insert(), batch)
+    db.commit()
+    db.close()
+
+
+def limit_to(n: int) -> None:
+    """Make exactly the newest n projects match year=2021"""
+    with SessionLocal() as db:
+        db.query(Project).update({"year": 2020}, synchronize_session=False)
+        newest = select(Project.id).order_by(Project.created_at.desc()).limit(n)
+        db.query(Project).filter(Project.id.in_(newest)).update({"year": 2021}, synchronize_session=False)
+        db.commit()
+
+
+def measure(run):
+    tracemalloc.start()
+    start = time.perf_counter()
+    produced = run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, produced, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"Seeding {max(args.sizes)} projects...")
+    seed(max(args.sizes))
+    params = ProjectSearch(year=2021)
+
+    print(f"\n{'rows':>8}{'path':>14}{'s':>8}{'MB out':>10}{'peak MB':>10}")
+    for size in args.sizes:
+        limit_to(size)
+        for fmt in ("csv", "ndjson"):
+            elapsed, produced, peak = measure(
+                lambda: sum(len(chunk) for chunk in SearchService.stream_export(params, None, fmt))
+            )
+            print(f"{size:>8}{'stream ' + fmt:>14}{elapsed:>8.2f}{produced / 1024 / 1024:>10.1f}{peak:>10.1f}")
+
+        def load_all():
+            with SessionLocal() as db:
+                query, _ = SearchService.filtered_query(db, params, None)
+                return len(SearchService.project_summary_rows(query).all())
+
+        elapsed, _, peak = measure(load_all)
+        print(f"{size:>8}{'.all()':>14}{elapsed:>8.2f}{'':>10}{peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
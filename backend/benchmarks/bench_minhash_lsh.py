@@ -0,0 +1,145 @@
+"""
+Benchmark: MinHash/LSH near-duplicate lookup on a synthetic project corpus
+
+Generates abstracts with the corpus generator of bench_bm25_ranking.py and
+plants near-duplicates (a copy with a share of its words replaced). Reports,
+for DuplicateService's signatures and band buckets:
+    - signing throughput and stored bytes per project
+    - per-upload lookup latency through an indexed (band, bucket) table in
+      SQLite, the same query shape DuplicateService.find_similar runs
+    - recall of the planted duplicates and candidates checked per lookup
+For comparison, the same uploads are checked by brute force: the signature
+against every stored signature, and exact shingle-set Jaccard against every
+project (timed on a sample and extrapolated).
+
+Usage:
+    python benchmarks/bench_minhash_lsh.py [--projects 100000] [--duplicates 500]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.services.duplicate_service import NUM_PERM, _shingle_hashes, band_buckets, minhash
+from bench_bm25_ranking import make_corpus, percentile
+
+
+THRESHOLD = 0.8
+
+
+def mutate(text: str, share: float, rng: random.Random) -> str:
+    """Replace `share` of the words, as a lightly edited resubmission would"""
+    words = text.split()
+    for i in rng.sample(range(len(words)), int(len(words) * share)):
+        words[i] = f"edit{rng.randint(0, 10 ** 6)}"
+    return " ".join(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=100000)
+    parser.add_argument("--abstract-words", type=int, default=150)
+    parser.add_argument("--duplicates", type=int, default=500)
+    parser.add_argument("--edit-share", type=float, default=0.03)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    print(f"Generating {args.projects} synthetic abstracts...")
+    texts = [p.abstract for p in make_corpus(args.projects, args.abstract_words)]
+    originals = rng.sample(range(len(texts)), args.duplicates)
+    uploads = [mutate(texts[i], args.edit_share, rng) for i in originals]
+
+    start = time.perf_counter()
+    hashes = [_shingle_hashes(text) for text in texts]
+    signatures = np.stack([minhash(h) for h in hashes])
+    sign_s = time.perf_counter() - start
+    print(f"\nsigned {len(texts)} projects in {sign_s:.1f}s ({sign_s / len(texts) * 1000:.2f} ms each), "
+          f"{signatures.itemsize * NUM_PERM} bytes per signature")
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE project_signatures (project_id INTEGER PRIMARY KEY, signature BLOB NOT NULL)")
+    conn.execute(
+        "CREATE TABLE project_lsh_buckets (band SMALLINT, bucket BIGINT, project_id INTEGER, "
+        "PRIMARY KEY (band, bucket, project_id))"
+    )
+    conn.executemany(
+        "INSERT INTO project_signatures VALUES (?, ?)",
+        ((i, signature.astype("<u4").tobytes()) for i, signature in enumerate(signatures))
+    )
+    conn.executemany(
+        "INSERT INTO project_lsh_buckets VALUES (?, ?, ?)",
+        ((band, bucket, i) for i, signature in enumerate(signatures) for band, bucket in enumerate(band_buckets(signature)))
+    )
+    conn.commit()
+
+    upload_hashes = [_shingle_hashes(text) for text in uploads]
+    upload_signatures = [minhash(h) for h in upload_hashes]
+
+    # LSH lookup: candidates from the bucket index, then signature comparison
+    lsh_samples, candidate_counts, candidates_found, found = [], [], 0, 0
+    for original, signature in zip(originals, upload_signatures):
+        start = time.perf_counter()
+        keys = band_buckets(signature)
+        where = " OR ".join("(band = ? AND bucket = ?)" for _ in keys)
+        rows = conn.execute(
+            f"SELECT project_id, signature FROM project_signatures WHERE project_id IN "
+            f"(SELECT project_id FROM project_lsh_buckets WHERE {where})",
+            [value for pair in enumerate(keys) for value in pair]
+        ).fetchall()
+        matches = set()
+        if rows:
+            matrix = np.frombuffer(b"".join(r[1] for r in rows), dtype="<u4").reshape(-1, NUM_PERM)
+            similarity = (matrix == signature).mean(axis=1)
+            matches = {rows[i][0] for i in np.flatnonzero(similarity >= THRESHOLD)}
+        lsh_samples.append(time.perf_counter() - start)
+        candidate_counts.append(len(rows))
+        candidates_found += any(r[0] == original for r in rows)
+        found += original in matches
+
+    exact = [
+        len(np.intersect1d(upload, hashes[original])) / len(np.union1d(upload, hashes[original]))
+        for original, upload in zip(originals, upload_hashes)
+    ]
+    above = sum(j >= THRESHOLD for j in exact)
+    print(f"planted duplicates: {args.duplicates}, exact Jaccard p50 {percentile(exact, .5):.2f}, "
+          f"{above} at or above {THRESHOLD}")
+
+    # Brute force over signatures: one vectorized comparison against all rows
+    brute_samples = []
+    for signature in upload_signatures[:100]:
+        start = time.perf_counter()
+        np.flatnonzero((signatures == signature).mean(axis=1) >= THRESHOLD)
+        brute_samples.append(time.perf_counter() - start)
+
+    # Pairwise exact Jaccard on shingle sets, timed on a sample of projects
+    sample = [set(h.tolist()) for h in hashes[:2000]]
+    upload_set = set(upload_hashes[0].tolist())
+    start = time.perf_counter()
+    for other in sample:
+        len(upload_set & other) / len(upload_set | other)
+    pairwise_ms = (time.perf_counter() - start) / len(sample) * len(texts) * 1000
+
+    print(f"\n{'lookup per upload':<36}{'p50 ms':>10}{'p95 ms':>10}")
+    print(f"{'LSH buckets (indexed)':<36}{percentile(lsh_samples, .5) * 1000:>10.2f}{percentile(lsh_samples, .95) * 1000:>10.2f}")
+    print(f"{'brute force signatures (numpy)':<36}{percentile(brute_samples, .5) * 1000:>10.2f}{percentile(brute_samples, .95) * 1000:>10.2f}")
+    print(f"{'pairwise exact Jaccard (estimated)':<36}{pairwise_ms:>10.0f}")
+    print(f"\noriginal among LSH candidates: {candidates_found}/{args.duplicates}, "
+          f"flagged at estimated similarity >= {THRESHOLD}: {found}/{args.duplicates}")
+    print(f"candidates per lookup: "
+          f"p50 {percentile(candidate_counts, .5)}, p95 {percentile(candidate_counts, .95)}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
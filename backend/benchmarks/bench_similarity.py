@@ -0,0 +1,83 @@
+"""
+Benchmark: TF-IDF "more like this" index on a synthetic project corpus
+
+Uses the corpus generator of bench_bm25_ranking.py and reports, for the
+TfidfIndex used by SimilarityService:
+    - full build time and resident memory of the index
+    - incremental add latency and compaction time of the delta segment
+    - top-10 query latency for random projects, with the delta segment
+      empty and full, and with a restricted-visibility filter
+
+Usage:
+    python benchmarks/bench_similarity.py [--projects 100000] [--abstract-words 80]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.services.similarity_service import DELTA_LIMIT, TfidfIndex, _term_weights
+from bench_bm25_ranking import current_rss_mb, make_corpus, percentile
+
+
+def bench_queries(index, label, project_ids, repeat, visible=None):
+    samples = []
+    for project_id in project_ids[:repeat]:
+        start = time.perf_counter()
+        index.most_similar(project_id, 10, visible)
+        samples.append(time.perf_counter() - start)
+    print(f"{label:<34}{percentile(samples, .5) * 1000:>10.2f}{percentile(samples, .95) * 1000:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=100000)
+    parser.add_argument("--abstract-words", type=int, default=80)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"Generating {args.projects} synthetic projects...")
+    corpus = list(make_corpus(args.projects, args.abstract_words))
+    rng = random.Random(7)
+
+    gc.collect()
+    rss_before = current_rss_mb()
+    start = time.perf_counter()
+    index = TfidfIndex.build((p.id, _term_weights(p), p.id % 4 != 0) for p in corpus)
+    build_s = time.perf_counter() - start
+    gc.collect()
+    print(f"\nTfidfIndex: built {len(index)} projects in {build_s:.1f}s, {len(index.term_ids)} terms, "
+          f"{index.row_terms.size} non-zeros, ~{current_rss_mb() - rss_before:.0f} MB resident")
+
+    sample_ids = [p.id for p in rng.sample(corpus, min(args.repeat, len(corpus)))]
+    restricted = {p.id for p in rng.sample(corpus, min(200, len(corpus))) if p.id % 4 == 0}
+
+    print(f"\n{'top-10 query':<34}{'p50 ms':>10}{'p95 ms':>10}")
+    bench_queries(index, "compacted", sample_ids, args.repeat)
+    bench_queries(index, "compacted, student visibility", sample_ids, args.repeat, restricted)
+
+    # Re-index projects until the delta segment is just below its limit
+    samples = []
+    for project in rng.sample(corpus, min(DELTA_LIMIT, len(corpus))):
+        start = time.perf_counter()
+        index.add(project.id, _term_weights(project), project.id % 4 != 0)
+        samples.append(time.perf_counter() - start)
+    bench_queries(index, f"with {len(index.delta)} projects in delta", sample_ids, args.repeat)
+    print(f"\nincremental add: p50 {percentile(samples, .5) * 1000:.2f} ms, p95 {percentile(samples, .95) * 1000:.2f} ms")
+
+    start = time.perf_counter()
+    index.compact()
+    print(f"compaction: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
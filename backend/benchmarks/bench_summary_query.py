@@ -0,0 +1,161 @@
+"""
+Benchmark: ORM entity path vs column-projected summary path for search pages
+
+Seeds a throwaway SQLite database with synthetic projects (long abstracts,
+several files each) and compares, per page of results:
+    - rows returned by the database cursor
+    - approximate bytes transferred (sum of value sizes)
+    - wall time to build the List[ProjectSummary]
+
+Usage:
+    python benchmarks/bench_summary_query.py [--projects 5000] [--files 3] [--limit 100]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+WORK_DIR = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'bench.db')}"
+os.environ["UPLOAD_DIR"] = os.path.join(WORK_DIR, "uploads")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.database import Base, engine, SessionLocal
+from app.models import User, Project, ProjectFile, FileType, PrivacyLevel, ProjectStatus
+from app.schemas.project import ProjectSearch, ProjectSummary
+from app.services.search_service import SearchService
+
+
+WORDS = ("data", "learning", "sistem", "analisis", "jaringan", "model", "deteksi",
+         "informasi", "aplikasi", "mobile", "cloud", "keamanan", "citra", "teks")
+
+
+def seed(n_projects: int, n_files: int) -> None:
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    rng = random.Random(42)
+    users = [
+        User(email=f"user{i}@example.com", hashed_password="x", full_name=f"User {i}",
+             role="dosen" if i % 10 == 0 else "student", student_id=None if i % 10 == 0 else f"S{i}")
+        for i in range(200)
+    ]
+    db.add_all(users)
+    db.flush()
+
+    start = datetime(2020, 1, 1)
+    for i in range(n_projects):
+        abstract = " ".join(rng.choice(WORDS) for _ in range(400))
+        project = Project(
+            title=" ".join(rng.choice(WORDS) for _ in range(6)),
+            abstract=abstract,
+            abstract_preview=abstract[:300],
+            authors=[f"Author {rng.randint(1, 500)}" for _ in range(3)],
+            tags=rng.sample(WORDS, 4),
+            year=2020 + i % 5,
+            semester="Ganjil",
+            status=ProjectStatus.COMPLETED,
+            privacy_level=PrivacyLevel.PUBLIC,
+            uploaded_by=users[rng.randrange(1, 200)].id,
+            advisor_id=users[0].id,
+            created_at=start + timedelta(minutes=i),
+            updated_at=start + timedelta(minutes=i),
+        )
+        project.files = [
+            ProjectFile(original_filename=f"file{j}.pdf", saved_path=f"bench/{i}/{j}.pdf",
+                        file_type=FileType.MAIN_REPORT if j == 0 else FileType.SUPPLEMENTARY,
+                        mime_type="application/pdf", file_size=1024 * 1024)
+            for j in range(n_files)
+        ]
+        db.add(project)
+        if i % 1000 == 999:
+            db.commit()
+    db.commit()
+    db.close()
+
+
+def measure_statement(db, statement):
+    """Rows and approximate bytes the database hands back for a statement"""
+    rows = db.connection().execute(statement).all()
+    size = sum(len(str(value).encode("utf-8")) for row in rows for value in row if value is not None)
+    return len(rows), size
+
+
+def orm_summaries(db, projects):
+    """ProjectSummary from ORM entities, names resolved in one IN (...) query"""
+    user_ids = {p.uploaded_by for p in projects} | {p.advisor_id for p in projects}
+    names = dict(db.query(User.id, User.full_name).filter(User.id.in_(user_ids - {None})).all())
+    return [
+        ProjectSummary(
+            id=p.id, title=p.title, abstract_preview=p.abstract_preview,
+            authors=p.authors or [], tags=p.tags or [], year=p.year, semester=p.semester,
+            status=p.status, privacy_level=p.privacy_level, uploaded_by=p.uploaded_by,
+            advisor_id=p.advisor_id, view_count=p.view_count, created_at=p.created_at,
+            uploader_name=names.get(p.uploaded_by), advisor_name=names.get(p.advisor_id)
+        )
+        for p in projects
+    ]
+
+
+def orm_path(db, limit):
+    """The previous path: ORM entities (joined files) + per-page name lookup"""
+    query = db.query(Project).filter(Project.privacy_level == PrivacyLevel.PUBLIC)
+    query = query.order_by(Project.created_at.desc(), Project.id.desc()).limit(limit)
+    return query, lambda: orm_summaries(db, query.all())
+
+
+def projected_path(db, limit):
+    """The column-projected path used by SearchService"""
+    params = ProjectSearch(sort="newest", limit=limit)
+    query, _ = SearchService.filtered_query(db, params, None)
+    query = SearchService.project_summary_rows(query)
+    query = query.order_by(Project.created_at.desc(), Project.id.desc()).limit(limit)
+    return query, lambda: [SearchService.summary_from_row(row) for row in query.all()]
+
+
+def time_it(build, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=5000)
+    parser.add_argument("--files", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Seeding {args.projects} projects with {args.files} files each...")
+    seed(args.projects, args.files)
+
+    db = SessionLocal()
+    results = {}
+    for name, path in (("orm", orm_path), ("projected", projected_path)):
+        query, build = path(db, args.limit)
+        rows, size = measure_statement(db, query.statement)
+        db.expunge_all()
+        results[name] = (rows, size, time_it(build, args.repeat))
+    db.close()
+
+    print(f"\nPer page of {args.limit} results:")
+    print(f"{'path':<12}{'rows':>8}{'bytes':>12}{'ms':>10}")
+    for name, (rows, size, ms) in results.items():
+        print(f"{name:<12}{rows:>8}{size:>12}{ms:>10.2f}")
+
+    orm, proj = results["orm"], results["projected"]
+    print(f"\nSaved: {orm[0] - proj[0]} rows, {orm[1] - proj[1]} bytes, {orm[2] - proj[2]:.2f} ms per page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: memory of saving uploads of growing size
+
+Writes random files of each size to a temporary file and saves them through
+FileService.create_project_file_record, the way the upload endpoints do.
+Reports wall time and the Python heap peak (tracemalloc) while saving. For
+comparison the same file is read at once with UploadFile.read(), as the
+service did before uploads were streamed.
+
+Usage:
+    python benchmarks/bench_upload.py [--sizes 10 50 200]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+WORK_DIR = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'bench.db')}"
+os.environ["UPLOAD_DIR"] = os.path.join(WORK_DIR, "uploads")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from starlette.datastructures import UploadFile
+
+from app.database import Base, engine, SessionLocal
+from app.models import FileType
+from app.services.file_service import FileService
+
+
+def make_source(size_mb: int) -> str:
+    path = os.path.join(WORK_DIR, f"source-{size_mb}.zip")
+    with open(path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(os.urandom(1024 * 1024))
+    return path
+
+
+def measure(run):
+    tracemalloc.start()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200], help="File sizes in MB")
+    args = parser.parse_args()
+    Base.metadata.create_all(engine)
+
+    print(f"\n{'MB':>6}{'path':>10}{'s':>8}{'peak MB':>10}")
+    for size in args.sizes:
+        source = make_source(size)
+
+        def save():
+            with open(source, "rb") as f, SessionLocal() as db:
+                upload = UploadFile(f, filename="dataset.zip")
+                # project_id is never flushed: only the file is written
+                asyncio.run(FileService.create_project_file_record(db, 1, upload, FileType.SUPPLEMENTARY))
+
+        def read_all():
+            with open(source, "rb") as f:
+                return len(asyncio.run(UploadFile(f, filename="dataset.zip").read()))
+
+        elapsed, peak = measure(save)
+        print(f"{size:>6}{'stream':>10}{elapsed:>8.2f}{peak:>10.1f}")
+        elapsed, peak = measure(read_all)
+        print(f"{size:>6}{'read()':>10}{elapsed:>8.2f}{peak:>10.1f}")
+        os.unlink(source)
+
+
+if __name__ == "__main__":
+    main()
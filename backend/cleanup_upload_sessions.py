@@ -0,0 +1,25 @@
+import os
+import sys
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from app.database import SessionLocal
+from app.services.upload_service import UploadService
+
+def cleanup_upload_sessions():
+    """Deletes expired resumable upload sessions and orphaned part files."""
+    db = SessionLocal()
+    try:
+        expired = UploadService.expire_sessions(db)
+        orphaned = UploadService.remove_orphaned_parts(db)
+        print(f"✅ Removed {expired} expired upload sessions and {orphaned} orphaned part files.")
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error cleaning up upload sessions: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    cleanup_upload_sessions()
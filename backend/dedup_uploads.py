@@ -0,0 +1,35 @@
+import os
+import sys
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from app.database import SessionLocal
+from app.services.storage_service import StorageService
+
+def dedup_uploads():
+    """Moves files stored per user into the content-addressed blob store and removes unused blobs."""
+    db = SessionLocal()
+    try:
+        print("Deduplicating stored files...")
+        result = StorageService.deduplicate_existing(db)
+        print(f"Moved {result['moved']} files into the blob store, freed {result['bytes_freed'] / 1024 / 1024:.1f} MB.")
+        if result["missing"]:
+            print(f"⚠️  {result['missing']} files are missing on disk and were left as they are.")
+
+        blobs, stray = StorageService.collect_garbage(db)
+        stats = StorageService.stats(db)
+        print(
+            f"✅ {stats['blobs']} blobs, {stats['stored_bytes'] / 1024 / 1024:.1f} MB stored, "
+            f"{stats['saved_bytes'] / 1024 / 1024:.1f} MB saved by deduplication "
+            f"({blobs} unused blobs and {stray} stray files removed)."
+        )
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error deduplicating files: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    dedup_uploads()
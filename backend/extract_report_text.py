@@ -0,0 +1,30 @@
+import os
+import sys
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from app.database import SessionLocal
+from app.services.extraction_service import ExtractionService
+
+def extract_report_text():
+    """Queues main report PDFs that were never extracted and extracts every due file."""
+    db = SessionLocal()
+    try:
+        queued = ExtractionService.enqueue_unprocessed(db)
+        db.commit()
+        print(f"Queued {queued} reports for text extraction.")
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error queueing reports: {e}")
+        return
+    finally:
+        db.close()
+
+    print("Extracting report text...")
+    done, failed = ExtractionService.run_pending()
+    print(f"✅ Extracted {done} reports ({failed} failed, retried later).")
+
+if __name__ == "__main__":
+    extract_report_text()
@@ -0,0 +1,26 @@
+import os
+import sys
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from app.database import SessionLocal
+from app.services.duplicate_service import DuplicateService
+
+def rebuild_duplicate_signatures():
+    """Computes the MinHash signature and LSH buckets of every project."""
+    db = SessionLocal()
+    try:
+        print("Signing projects for duplicate detection...")
+        count = DuplicateService.rebuild(db)
+        db.commit()
+        print(f"✅ Signed {count} projects.")
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error signing projects: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_duplicate_signatures()
@@ -0,0 +1,26 @@
+import os
+import sys
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from app.database import SessionLocal
+from app.services.search_index_service import SearchIndexService
+
+def rebuild_search_index():
+    """Rebuilds the full-text search index for every project."""
+    db = SessionLocal()
+    try:
+        print("Rebuilding project search index...")
+        count = SearchIndexService.rebuild(db)
+        db.commit()
+        print(f"✅ Indexed {count} projects.")
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error rebuilding search index: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_search_index()
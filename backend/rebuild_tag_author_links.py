@@ -0,0 +1,26 @@
+import os
+import sys
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from app.database import SessionLocal
+from app.services.taxonomy_service import TaxonomyService
+
+def rebuild_tag_author_links():
+    """Re-syncs the tags/authors lookup tables with every project's arrays."""
+    db = SessionLocal()
+    try:
+        print("Syncing project tags and authors...")
+        count = TaxonomyService.rebuild(db)
+        db.commit()
+        print(f"✅ Synced {count} projects.")
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error syncing tags and authors: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_tag_author_links()
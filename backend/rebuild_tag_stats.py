@@ -0,0 +1,26 @@
+import os
+import sys
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from app.database import SessionLocal
+from app.services.tag_stats_service import TagStatsService
+
+def rebuild_tag_stats():
+    """Recomputes the tag_stats read model from the project_tags links."""
+    db = SessionLocal()
+    try:
+        print("Rebuilding tag statistics...")
+        count = TagStatsService.rebuild(db)
+        db.commit()
+        print(f"✅ Wrote {count} tag_stats rows.")
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error rebuilding tag statistics: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_tag_stats()
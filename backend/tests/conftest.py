@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+
+def pytest_configure(config):
+    # Settings require these; tests never read them from a real .env, and the
+    # fixtures below bind their own engine rather than DATABASE_URL's
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("SECRET_KEY", "test-secret")
+
+
+# =====================================================
+# DATABASE
+# =====================================================
+# Each test module gets its own SQLite file under pytest's tmp dir, never the
+# DATABASE_URL engine from app.database (which may already be bound to the
+# development database by the time tests are collected).
+
+@pytest.fixture(scope="module")
+def db_engine(tmp_path_factory):
+    from app.database import Base
+    import app.models  # noqa: F401  (register every table on Base.metadata)
+
+    path = tmp_path_factory.mktemp("db") / "test.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def db_session_factory(db_engine):
+    from app.database import get_db
+    from app.main import app
+
+    TestingSessionLocal = sessionmaker(bind=db_engine, autoflush=False, autocommit=False)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestingSessionLocal
+    app.dependency_overrides.pop(get_db, None)
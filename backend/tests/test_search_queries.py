@@ -0,0 +1,102 @@
+"""
+A search page must cost the same number of SQL statements whatever its size:
+uploader and advisor names come from the page query itself, not from one
+lookup per result row.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.models import User, Project, ProjectFile, FileType, PrivacyLevel, ProjectStatus
+from app.schemas.project import ProjectSearch
+from app.services.ranking_service import RankingService
+from app.services.search_index_service import SearchIndexService
+from app.services.search_service import SearchService
+
+N_PROJECTS = 120
+
+
+@pytest.fixture(scope="module")
+def db(db_engine, db_session_factory):
+    session = db_session_factory()
+
+    # Every project gets its own uploader and advisor, so a per-row lookup
+    # would show up as extra statements on larger pages
+    students = [
+        User(email=f"student{i}@example.com", hashed_password="x", full_name=f"Student {i}",
+             role="student", student_id=f"S{i}")
+        for i in range(N_PROJECTS)
+    ]
+    advisors = [
+        User(email=f"dosen{i}@example.com", hashed_password="x", full_name=f"Dosen {i}",
+             role="dosen")
+        for i in range(N_PROJECTS)
+    ]
+    session.add_all(students + advisors)
+    session.flush()
+
+    start = datetime(2024, 1, 1)
+    for i in range(N_PROJECTS):
+        project = Project(
+            title=f"Sistem informasi {i}",
+            abstract="Analisis sistem informasi kampus",
+            abstract_preview="Analisis sistem informasi kampus",
+            authors=[f"Student {i}"],
+            tags=["sistem"],
+            year=2024,
+            privacy_level=PrivacyLevel.PUBLIC,
+            status=ProjectStatus.COMPLETED,
+            uploaded_by=students[i].id,
+            advisor_id=advisors[i].id,
+            created_at=start + timedelta(minutes=i),
+        )
+        session.add(project)
+        session.flush()
+        SearchIndexService.index_project(session, project)
+        session.add(ProjectFile(
+            project_id=project.id,
+            original_filename=f"report{i}.pdf",
+            saved_path=f"test/{i}.pdf",
+            file_type=FileType.MAIN_REPORT,
+            mime_type="application/pdf",
+            file_size=1024,
+        ))
+    session.commit()
+
+    # Load the BM25F index up front so building it is not counted
+    RankingService.rebuild(session)
+
+    yield session
+
+    session.close()
+
+
+def count_statements(db, params: ProjectSearch):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    db.expire_all()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        results, _ = SearchService.search(db, params)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert len(results) == params.limit
+    assert len({r.uploader_name for r in results}) == params.limit
+    assert len({r.advisor_name for r in results}) == params.limit
+    return len(statements)
+
+
+@pytest.mark.parametrize("search", [
+    {"sort": "newest"},
+    {"query": "sistem informasi"},
+])
+def test_statement_count_does_not_grow_with_page_size(db, search):
+    counts = [count_statements(db, ProjectSearch(limit=limit, **search)) for limit in (5, 50, 100)]
+    assert counts[0] == counts[1] == counts[2], counts
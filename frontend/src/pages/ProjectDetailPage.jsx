@@ -54,19 +54,14 @@ const ProjectDetailPage = () => {
   const handleDownloadFile = async (file, e) => {
     e.preventDefault();
     try {
-      const response = await api.get(`/files/${file.id}/download`, {
-        responseType: 'blob',
-      });
+      // Get a short-lived signed URL so the browser streams the file itself
+      const response = await api.post(`/files/${file.id}/download-url`);
 
-      // Create a blob URL and trigger download
-      const url = window.URL.createObjectURL(new Blob([response.data]));
       const link = document.createElement('a');
-      link.href = url;
-      link.setAttribute('download', file.original_filename);
+      link.href = response.data.url;
       document.body.appendChild(link);
       link.click();
       link.remove();
-      window.URL.revokeObjectURL(url);
     } catch (error) {
       console.error('Download failed:', error);
       alert('Failed to download file. Please try again.');